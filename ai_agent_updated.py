@@ -5,6 +5,7 @@ With expanded farmer information and single-word query support
 """
 
 import random
+import threading
 from datetime import datetime
 
 class UniversalAI:
@@ -445,7 +446,7 @@ class UniversalAI:
             data = self.knowledge.get(category, {}).get(subcategory, {})
             if isinstance(data, dict):
                 return data.get(self.language, data.get("en", ""))
-            elif isinstance(data, list):
+            elif isinstance(data, (list, tuple)):
                 return random.choice(data) if data else ""
             return data
         except:
@@ -492,5 +493,23 @@ class NLPProcessor:
         return keywords
 
 
-# Create instance
-ai = UniversalAI()
+# Shared instance, built on first use - the knowledge base is large
+_ai = None
+_ai_lock = threading.Lock()
+
+
+def get_ai():
+    """Shared UniversalAI assistant, constructed on first call"""
+    global _ai
+    if _ai is None:
+        with _ai_lock:
+            if _ai is None:
+                _ai = UniversalAI()
+    return _ai
+
+
+def __getattr__(name):
+    # Keeps `ai_agent_updated.ai` / `from ai_agent_updated import ai` working
+    if name == "ai":
+        return get_ai()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
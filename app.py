@@ -1,14 +1,14 @@
 import os
-import json
-import sqlite3
+import math
 from flask import Flask, render_template, request, url_for, jsonify, session, redirect
-from model_enhanced import predict_crop_high_level
-from ai_agent_updated import UniversalAI
+from model_enhanced import get_predictor, predict_crop_high_level, prediction_cache, rank_crops
+from ai_agent_updated import get_ai
 from werkzeug.utils import secure_filename
 from database.db_util import (
-    get_all_crops, get_dashboard_stats, 
-    get_all_government_schemes, get_all_ngos, get_all_suppliers,
-    get_all_regions, get_all_diseases
+    connection, get_all_crops, get_dashboard_stats,
+    get_all_ngos, get_all_suppliers, get_page, PAGE_SIZE,
+    get_all_regions, get_all_diseases,
+    add_ngo, add_supplier, get_cache_stats, search
 )
 
 app = Flask(__name__)
@@ -19,11 +19,8 @@ app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.secret_key = 'agriguard_ai_secret_key_2024'  # For session management
 os.makedirs(UPLOAD_FOLDER, exist_ok=True) # Creates folder if it doesn't exist
 
-# Initialize AI Assistant - The Universal AI that can answer ANY question!
-ai_assistant = UniversalAI()
-
-# Database path
-DB_PATH = os.path.join(os.path.dirname(__file__), 'database', 'agriguard.db')
+# AI Assistant - the shared Universal AI from ai_agent_updated, built on the
+# first request that needs it (get_ai())
 
 # Language translations for the interface
 LANGUAGES = {
@@ -38,11 +35,6 @@ LANGUAGES = {
     "ml": {"name": "Malayalam", "native": "മലയാളം"}
 }
 
-def get_db_connection():
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
-
 @app.route('/')
 def index():
     # Check if language is already selected
@@ -63,7 +55,7 @@ def set_language():
     lang_code = data.get('language', 'en')
     if lang_code in LANGUAGES:
         session['language'] = lang_code
-        ai_assistant.set_language(lang_code)
+        get_ai().set_language(lang_code)
         return jsonify({"status": "success", "language": lang_code})
     return jsonify({"status": "error", "message": "Invalid language"}), 400
 
@@ -84,10 +76,10 @@ def ai_chat():
     language = session.get('language', 'en')
     
     # Set language for AI response
-    ai_assistant.set_language(language)
+    get_ai().set_language(language)
     
     # Get comprehensive response from AI
-    response = ai_assistant.get_response(query, crop_type)
+    response = get_ai().get_response(query, crop_type)
     
     return jsonify({
         "status": "success",
@@ -107,7 +99,7 @@ def analyze_image():
     file.save(filepath)
     
     # Run AI image analysis
-    result = ai_assistant.analyze_image(filename)
+    result = get_ai().analyze_image(filename)
     
     return jsonify({
         "status": "success",
@@ -117,25 +109,38 @@ def analyze_image():
         "image_url": url_for('static', filename='uploads/' + filename)
     })
 
+def _list_page(kind):
+    """Page of a list for the request's ?cursor=&limit= (ValueError if invalid)"""
+    return get_page(kind, request.args.get('cursor'), request.args.get('limit', PAGE_SIZE))
+
 @app.route('/government')
 def government():
-    """Government schemes page - fetches data from database"""
-    schemes = get_all_government_schemes()
-    return render_template('government.html', schemes=schemes)
+    """Government schemes page - fetches one page of schemes from database"""
+    try:
+        page = _list_page("schemes")
+    except ValueError:
+        return redirect(url_for('government'))
+    return render_template('government.html', schemes=page['items'],
+                           cursor=request.args.get('cursor'), next_cursor=page['next_cursor'])
 
 @app.route('/ngo')
 def ngo():
-    """NGO page - fetches data from database"""
-    ngos = get_all_ngos()
-    return render_template('ngo.html', ngos=ngos)
+    """NGO page - fetches one page of NGOs from database"""
+    try:
+        page = _list_page("ngos")
+    except ValueError:
+        return redirect(url_for('ngo'))
+    return render_template('ngo.html', ngos=page['items'],
+                           cursor=request.args.get('cursor'), next_cursor=page['next_cursor'])
 
 @app.route('/dashboard')
 def dashboard():
     """Dashboard page - fetches statistics from database"""
-    stats = get_dashboard_stats()
-    crops = get_all_crops()
-    diseases = get_all_diseases()
-    regions = get_all_regions()
+    with connection():
+        stats = get_dashboard_stats()
+        crops = get_all_crops()
+        diseases = get_all_diseases()
+        regions = get_all_regions()
     return render_template('dashboard.html', 
                           stats=stats,
                           crops=crops,
@@ -144,9 +149,37 @@ def dashboard():
 
 @app.route('/suppliers')
 def suppliers():
-    """Suppliers page - fetches data from database"""
-    suppliers_list = get_all_suppliers()
-    return render_template('suppliers.html', suppliers=suppliers_list)
+    """Suppliers page - fetches one page of suppliers from database"""
+    try:
+        page = _list_page("suppliers")
+    except ValueError:
+        return redirect(url_for('suppliers'))
+    return render_template('suppliers.html', suppliers=page['items'],
+                           cursor=request.args.get('cursor'), next_cursor=page['next_cursor'])
+
+# ===== PAGINATED LIST APIS =====
+
+def _api_page(kind):
+    try:
+        page = _list_page(kind)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"status": "success", "items": page['items'], "next_cursor": page['next_cursor']})
+
+@app.route('/api/suppliers')
+def api_suppliers():
+    """Suppliers by rating, paginated with ?cursor=&limit="""
+    return _api_page("suppliers")
+
+@app.route('/api/ngos')
+def api_ngos():
+    """NGOs by name, paginated with ?cursor=&limit="""
+    return _api_page("ngos")
+
+@app.route('/api/schemes')
+def api_schemes():
+    """Government schemes by name, paginated with ?cursor=&limit="""
+    return _api_page("schemes")
 
 # ===== ADMIN ROUTES FOR ADDING NGOs AND SUPPLIERS =====
 
@@ -162,14 +195,7 @@ def admin_ngo():
         phone = request.form.get('phone', '')
         website = request.form.get('website', '')
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO ngos (ngo_name, description, program_type, coverage, contact_email, phone, website)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (ngo_name, description, program_type, coverage, contact_email, phone, website))
-        conn.commit()
-        conn.close()
+        add_ngo(ngo_name, description, program_type, coverage, contact_email, phone, website)
         
         ngos = get_all_ngos()
         return render_template('admin_ngo.html', ngos=ngos, success=True)
@@ -190,14 +216,7 @@ def admin_supplier():
         email = request.form.get('email', '')
         rating = float(request.form.get('rating', 4.0))
         
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO suppliers (supplier_name, products, location, delivery_available, delivery_charge, phone, email, rating)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (supplier_name, products, location, delivery_available, delivery_charge, phone, email, rating))
-        conn.commit()
-        conn.close()
+        add_supplier(supplier_name, products, location, delivery_available, delivery_charge, phone, email, rating)
         
         suppliers = get_all_suppliers()
         return render_template('admin_supplier.html', suppliers=suppliers, success=True)
@@ -236,6 +255,102 @@ def predict():
                            crop_type=crop_type,
                            user_image=image_url)
 
+@app.route('/api/rank_crops', methods=['GET', 'POST'])
+def api_rank_crops():
+    """Rank crops for the given conditions - best suited first"""
+    data = request.get_json(silent=True) or request.values
+    try:
+        rainfall = float(data['rainfall'])
+        temperature = float(data['temperature'])
+        humidity = float(data['humidity'])
+        soil_ph = float(data['soil_ph'])
+        top_k = int(data.get('top_k', 5))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({"status": "error", "message": "rainfall, temperature, humidity and soil_ph are required numbers"}), 400
+    
+    try:
+        ranking = rank_crops(rainfall, temperature, humidity, soil_ph,
+                             season=data.get('season'), region=data.get('region'), top_k=top_k)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 404
+    return jsonify({"status": "success", "crops": ranking})
+
+# Largest what-if surface one request may ask for
+SURFACE_MAX_POINTS = 10000
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+def _sweep_points(sweep):
+    """Grid points a risk_surface sweep asks for; ValueError if it is malformed"""
+    if not isinstance(sweep, dict):
+        raise ValueError("sweep must map parameter names to values")
+    points = 1
+    for name, values in sweep.items():
+        if isinstance(values, dict):
+            steps = values.get('steps')
+            if not (_is_number(values.get('start')) and _is_number(values.get('stop'))
+                    and isinstance(steps, int) and not isinstance(steps, bool) and steps > 0):
+                raise ValueError(f"{name}: a range needs numeric start and stop and a positive whole number of steps")
+            points *= steps
+        elif isinstance(values, list) and values and all(_is_number(value) for value in values):
+            points *= len(values)
+        else:
+            raise ValueError(f"{name}: expected a list of numbers or a start/stop/steps range")
+    return points
+
+@app.route('/api/risk_surface', methods=['POST'])
+def api_risk_surface():
+    """What-if risk surface: sweep one or two inputs for a crop in one call"""
+    data = request.get_json(silent=True) or {}
+    if not isinstance(data, dict):
+        return jsonify({"status": "error", "message": "Expected a JSON object"}), 400
+    try:
+        if _sweep_points(data.get('sweep') or {}) > SURFACE_MAX_POINTS:
+            return jsonify({"status": "error", "message": f"Surface too large - at most {SURFACE_MAX_POINTS} points"}), 400
+        surface = get_predictor().risk_surface(
+            float(data.get('rainfall', 0)), float(data.get('temperature', 0)),
+            float(data.get('humidity', 0)), float(data.get('soil_ph', 0)),
+            data.get('crop_type'), data.get('sweep') or {}
+        )
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"status": "success", "surface": surface})
+
+# Most results one search request may ask for per type
+SEARCH_MAX_LIMIT = 50
+
+@app.route('/api/search')
+def api_search():
+    """Ranked search over crops, diseases, schemes, NGOs and suppliers
+    
+    ?q=text[&type=crops,suppliers][&prefix=1][&limit=10] - prefix=1 treats
+    the last word as a prefix, for search-as-you-type boxes.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({"status": "error", "message": "Missing search query 'q'"}), 400
+    kinds = [kind for kind in request.args.get('type', '').split(',') if kind] or None
+    prefix = request.args.get('prefix', '0').lower() in ('1', 'true', 'yes')
+    try:
+        limit = min(max(int(request.args.get('limit', 10)), 1), SEARCH_MAX_LIMIT)
+        results = search(query, kinds=kinds, limit=limit, prefix=prefix)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    return jsonify({"status": "success", "query": query, "results": results})
+
+@app.route('/api/cache_stats')
+def api_cache_stats():
+    """Hit rates of the reference table and prediction caches"""
+    return jsonify({
+        "status": "success",
+        "reference_tables": get_cache_stats(),
+        "predictions": prediction_cache.stats()
+    })
+
 if __name__ == '__main__':
+    # Development server; under gunicorn, when_ready in gunicorn.conf.py migrates
+    from database.migrate import migrate
+    migrate()
     app.run(debug=True)
 
@@ -0,0 +1,223 @@
+"""
+Database Query Benchmarks for AgriGuard AI
+Times every database/db_util.py query against synthetic databases of
+10^3 to 10^7 rows per table built by benchmarks.synthetic_db
+
+Usage: python -m benchmarks.db_queries [--sizes 1000 10000 100000 1000000 10000000]
+                                       [--cache-dir dir] [--output results.json] [--compare old.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks import synthetic_db
+from benchmarks.synthetic import DEFAULT_SEED
+from database import db_util
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BASE_DIR, 'results')
+
+DEFAULT_SIZES = (1000, 10000, 100000)
+
+# Queries returning whole tables are skipped above this many rows per table:
+# at 10^7 a get_all_suppliers() list alone needs gigabytes
+FULL_LIST_LIMIT = 1000000
+
+
+def _count(rows):
+    return sum(1 for _ in rows)
+
+
+# name -> (call taking the samples dict, returns a whole table)
+QUERIES = {
+    "get_all_crops": (lambda s: db_util.get_all_crops(), True),
+    "get_crops_by_category": (lambda s: db_util.get_crops_by_category("Cereal"), True),
+    "get_crops_by_season": (lambda s: db_util.get_crops_by_season("Kharif"), True),
+    "get_crop_by_name": (lambda s: db_util.get_crop_by_name(s["crop"]), False),
+    "get_crop_parameters": (lambda s: db_util.get_crop_parameters(s["crop"]), False),
+    "get_crop_diseases": (lambda s: db_util.get_crop_diseases(s["crop"]), False),
+    "get_crop_regions": (lambda s: db_util.get_crop_regions(s["crop"]), False),
+    "get_crop_profiles(100)": (lambda s: db_util.get_crop_profiles(s["crops"]), False),
+    "get_crop_profiles(all)": (lambda s: db_util.get_crop_profiles(), True),
+    "get_crop_names(region)": (lambda s: db_util.get_crop_names(region_name=s["region"]), False),
+    "get_all_diseases": (lambda s: db_util.get_all_diseases(), True),
+    "get_disease_by_name": (lambda s: db_util.get_disease_by_name(s["disease"]), False),
+    "get_diseases_by_type": (lambda s: db_util.get_diseases_by_type("Fungal"), True),
+    "get_all_regions": (lambda s: db_util.get_all_regions(), True),
+    "get_all_seasons": (lambda s: db_util.get_all_seasons(), False),
+    "calculate_risk": (lambda s: db_util.calculate_risk(120, 27, 75, 6.5, s["crop"]), False),
+    "search_crops": (lambda s: db_util.search_crops("ric"), False),
+    "get_dashboard_stats": (lambda s: db_util.get_dashboard_stats(), False),
+    "get_all_government_schemes": (lambda s: db_util.get_all_government_schemes(), True),
+    "get_government_scheme_by_id": (lambda s: db_util.get_government_scheme_by_id(s["scheme_id"]), False),
+    "get_all_ngos": (lambda s: db_util.get_all_ngos(), True),
+    "get_ngo_by_id": (lambda s: db_util.get_ngo_by_id(s["ngo_id"]), False),
+    "get_all_suppliers": (lambda s: db_util.get_all_suppliers(), True),
+    "get_supplier_by_id": (lambda s: db_util.get_supplier_by_id(s["supplier_id"]), False),
+    "search_suppliers": (lambda s: db_util.search_suppliers("urea"), False),
+    "search": (lambda s: db_util.search("kisan seeds"), False),
+    "search(prefix)": (lambda s: db_util.search("kri", prefix=True), False),
+    "get_suppliers_page": (lambda s: db_util.get_suppliers_page(), False),
+    "get_suppliers_page(deep)": (lambda s: db_util.get_suppliers_page(s["supplier_cursor"]), False),
+    "get_ngos_page": (lambda s: db_util.get_ngos_page(), False),
+    "get_government_schemes_page": (lambda s: db_util.get_government_schemes_page(), False),
+    "iter_suppliers": (lambda s: _count(db_util.iter_suppliers()), True),
+}
+
+
+def samples():
+    """Arguments for the queries, picked from the middle of the current database"""
+    with db_util.connection() as conn:
+        crop = conn.execute("SELECT crop_name FROM crops ORDER BY crop_id "
+                            "LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM crops)").fetchone()[0]
+        crops = [row[0] for row in conn.execute("SELECT crop_name FROM crops ORDER BY crop_id DESC LIMIT 100")]
+        disease = conn.execute("SELECT disease_name FROM diseases ORDER BY disease_id DESC LIMIT 1").fetchone()[0]
+        region = conn.execute("SELECT region_name FROM regions ORDER BY region_id LIMIT 1").fetchone()[0]
+        ids = {
+            key: conn.execute(f"SELECT MAX({column}) / 2 FROM {table}").fetchone()[0]
+            for key, table, column in (("scheme_id", "government_schemes", "scheme_id"),
+                                       ("ngo_id", "ngos", "ngo_id"), ("supplier_id", "suppliers", "supplier_id"))
+        }
+        rating, supplier_id = conn.execute(
+            "SELECT rating, supplier_id FROM suppliers ORDER BY rating DESC, supplier_id "
+            "LIMIT 1 OFFSET (SELECT COUNT(*) / 2 FROM suppliers)"
+        ).fetchone()
+    return dict(ids, crop=crop, crops=crops, disease=disease, region=region,
+                supplier_cursor=db_util.encode_cursor((rating, supplier_id)))
+
+
+def measure_query(call, sample, repeats):
+    """Cold time (reference cache just cleared) and the median of warm repeats, in ms"""
+    db_util.reference_cache.invalidate()
+    started = time.perf_counter()
+    call(sample)
+    cold = (time.perf_counter() - started) * 1000
+
+    warm = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        call(sample)
+        warm.append((time.perf_counter() - started) * 1000)
+    return {"cold_ms": cold, "warm_ms": statistics.median(warm) if warm else None}
+
+
+@contextlib.contextmanager
+def synthetic_database(rows, seed, cache_dir=None, base=synthetic_db.BASE_DB_PATH):
+    """Point db_util at a synthetic database of `rows` rows per table
+
+    With cache_dir the database is kept there and reused by later runs with
+    the same size and seed; otherwise it lives in a temporary directory.
+    """
+    with contextlib.ExitStack() as stack:
+        directory = cache_dir or stack.enter_context(tempfile.TemporaryDirectory())
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"synthetic-{rows}-seed{seed}.db")
+        generated = None
+        if not os.path.exists(path):
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                synthetic_db.generate(path, synthetic_db.scaled_volumes(rows), seed, base)
+            generated = time.perf_counter() - started
+
+        original = db_util.DB_PATH
+        db_util.DB_PATH = path
+        db_util.reference_cache.invalidate()
+        try:
+            yield path, generated
+        finally:
+            db_util.db.close()
+            db_util.DB_PATH = original
+            db_util.reference_cache.invalidate()
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, queries=None, seed=DEFAULT_SEED, repeats=5,
+                   cache_dir=None, full_list_limit=FULL_LIST_LIMIT, log=print):
+    """Time every query at every size and return the machine-readable results"""
+    queries = queries or list(QUERIES)
+    results = {"meta": _metadata(seed, sizes), "databases": [], "queries": []}
+    for rows in sizes:
+        with synthetic_database(rows, seed, cache_dir) as (path, generated):
+            results["databases"].append({"rows": rows, "path": path if cache_dir else None,
+                                         "bytes": os.path.getsize(path), "generate_seconds": generated})
+            made = f", generated in {generated:.1f} s" if generated is not None else ""
+            log(f"\nrows={rows:,} ({os.path.getsize(path) / 1e6:.1f} MB{made})")
+            sample = samples()
+            for name in queries:
+                call, full_list = QUERIES[name]
+                if full_list and rows > full_list_limit:
+                    log(f"   {name:30s} skipped (whole-table result)")
+                    continue
+                run = measure_query(call, sample, repeats)
+                run.update(query=name, rows=rows)
+                results["queries"].append(run)
+                log(f"   {name:30s} cold {run['cold_ms']:10.2f} ms   warm {run['warm_ms']:10.2f} ms")
+    return results
+
+
+def _metadata(seed, sizes):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=BASE_DIR, check=False).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "seed": seed,
+        "sizes": list(sizes),
+    }
+
+
+def compare(previous, current, log=print):
+    """Print the cold-time change of every (query, rows) in both runs"""
+    before = {(run["query"], run["rows"]): run for run in previous["queries"]}
+    for run in current["queries"]:
+        old = before.get((run["query"], run["rows"]))
+        if old and old["cold_ms"] and run["cold_ms"]:
+            change = run["cold_ms"] / old["cold_ms"] - 1
+            log(f"{run['query']:30s} rows={run['rows']:<9d} {change:+8.1%} cold time")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.db_queries", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="rows per table to test at")
+    parser.add_argument("--queries", nargs="+", choices=list(QUERIES), help="queries to run (default: all)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="synthetic data seed")
+    parser.add_argument("--repeats", type=int, default=5, help="warm calls timed per query")
+    parser.add_argument("--cache-dir", help="keep generated databases here and reuse them")
+    parser.add_argument("--full-list-limit", type=int, default=FULL_LIST_LIMIT,
+                        help="skip whole-table queries above this many rows")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/db_queries-<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.queries, args.seed, args.repeats, args.cache_dir, args.full_list_limit)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"db_queries-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✓ Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(json.load(f), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
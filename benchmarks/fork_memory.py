@@ -0,0 +1,158 @@
+"""
+Per-Worker Memory Report for AgriGuard AI
+Forks preloaded workers the way `gunicorn --preload` does, runs a mixed
+prediction/chat workload in each, and reports every worker's unique RSS
+(private pages, i.e. copy-on-write pages the worker has dirtied)
+
+Usage: python -m benchmarks.fork_memory [--workers 4] [--requests 2000]
+Linux only - reads /proc/<pid>/smaps_rollup.
+"""
+
+import argparse
+import gc
+import json
+import os
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BASE_DIR)
+RESULTS_DIR = os.path.join(BASE_DIR, 'results')
+
+# Whether each mode runs preload.preload() before forking
+MODES = {
+    "eager": False,     # engines built before fork, nothing frozen
+    "gc_freeze": True,  # preload(): + gc.freeze()
+}
+
+CHAT_QUERIES = ("hello", "rice disease", "wheat fertilizer", "how to irrigate cotton", "thank you", "tomato blight")
+
+
+def memory_kb(pid="self"):
+    """Rss, Pss and unique (private) memory of a process in kB"""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup", 'r') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1])
+    return {
+        "rss_kb": fields.get("Rss", 0),
+        "pss_kb": fields.get("Pss", 0),
+        "uss_kb": fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0),
+    }
+
+
+def workload(requests, seed):
+    """What a worker does between forks: predictions, chat replies, GC passes"""
+    import random
+
+    import app
+    from ai_agent_updated import get_ai
+    from model_enhanced import get_predictor, prediction_cache
+
+    prediction_cache.configure(enabled=False)
+    rng = random.Random(seed)
+    crops = list(get_predictor().crop_database)
+    client = app.app.test_client()
+    for number in range(requests):
+        get_predictor().predict(rng.uniform(0, 400), rng.uniform(5, 45), rng.uniform(10, 100),
+                                rng.uniform(4, 9), rng.choice(crops)).to_dict()
+        get_ai().get_response(rng.choice(CHAT_QUERIES), rng.choice(crops))
+        if number % 100 == 0:
+            client.get('/get_language')
+            gc.collect()
+
+
+def run_mode(mode, workers, requests):
+    """Preload in this process, fork workers, return their memory readings"""
+    import app  # noqa: F401 - the preloaded application, as under gunicorn
+    import preload
+    from ai_agent_updated import get_ai
+    from model_enhanced import get_predictor
+
+    if MODES[mode]:
+        preload.preload()
+    else:
+        get_predictor()
+        get_ai()
+
+    master = memory_kb()
+    children = []
+    for worker in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            workload(requests, seed=worker)
+            with os.fdopen(write_fd, 'w') as pipe:
+                json.dump(memory_kb(), pipe)
+            os._exit(0)
+        os.close(write_fd)
+        children.append((pid, read_fd))
+
+    readings = []
+    for pid, read_fd in children:
+        with os.fdopen(read_fd, 'r') as pipe:
+            readings.append(json.load(pipe))
+        os.waitpid(pid, 0)
+    return {"mode": mode, "master": master, "workers": readings}
+
+
+def summarize(result):
+    uss = [reading["uss_kb"] for reading in result["workers"]]
+    return {
+        "mode": result["mode"],
+        "master_rss_mb": result["master"]["rss_kb"] / 1024,
+        "worker_uss_mb_mean": statistics.fmean(uss) / 1024,
+        "worker_uss_mb_max": max(uss) / 1024,
+        "workers_uss_mb_total": sum(uss) / 1024,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fork_memory", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4, help="workers to fork per mode")
+    parser.add_argument("--requests", type=int, default=2000, help="predictions + chat replies per worker")
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES), help="modes to compare")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/fork_memory-<time>.json)")
+    parser.add_argument("--run-mode", choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.run_mode:
+        # One mode in this fresh interpreter; the parent collects the JSON
+        json.dump(run_mode(args.run_mode, args.workers, args.requests), sys.stdout)
+        return 0
+
+    if not os.path.exists("/proc/self/smaps_rollup"):
+        print("✗ /proc/self/smaps_rollup is not available - the memory report needs Linux")
+        return 1
+
+    results = []
+    for mode in args.modes:
+        completed = subprocess.run(
+            [sys.executable, "-m", "benchmarks.fork_memory", "--run-mode", mode,
+             "--workers", str(args.workers), "--requests", str(args.requests)],
+            cwd=REPO_DIR, capture_output=True, text=True, check=True,
+        )
+        results.append(json.loads(completed.stdout))
+
+    print(f"\n{'mode':12s} {'master RSS':>12s} {'worker USS mean':>16s} {'max':>9s} {'all workers':>12s}")
+    summaries = [summarize(result) for result in results]
+    for summary in summaries:
+        print(f"{summary['mode']:12s} {summary['master_rss_mb']:9.1f} MB {summary['worker_uss_mb_mean']:13.1f} MB "
+              f"{summary['worker_uss_mb_max']:6.1f} MB {summary['workers_uss_mb_total']:9.1f} MB")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"fork_memory-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({"timestamp": datetime.now().isoformat(timespec="seconds"), "workers": args.workers,
+                   "requests": args.requests, "summary": summaries, "raw": results}, f, indent=2)
+    print(f"\n✓ Results written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
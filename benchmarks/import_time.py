@@ -0,0 +1,153 @@
+"""
+Import-Time Budget for AgriGuard AI
+Measures cold imports with `python -X importtime` in fresh interpreters,
+reports the slowest modules and fails when an import exceeds its budget
+
+Usage: python -m benchmarks.import_time [--runs 5] [--top 15]
+                                        [--baseline old.json] [--output results.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from datetime import datetime
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BASE_DIR)
+RESULTS_DIR = os.path.join(BASE_DIR, 'results')
+
+# Cumulative import budget per module in milliseconds (warm bytecode cache).
+# Most of app's budget is Flask and numpy; engines must not be built at import.
+IMPORT_BUDGETS_MS = {
+    "app": 800,
+    "model_enhanced": 400,
+    "ai_agent_updated": 50,
+    "database.db_util": 50,
+}
+
+# Importing the web app must leave every engine unbuilt
+LAZY_CHECK = (
+    "import app, model_enhanced, ai_agent_updated; "
+    "assert model_enhanced._predictor is None, 'CropPredictor built at import'; "
+    "assert ai_agent_updated._ai is None, 'UniversalAI built at import'"
+)
+
+
+def _environment(pycache):
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    env["PYTHONPYCACHEPREFIX"] = pycache
+    return env
+
+
+def parse_importtime(stderr):
+    """-X importtime output as [(module, self_us, cumulative_us, depth)]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def measure(module, runs=5, pycache=None):
+    """Median cumulative import time of module over fresh interpreters"""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = _environment(pycache or tmp)
+        command = [sys.executable, "-X", "importtime", "-c", f"import {module}"]
+        # First run compiles bytecode into the scratch cache
+        subprocess.run(command, cwd=REPO_DIR, env=env, capture_output=True, check=True)
+
+        samples = []
+        for _ in range(runs):
+            completed = subprocess.run(command, cwd=REPO_DIR, env=env, capture_output=True, text=True, check=True)
+            rows = parse_importtime(completed.stderr)
+            total = next(cumulative for name, _, cumulative, _ in reversed(rows) if name == module)
+            samples.append((total, rows))
+
+    samples.sort(key=lambda sample: sample[0])
+    total, rows = samples[len(samples) // 2]
+    return {
+        "module": module,
+        "median_ms": total / 1000,
+        "min_ms": samples[0][0] / 1000,
+        "max_ms": samples[-1][0] / 1000,
+        "runs": runs,
+        "slowest": [
+            {"module": name, "self_ms": self_us / 1000, "cumulative_ms": cumulative_us / 1000}
+            for name, self_us, cumulative_us, _ in sorted(rows, key=lambda row: row[1], reverse=True)
+        ],
+    }
+
+
+def check_lazy():
+    """None if importing app builds no engine, else the failure message"""
+    completed = subprocess.run([sys.executable, "-c", LAZY_CHECK], cwd=REPO_DIR, capture_output=True, text=True)
+    if completed.returncode == 0:
+        return None
+    return completed.stderr.strip().splitlines()[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.import_time", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("modules", nargs="*", default=list(IMPORT_BUDGETS_MS), help="modules to import")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module")
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list (by self time)")
+    parser.add_argument("--budget-ms", type=float, help="budget for every module, overriding the defaults")
+    parser.add_argument("--baseline", help="earlier results file; fail on a slowdown beyond --tolerance")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against --baseline")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/import_time-<time>.json)")
+    args = parser.parse_args(argv)
+
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = {result["module"]: result for result in json.load(f)["modules"]}
+
+    failures = []
+    results = []
+    for module in args.modules:
+        result = measure(module, args.runs)
+        results.append(result)
+        budget = args.budget_ms or IMPORT_BUDGETS_MS.get(module)
+        result["budget_ms"] = budget
+
+        print(f"\n{module}: {result['median_ms']:.1f} ms median "
+              f"({result['min_ms']:.1f}-{result['max_ms']:.1f} ms over {args.runs} runs)")
+        for row in result["slowest"][:args.top]:
+            print(f"   {row['self_ms']:8.1f} ms self {row['cumulative_ms']:9.1f} ms total   {row['module']}")
+
+        if budget and result["median_ms"] > budget:
+            failures.append(f"{module} imports in {result['median_ms']:.1f} ms, budget {budget:.0f} ms")
+        previous = baseline.get(module)
+        if previous and result["median_ms"] > previous["median_ms"] * (1 + args.tolerance):
+            failures.append(f"{module} imports in {result['median_ms']:.1f} ms, "
+                            f"baseline {previous['median_ms']:.1f} ms (+{args.tolerance:.0%} allowed)")
+
+    lazy_failure = check_lazy()
+    if lazy_failure:
+        failures.append(f"importing app built an engine: {lazy_failure}")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"import_time-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump({"timestamp": datetime.now().isoformat(timespec="seconds"),
+                   "python": sys.version.split()[0], "modules": results, "failures": failures}, f, indent=2)
+    print(f"\n✓ Results written to {output}")
+
+    if failures:
+        for failure in failures:
+            print(f"✗ {failure}")
+        return 1
+    print("✓ All imports within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
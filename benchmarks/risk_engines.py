@@ -0,0 +1,191 @@
+"""
+Risk Engine Benchmarks for AgriGuard AI
+Latency, throughput and peak memory of model.py, model_enhanced.py and
+database/db_util.py risk scoring on reproducible synthetic readings
+
+Usage: python -m benchmarks.risk_engines [--sizes 1 100 10000 1000000]
+                                         [--output results.json] [--compare old.json]
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+import model
+import model_enhanced
+from benchmarks.synthetic import DEFAULT_SEED, as_rows, generate_readings
+from database import db_util, populate_data
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BASE_DIR, 'results')
+
+DEFAULT_SIZES = (1, 100, 10000, 1000000)
+
+
+@contextlib.contextmanager
+def risk_database():
+    """Point db_util at a freshly populated scratch database"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'agriguard.db')
+        original_populate, original_util = populate_data.DB_PATH, db_util.DB_PATH
+        populate_data.DB_PATH = db_util.DB_PATH = path
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                populate_data.initialize_database()
+            yield path
+        finally:
+            populate_data.DB_PATH, db_util.DB_PATH = original_populate, original_util
+
+
+def _per_row(predict):
+    """Batch runner that calls a single-reading engine once per row"""
+    def run(readings):
+        return [predict(*row) for row in as_rows(readings)]
+    return run
+
+
+def _enhanced_batch(readings):
+    return model_enhanced.get_predictor().predict_batch(
+        readings["rainfall"], readings["temperature"], readings["humidity"],
+        readings["soil_ph"], readings["crop_type"]
+    )
+
+
+# name -> (single-reading call, batch call)
+ENGINES = {
+    "model": (model.predict_crop_high_level, _per_row(model.predict_crop_high_level)),
+    "model_enhanced": (model_enhanced.predict_crop_high_level, _per_row(model_enhanced.predict_crop_high_level)),
+    "model_enhanced.predict_batch": (None, _enhanced_batch),
+    "db_util": (db_util.calculate_risk, _per_row(db_util.calculate_risk)),
+}
+
+
+def measure_latency(predict, rows):
+    """Per-call latency percentiles in microseconds"""
+    predict(*rows[0])  # warm up
+    timings = []
+    for row in rows:
+        started = time.perf_counter()
+        predict(*row)
+        timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return {
+        "calls": len(timings),
+        "mean_us": statistics.fmean(timings),
+        "p50_us": timings[len(timings) // 2],
+        "p95_us": timings[int(len(timings) * 0.95)],
+        "p99_us": timings[int(len(timings) * 0.99)],
+    }
+
+
+def measure_batch(run, readings, memory=True):
+    """Wall time, throughput and (optionally) peak traced memory of one batch"""
+    size = len(readings["rainfall"])
+    started = time.perf_counter()
+    run(readings)
+    seconds = time.perf_counter() - started
+    result = {"batch_size": size, "seconds": seconds, "rows_per_sec": size / seconds if seconds else None}
+
+    if memory:
+        # Separate pass - tracing slows allocation-heavy engines down a lot
+        tracemalloc.start()
+        run(readings)
+        result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, engines=None, seed=DEFAULT_SEED, latency_calls=2000,
+                   memory=True, use_cache=False, log=print):
+    """Benchmark every engine and return the machine-readable results"""
+    engines = engines or list(ENGINES)
+    model_enhanced.prediction_cache.configure(enabled=use_cache)
+    model_enhanced.prediction_cache.clear()
+
+    results = {"meta": _metadata(seed, sizes, use_cache), "latency": {}, "throughput": []}
+    latency_rows = as_rows(generate_readings(latency_calls, seed=seed + 1))
+    with risk_database():
+        for name in engines:
+            single, batch = ENGINES[name]
+            if single is not None:
+                results["latency"][name] = stats = measure_latency(single, latency_rows)
+                log(f"{name:30s} latency  p50 {stats['p50_us']:9.1f} us   p95 {stats['p95_us']:9.1f} us")
+            for size in sizes:
+                run = measure_batch(batch, generate_readings(size, seed=seed), memory=memory)
+                run["engine"] = name
+                results["throughput"].append(run)
+                peak = f"   peak {run['peak_bytes'] / 1e6:8.2f} MB" if "peak_bytes" in run else ""
+                log(f"{name:30s} n={size:<9d} {run['rows_per_sec']:14,.0f} rows/sec{peak}")
+    return results
+
+
+def _metadata(seed, sizes, use_cache):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=BASE_DIR, check=False).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "seed": seed,
+        "sizes": list(sizes),
+        "prediction_cache": use_cache,
+    }
+
+
+def compare(previous, current, log=print):
+    """Print the throughput change of every (engine, batch size) in both runs"""
+    before = {(run["engine"], run["batch_size"]): run for run in previous["throughput"]}
+    for run in current["throughput"]:
+        old = before.get((run["engine"], run["batch_size"]))
+        if old and old.get("rows_per_sec") and run.get("rows_per_sec"):
+            change = run["rows_per_sec"] / old["rows_per_sec"] - 1
+            log(f"{run['engine']:30s} n={run['batch_size']:<9d} {change:+8.1%} rows/sec")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.risk_engines", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="batch sizes to run")
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), help="engines to run (default: all)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="synthetic data seed")
+    parser.add_argument("--latency-calls", type=int, default=2000, help="single calls timed per engine")
+    parser.add_argument("--no-memory", action="store_true", help="skip the peak memory pass")
+    parser.add_argument("--cache", action="store_true", help="leave the model_enhanced prediction cache on")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/risk_engines-<time>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare throughput against")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.sizes, args.engines, args.seed, args.latency_calls,
+                             memory=not args.no_memory, use_cache=args.cache)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"risk_engines-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Results written to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(json.load(f), results)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
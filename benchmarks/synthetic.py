@@ -0,0 +1,37 @@
+"""
+Synthetic Field Readings for AgriGuard AI Benchmarks
+Reproducible weather/soil readings shaped like real sensor sweeps
+"""
+
+import numpy as np
+
+from model_enhanced import get_predictor
+
+DEFAULT_SEED = 42
+
+
+def generate_readings(n, seed=DEFAULT_SEED, crops=None):
+    """n readings as columns: rainfall, temperature, humidity, soil_ph, crop_type
+
+    Rainfall is right-skewed (gamma), temperature and pH roughly normal,
+    humidity bounded (beta); crops are drawn uniformly. The same n and seed
+    always give the same readings.
+    """
+    rng = np.random.default_rng(seed)
+    crops = list(crops or get_predictor().crop_database)
+    return {
+        "rainfall": np.round(rng.gamma(2.0, 60.0, n), 1),
+        "temperature": np.round(rng.normal(27.0, 6.0, n), 1),
+        "humidity": np.round(100 * rng.beta(5.0, 2.5, n), 1),
+        "soil_ph": np.round(np.clip(rng.normal(6.6, 0.9, n), 3.5, 9.5), 1),
+        "crop_type": np.array(crops, dtype=object)[rng.integers(len(crops), size=n)],
+    }
+
+
+def as_rows(readings):
+    """Readings as plain (rainfall, temperature, humidity, soil_ph, crop_type) tuples"""
+    return list(zip(
+        readings["rainfall"].tolist(), readings["temperature"].tolist(),
+        readings["humidity"].tolist(), readings["soil_ph"].tolist(),
+        readings["crop_type"].tolist(),
+    ))
@@ -0,0 +1,447 @@
+"""
+Synthetic Database for AgriGuard AI Benchmarks
+Fills agriguard.db (or a copy) with reproducible reference data at any
+volume - crops and their varieties, diseases, regions, crop links,
+suppliers, NGOs and schemes - shaped like the real tables
+
+Usage: python -m benchmarks.synthetic_db scale.db [--rows 100000]
+           [--suppliers N] [--ngos N] ... [--seed 42] [--base database/agriguard.db]
+"""
+
+import argparse
+import os
+import shutil
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.synthetic import DEFAULT_SEED
+from database import bulk_import
+from database.migrate import migrate
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BASE_DIR)
+BASE_DB_PATH = os.path.join(REPO_DIR, 'database', 'agriguard.db')
+
+# Generation order; later tables draw on rows of earlier ones.
+# There is no varieties table - varieties are crops rows named after a
+# parent crop, with its category and season.
+TABLES = (
+    "regions", "crops", "varieties", "diseases",
+    "crop_diseases", "crop_regions", "suppliers", "ngos", "schemes",
+)
+
+CHUNK_SIZE = 50000
+
+STATES = (
+    "Punjab", "West Bengal", "Tamil Nadu", "Andhra Pradesh", "Karnataka", "Maharashtra",
+    "Madhya Pradesh", "Rajasthan", "Uttar Pradesh", "Gujarat", "Haryana", "Bihar",
+    "Odisha", "Kerala", "Telangana", "Assam", "Chhattisgarh", "Jharkhand",
+)
+CLIMATES = ("Semi-arid", "Humid Subtropical", "Tropical Savanna", "Arid", "Humid Tropical", "Montane")
+CROP_STEMS = (
+    "Rice", "Wheat", "Maize", "Bajra", "Jowar", "Ragi", "Chickpea", "Pigeon Pea", "Moong",
+    "Urad", "Lentil", "Groundnut", "Mustard", "Soybean", "Sunflower", "Sesame", "Tomato",
+    "Potato", "Onion", "Brinjal", "Okra", "Cabbage", "Cauliflower", "Chilli", "Mango",
+    "Banana", "Guava", "Papaya", "Pomegranate", "Grapes", "Cotton", "Sugarcane", "Jute",
+    "Tea", "Coffee", "Turmeric", "Ginger", "Cardamom", "Black Pepper", "Coconut",
+)
+CATEGORIES = ("Cereal", "Vegetable", "Fruit", "Pulse", "Oilseed", "Cash Crop", "Spice")
+WATER_NEEDS = ("Low", "Low-Medium", "Medium", "Medium-High", "High")
+VARIETY_WORDS = ("Swarna", "Pusa", "Sona", "Lokwan", "Kalyan", "Arka", "Co", "Jawahar", "Hybrid", "Desi")
+DISEASE_WORDS = (
+    ("Leaf", "Stem", "Root", "Fruit", "Collar", "Neck", "Pod", "Boll"),
+    ("Blight", "Rot", "Rust", "Spot", "Wilt", "Mildew", "Mosaic", "Smut", "Borer", "Curl"),
+)
+DISEASE_TYPES = ("Fungal", "Bacterial", "Viral", "Insect", "Fungal/Bacterial")
+SEVERITIES = ("Moderate", "High", "Very High")
+SUPPLIER_WORDS = (
+    ("Kisan", "Green", "Bharat", "Annapurna", "Shree", "Krishi", "Jai", "Harit", "Gramin", "Sai"),
+    ("Agro Centre", "Seeds & Fertilizers", "Krishi Kendra", "Agri Store", "Traders", "Beej Bhandar"),
+)
+PRODUCTS = (
+    "Urea", "DAP", "NPK", "Potash", "Seeds", "Pesticides", "Organic", "Vermicompost",
+    "Micronutrients", "Herbicides", "Insecticides", "Bio-fertilizers", "Neem cake", "Drip kits",
+)
+DELIVERY_CHARGES = ("Free", "₹50", "₹75", "₹100", "Pickup Only")
+PROGRAM_TYPES = (
+    "Training & Seeds", "Micro-finance", "Irrigation Support", "Education & Training",
+    "Organic Certification", "Integrated Support", "Women Farmers", "Watershed",
+)
+DEPARTMENTS = (
+    "Ministry of Agriculture & Farmers Welfare", "Ministry of Rural Development",
+    "Ministry of New and Renewable Energy", "NABARD", "State Agriculture Department",
+)
+ELIGIBILITY = (
+    "All landholding farmer families", "Small and marginal farmers", "Farmers with irrigation needs",
+    "Women farmers and SHGs", "Tenant farmers and sharecroppers",
+)
+SCHEME_WORDS = ("Kisan", "Fasal", "Krishi", "Sinchai", "Mitti", "Beej", "Pashu", "Gramin")
+
+
+# ===== DISTRIBUTIONS =====
+
+def zipf_weights(n, exponent=1.1):
+    """Probabilities for n ranked items, heavily skewed towards the first"""
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+def pick(rng, values, size, weights=None):
+    """size draws from values as a list (weights default to uniform)"""
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size, p=weights)].tolist()
+
+
+def ratings(rng, size):
+    """J-shaped 1-5 star ratings, mostly between 4 and 5, like review sites"""
+    return np.round(np.clip(5.0 - rng.gamma(1.4, 0.45, size), 1.0, 5.0), 1).tolist()
+
+
+def subsets(rng, items, counts, weights):
+    """One weighted sample without replacement per row, joined with ", "
+
+    Vectorized with the Gumbel top-k trick: the counts[i] largest of
+    log(weight) + Gumbel noise are a weighted draw without replacement.
+    """
+    keys = np.log(weights) + rng.gumbel(size=(len(counts), len(items)))
+    ranks = np.argsort(np.argsort(-keys, axis=1), axis=1)
+    masks = ((ranks < np.asarray(counts)[:, None]) @ (1 << np.arange(len(items)))).tolist()
+    labels = {}
+    for mask in set(masks):
+        labels[mask] = ", ".join(item for bit, item in enumerate(items) if mask >> bit & 1)
+    return [labels[mask] for mask in masks]
+
+
+def coverage_strings(rng, size):
+    """'Pan India' for some NGOs, else a few (skewed, mostly big) states"""
+    pan_india = (rng.random(size) < 0.12).tolist()
+    state_counts = np.minimum(rng.geometric(0.55, size), len(STATES))
+    states = subsets(rng, STATES, state_counts, zipf_weights(len(STATES), 0.8))
+    return ["Pan India" if national else covered for national, covered in zip(pan_india, states)]
+
+
+def phones(rng, size):
+    return [f"+91 9{number:09d}" for number in rng.integers(0, 10 ** 9, size).tolist()]
+
+
+# ===== TABLE GENERATORS =====
+# Each takes (rng, start, size, context) and returns rows for one chunk;
+# start numbers the generated names so they stay unique across runs.
+
+def _regions(rng, start, size, context):
+    states = pick(rng, STATES, size, zipf_weights(len(STATES), 0.8))
+    climates = pick(rng, CLIMATES, size)
+    rainfall = np.round(rng.gamma(3.0, 350.0, size)).astype(int).tolist()
+    return [
+        (f"{state} District {start + i}", climate, rain, f"Agricultural district in {state}")
+        for i, (state, climate, rain) in enumerate(zip(states, climates, rainfall))
+    ]
+
+
+def _crops(rng, start, size, context):
+    stems = pick(rng, CROP_STEMS, size, zipf_weights(len(CROP_STEMS), 0.7))
+    categories = pick(rng, CATEGORIES, size, (0.22, 0.22, 0.2, 0.12, 0.1, 0.08, 0.06))
+    seasons = pick(rng, context["season_ids"], size)
+    water = pick(rng, WATER_NEEDS, size)
+    yield_min = np.round(rng.gamma(2.0, 1.0, size), 1)
+    yield_max = np.round(yield_min * rng.uniform(1.3, 2.5, size), 1)
+    return [
+        (f"{stem} {start + i}", category, season, need, "Medium NPK", "Jun-Jul", "Oct-Nov",
+         low, high, "tonnes/acre", f"{category} crop related to {stem}")
+        for i, (stem, category, season, need, low, high)
+        in enumerate(zip(stems, categories, seasons, water, yield_min.tolist(), yield_max.tolist()))
+    ]
+
+
+def _varieties(rng, start, size, context):
+    parents = context["parents"]
+    # Popular crops get most of the varieties
+    chosen = rng.choice(len(parents), size, p=zipf_weights(len(parents), 0.9))
+    words = pick(rng, VARIETY_WORDS, size)
+    rows = []
+    for i, (parent, word) in enumerate(zip(chosen.tolist(), words)):
+        name, category, season, need = parents[parent]
+        rows.append((f"{name} {word}-{start + i}", category, season, need, "Medium NPK", "Jun-Jul", "Oct-Nov",
+                     None, None, "tonnes/acre", f"Variety of {name}"))
+    return rows
+
+
+def _crop_parameters(rng, crop_ids):
+    """optimal and tolerance ranges for every new crop, as calculate_risk reads them"""
+    size = len(crop_ids)
+    rain_low = np.round(rng.gamma(2.5, 60.0, size)).astype(int)
+    rain_high = rain_low + np.round(rng.gamma(3.0, 40.0, size)).astype(int)
+    temp_low = np.round(rng.normal(20.0, 4.0, size), 1)
+    temp_high = np.round(temp_low + rng.uniform(6.0, 14.0, size), 1)
+    humidity_low = rng.integers(40, 75, size)
+    humidity_high = np.minimum(humidity_low + rng.integers(10, 30, size), 100)
+    ph_low = np.round(rng.uniform(5.0, 6.5, size), 1)
+    ph_high = np.round(ph_low + rng.uniform(0.8, 2.0, size), 1)
+    rows = []
+    for values in zip(crop_ids, rain_low.tolist(), rain_high.tolist(), temp_low.tolist(), temp_high.tolist(),
+                      humidity_low.tolist(), humidity_high.tolist(), ph_low.tolist(), ph_high.tolist()):
+        crop_id, r_low, r_high, t_low, t_high, h_low, h_high, p_low, p_high = values
+        rows.append((crop_id, "optimal", r_low, r_high, t_low, t_high, h_low, h_high, p_low, p_high))
+        rows.append((crop_id, "tolerance", int(r_low * 0.7), int(r_high * 1.3), round(t_low - 5, 1),
+                     round(t_high + 5, 1), max(h_low - 10, 0), min(h_high + 5, 100),
+                     round(p_low - 0.5, 1), round(p_high + 0.8, 1)))
+    return rows
+
+
+def _diseases(rng, start, size, context):
+    parts = pick(rng, DISEASE_WORDS[0], size)
+    kinds = pick(rng, DISEASE_WORDS[1], size)
+    types = pick(rng, DISEASE_TYPES, size, (0.55, 0.15, 0.12, 0.15, 0.03))
+    severities = pick(rng, SEVERITIES, size, (0.3, 0.55, 0.15))
+    return [
+        (f"{part} {kind} {start + i}", kind_type, severity, f"{kind} symptoms on the {part.lower()}",
+         "Humidity above 80%", "Copper oxychloride 3 g/L", "Neem oil 5 ml/L", "Use resistant varieties")
+        for i, (part, kind, kind_type, severity) in enumerate(zip(parts, kinds, types, severities))
+    ]
+
+
+def _links(rng, size, left_ids, right_ids, value=None):
+    """Random (left, right[, value]) links: left uniform, right zipf-skewed"""
+    left = np.asarray(left_ids)[rng.integers(len(left_ids), size=size)]
+    right = np.asarray(right_ids)[rng.choice(len(right_ids), size, p=zipf_weights(len(right_ids), 0.9))]
+    if value is None:
+        return list(zip(left.tolist(), right.tolist()))
+    return list(zip(left.tolist(), right.tolist(), value(size)))
+
+
+def _suppliers(rng, start, size, context):
+    first = pick(rng, SUPPLIER_WORDS[0], size)
+    second = pick(rng, SUPPLIER_WORDS[1], size)
+    # Big mandi towns host most dealers
+    locations = pick(rng, context["region_names"], size, context["region_weights"])
+    products = subsets(rng, PRODUCTS, rng.integers(1, 5, size), zipf_weights(len(PRODUCTS), 0.6))
+    delivery = pick(rng, ("Yes", "No"), size, (0.7, 0.3))
+    charges = pick(rng, DELIVERY_CHARGES, size, (0.45, 0.2, 0.1, 0.15, 0.1))
+    has_email = (rng.random(size) < 0.4).tolist()
+    return [
+        (f"{a} {b} {start + i}", product_list, location, available, charge, phone,
+         f"dealer{start + i}@example.in" if email else None, rating)
+        for i, (a, b, location, product_list, available, charge, phone, email, rating) in enumerate(zip(
+            first, second, locations, products, delivery, charges, phones(rng, size), has_email, ratings(rng, size)))
+    ]
+
+
+def _ngos(rng, start, size, context):
+    programs = pick(rng, PROGRAM_TYPES, size, zipf_weights(len(PROGRAM_TYPES), 0.7))
+    names = pick(rng, ("Foundation", "Trust", "Samiti", "Society", "Sangathan"), size)
+    return [
+        (f"{program.split()[0]} {kind} {start + i}", f"{program} for farming communities", program, coverage,
+         f"info{start + i}@ngo.example.in", phone, f"https://ngo{start + i}.example.in")
+        for i, (program, kind, coverage, phone)
+        in enumerate(zip(programs, names, coverage_strings(rng, size), phones(rng, size)))
+    ]
+
+
+def _schemes(rng, start, size, context):
+    words = pick(rng, SCHEME_WORDS, size)
+    departments = pick(rng, DEPARTMENTS, size, (0.5, 0.15, 0.05, 0.1, 0.2))
+    eligibility = pick(rng, ELIGIBILITY, size)
+    amounts = (np.round(rng.lognormal(9.5, 1.0, size), -3)).astype(int).tolist()
+    return [
+        (f"PM {word} Yojana {start + i}", department, f"{word} support scheme", f"₹{amount:,}/year",
+         rule, f"https://scheme{start + i}.example.gov.in", "1800-11-3377", f"helpdesk{start + i}@example.gov.in")
+        for i, (word, department, rule, amount) in enumerate(zip(words, departments, eligibility, amounts))
+    ]
+
+
+# table -> (target table, columns, row generator)
+NAMED_TABLES = {
+    "regions": ("regions", ("region_name", "climate_type", "avg_rainfall_mm", "description"), _regions),
+    "crops": ("crops", ("crop_name", "category", "season_id", "water_need", "nutrient_need", "sowing_period",
+                        "harvest_period", "yield_min", "yield_max", "yield_unit", "description"), _crops),
+    "diseases": ("diseases", ("disease_name", "disease_type", "severity", "symptoms", "conditions_favoured",
+                              "treatment_chemical", "treatment_organic", "prevention"), _diseases),
+    "suppliers": ("suppliers", ("supplier_name", "products", "location", "delivery_available", "delivery_charge",
+                                "phone", "email", "rating"), _suppliers),
+    "ngos": ("ngos", ("ngo_name", "description", "program_type", "coverage", "contact_email", "phone",
+                      "website"), _ngos),
+    "schemes": ("government_schemes", ("scheme_name", "department", "description", "benefit_amount",
+                                       "eligibility", "website", "phone", "email"), _schemes),
+}
+NAMED_TABLES["varieties"] = ("crops", NAMED_TABLES["crops"][1], _varieties)
+
+# Tables whose stats/search insert triggers are suspended during generation
+WRITTEN_TABLES = ("regions", "crops", "crop_parameters", "diseases", "crop_diseases", "crop_regions",
+                  "suppliers", "ngos", "government_schemes")
+
+
+def scaled_volumes(rows):
+    """Volumes for a database of about `rows` rows per big table
+
+    Suppliers, NGOs, schemes and crop-region links get `rows` each; the
+    catalogue tables grow more slowly, the way the real data does.
+    """
+    return {
+        "regions": max(20, rows // 100),
+        "crops": max(20, rows // 20),
+        "varieties": max(20, rows // 20),
+        "diseases": max(20, rows // 50),
+        "crop_diseases": rows // 2,
+        "crop_regions": rows,
+        "suppliers": rows,
+        "ngos": rows,
+        "schemes": rows,
+    }
+
+
+# ===== GENERATION =====
+
+def prepare(db_path, base=BASE_DB_PATH):
+    """Copy base to db_path if needed and migrate it, which installs the
+    stats and search triggers that maintain derived data while generating"""
+    if not os.path.exists(db_path):
+        shutil.copyfile(base, db_path)
+    migrate(db_path, verbose=False)
+
+
+def _insert(conn, statement, rows):
+    return max(conn.executemany(statement, rows).rowcount, 0)
+
+
+def _fill_named(conn, rng, key, count, context):
+    table, columns, make = NAMED_TABLES[key]
+    statement = f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    start = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) + 1 FROM {table}").fetchone()[0]
+    inserted = 0
+    for offset in range(0, count, CHUNK_SIZE):
+        size = min(CHUNK_SIZE, count - offset)
+        inserted += _insert(conn, statement, make(rng, start + offset, size, context))
+    return start, inserted
+
+
+def _fill_links(conn, rng, table, columns, count, left_ids, right_ids, value=None):
+    """count unique links, topping up after duplicates are ignored"""
+    statement = f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+    capacity = len(left_ids) * len(right_ids)
+    inserted = 0
+    for _ in range(20):
+        missing = min(count, capacity) - inserted
+        if missing <= 0:
+            break
+        for offset in range(0, missing, CHUNK_SIZE):
+            inserted += _insert(conn, statement, _links(rng, min(CHUNK_SIZE, missing - offset), left_ids, right_ids, value))
+    return inserted
+
+
+def generate(db_path, volumes, seed=DEFAULT_SEED, base=BASE_DB_PATH, log=print):
+    """Add the given volume of synthetic rows per table to db_path
+
+    Runs in one transaction with the bulk importer's pragmas and trigger
+    handling. Every table draws from its own generator seeded by (seed,
+    table), so the same seed and volumes always give the same database and
+    changing one volume leaves the other tables' rows unchanged.
+    """
+    unknown = set(volumes) - set(TABLES)
+    if unknown:
+        raise ValueError(f"unknown tables: {', '.join(sorted(unknown))}")
+    prepare(db_path, base)
+
+    counts = {}
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path, isolation_level=None, timeout=30)
+    try:
+        for pragma in bulk_import.LOAD_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            first_rowids = {table: conn.execute(f"SELECT COALESCE(MAX(rowid), 0) + 1 FROM {table}").fetchone()[0]
+                            for table in WRITTEN_TABLES}
+            suspended = {table: bulk_import.suspend_insert_triggers(conn, table) for table in WRITTEN_TABLES}
+            rng = {table: np.random.default_rng([seed, index]) for index, table in enumerate(TABLES)}
+            context = {"season_ids": [row[0] for row in conn.execute("SELECT season_id FROM seasons ORDER BY season_id")]}
+
+            def fill(key):
+                if volumes.get(key):
+                    start, counts[key] = _fill_named(conn, rng[key], key, volumes[key], context)
+                    log(f"   {key:14s} {counts[key]:>12,}")
+                    return start
+                return None
+
+            fill("regions")
+            crops_start = fill("crops")
+            if volumes.get("varieties"):
+                parents = conn.execute(
+                    "SELECT crop_name, category, season_id, water_need FROM crops WHERE crop_id >= ? ORDER BY crop_id",
+                    (crops_start or 0,)
+                ).fetchall()
+                context["parents"] = parents
+                fill("varieties")
+            new_crops = [row[0] for row in conn.execute("SELECT crop_id FROM crops WHERE crop_id >= ? ORDER BY crop_id",
+                                                        (first_rowids["crops"],))]
+            if new_crops:
+                parameters = _crop_parameters(np.random.default_rng([seed, len(TABLES)]), new_crops)
+                for offset in range(0, len(parameters), CHUNK_SIZE):
+                    _insert(conn, "INSERT INTO crop_parameters (crop_id, param_type, rainfall_min_mm, rainfall_max_mm, "
+                                  "temp_min_c, temp_max_c, humidity_min, humidity_max, ph_min, ph_max) "
+                                  "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", parameters[offset:offset + CHUNK_SIZE])
+                counts["crop_parameters"] = len(parameters)
+            fill("diseases")
+
+            crop_ids = [row[0] for row in conn.execute("SELECT crop_id FROM crops ORDER BY crop_id")]
+            region_rows = conn.execute("SELECT region_id, region_name FROM regions ORDER BY region_id").fetchall()
+            # The original states come first, so they get the heaviest weights
+            context["region_names"] = [name for _, name in region_rows]
+            context["region_weights"] = zipf_weights(len(region_rows), 1.0)
+            if volumes.get("crop_diseases"):
+                disease_ids = [row[0] for row in conn.execute("SELECT disease_id FROM diseases ORDER BY disease_id")]
+                counts["crop_diseases"] = _fill_links(
+                    conn, rng["crop_diseases"], "crop_diseases", ("crop_id", "disease_id"),
+                    volumes["crop_diseases"], crop_ids, disease_ids,
+                )
+                log(f"   {'crop_diseases':14s} {counts['crop_diseases']:>12,}")
+            if volumes.get("crop_regions"):
+                counts["crop_regions"] = _fill_links(
+                    conn, rng["crop_regions"], "crop_regions", ("crop_id", "region_id", "suitability_score"),
+                    volumes["crop_regions"], crop_ids, [region_id for region_id, _ in region_rows],
+                    lambda size: (rng["crop_regions"].binomial(9, 0.6, size) + 1).tolist(),
+                )
+                log(f"   {'crop_regions':14s} {counts['crop_regions']:>12,}")
+            for key in ("suppliers", "ngos", "schemes"):
+                fill(key)
+
+            # All triggers back first, then catch up every table
+            for triggers in suspended.values():
+                bulk_import.restore_triggers(conn, triggers)
+            for table, triggers in suspended.items():
+                bulk_import.catch_up(conn, table, triggers, first_rowids[table])
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+
+    seconds = time.perf_counter() - started
+    total = sum(counts.values())
+    log(f"✓ {total:,} rows generated in {seconds:.1f} s ({total / seconds if seconds else 0:,.0f} rows/sec)")
+    return counts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.synthetic_db", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("db", help="database to fill; created as a copy of --base if it does not exist")
+    parser.add_argument("--base", default=BASE_DB_PATH, help="database copied when db does not exist")
+    parser.add_argument("--rows", type=int, default=10000, help="scale every table from this size (see scaled_volumes)")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="random seed")
+    for table in TABLES:
+        parser.add_argument(f"--{table.replace('_', '-')}", type=int, dest=table, metavar="N",
+                            help=f"{table} to add (overrides --rows)")
+    args = parser.parse_args(argv)
+
+    volumes = scaled_volumes(args.rows)
+    volumes.update({table: getattr(args, table) for table in TABLES if getattr(args, table) is not None})
+    print(f"Filling {args.db} (seed {args.seed})")
+    generate(args.db, volumes, args.seed, args.base)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
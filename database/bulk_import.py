@@ -0,0 +1,319 @@
+"""
+AgriGuard AI Bulk Importer
+Streams reference data (mandis, input dealers, NGO registries, ...) from
+CSV or JSONL files into the database: rows are parsed in chunks, names such
+as crop_name or region_name are resolved to ids through in-memory maps, and
+every chunk goes in with executemany() inside one transaction
+
+Usage: python database/bulk_import.py suppliers dealers.csv [--db path]
+           [--format csv|jsonl] [--chunk-size 50000] [--on-conflict abort|ignore]
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import re
+import sqlite3
+import sys
+import time
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'agriguard.db')
+
+IMPORT_TABLES = (
+    "suppliers", "ngos", "government_schemes", "regions", "diseases",
+    "crops", "crop_parameters", "crop_diseases", "crop_regions",
+)
+
+# Name field in an import file -> (id column it fills, table it is looked up in).
+# Used only when the target table has the id column but not the name column.
+NAME_REFERENCES = {
+    "season_name": ("season_id", "seasons"),
+    "crop_name": ("crop_id", "crops"),
+    "disease_name": ("disease_id", "diseases"),
+    "region_name": ("region_id", "regions"),
+}
+
+CHUNK_SIZE = 50000
+
+# Connection-local settings for the load; the connection is closed afterwards.
+# journal_mode stays as it is (WAL), so readers keep working during an import.
+LOAD_PRAGMAS = (
+    "PRAGMA synchronous = OFF",
+    "PRAGMA cache_size = -131072",
+    "PRAGMA temp_store = MEMORY",
+)
+
+ON_CONFLICT = {"abort": "INSERT", "ignore": "INSERT OR IGNORE"}
+
+# The stats insert triggers of the 0005 migration: VALUES ('total', 'crops', 1)
+# or VALUES ('crop_category', NEW.category, 1)
+STATS_TRIGGER = re.compile(r"INSERT\s+INTO\s+stats\s*\(\s*scope\s*,\s*name\s*,\s*count\s*\)\s*"
+                           r"VALUES\s*\(\s*'(\w+)'\s*,\s*('\w+'|NEW\.\w+)\s*,\s*1\s*\)", re.IGNORECASE)
+
+
+# ===== READING =====
+
+def _open_text(path):
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8-sig', newline='')
+    return open(path, 'r', encoding='utf-8-sig', newline='')
+
+
+def detect_format(path):
+    """'csv' or 'jsonl' from the file extension (a trailing .gz is ignored)"""
+    name = path[:-3] if path.endswith('.gz') else path
+    extension = os.path.splitext(name)[1].lower()
+    if extension in ('.csv', '.tsv'):
+        return 'csv'
+    if extension in ('.jsonl', '.ndjson'):
+        return 'jsonl'
+    raise ValueError(f"cannot tell the format of {path}; pass --format csv or jsonl")
+
+
+def read_chunks(path, fmt=None, chunk_size=CHUNK_SIZE):
+    """Yield (fields, rows) per chunk; rows are lists aligned with fields
+
+    Only one chunk is held in memory at a time. For JSONL the fields are the
+    keys of the first record; keys missing from later records read as None.
+    """
+    fmt = fmt or detect_format(path)
+    with _open_text(path) as f:
+        if fmt == 'csv':
+            delimiter = '\t' if path.replace('.gz', '').endswith('.tsv') else ','
+            reader = csv.reader(f, delimiter=delimiter)
+            fields = [field.strip() for field in next(reader, [])]
+            records = reader
+        else:
+            records = (json.loads(line) for line in f if line.strip())
+            first = next(records, None)
+            if first is None:
+                return
+            fields = list(first)
+            records = _chain_first(first, records, fields)
+
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_size:
+                yield fields, chunk
+                chunk = []
+        if chunk:
+            yield fields, chunk
+
+
+def _chain_first(first, records, fields):
+    yield [first.get(field) for field in fields]
+    for record in records:
+        yield [record.get(field) for field in fields]
+
+
+# ===== NAME RESOLUTION =====
+
+def load_name_map(conn, table, name_column, id_column):
+    """{casefolded name: id} for a lookup table, built once per import"""
+    return {
+        str(name).strip().casefold(): row_id
+        for name, row_id in conn.execute(f"SELECT {name_column}, {id_column} FROM {table}")
+    }
+
+
+def plan_columns(conn, table, fields):
+    """Map file fields onto table columns
+
+    Returns (columns, plan, ignored): columns to insert, one
+    (field index, name map or None, required) entry per column, and the
+    file fields that match nothing. The primary key is never imported, so
+    new rows always get fresh ids.
+    """
+    table_info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    if not table_info:
+        raise ValueError(f"no such table: {table}")
+    notnull = {row[1]: bool(row[3]) for row in table_info if not row[5]}
+
+    columns, plan, ignored = [], [], []
+    for index, field in enumerate(fields):
+        if field in notnull:
+            columns.append(field)
+            plan.append((index, None, notnull[field]))
+        elif field in NAME_REFERENCES and NAME_REFERENCES[field][0] in notnull:
+            id_column, lookup_table = NAME_REFERENCES[field]
+            if id_column in columns:
+                raise ValueError(f"{table}: both {id_column} and {field} given")
+            columns.append(id_column)
+            plan.append((index, load_name_map(conn, lookup_table, field, id_column), notnull[id_column]))
+        else:
+            ignored.append(field)
+
+    defaults = {row[1] for row in table_info if row[4] is not None}
+    missing = [column for column, required in notnull.items()
+               if required and column not in columns and column not in defaults]
+    if missing:
+        raise ValueError(f"{table}: file has no value for required column(s) {', '.join(missing)}")
+    return columns, plan, ignored
+
+
+def convert_chunk(chunk, plan, report):
+    """Rows ready for executemany; rows with unknown names are skipped"""
+    width = max(index for index, _, _ in plan) + 1
+    rows = []
+    for record in chunk:
+        if len(record) < width:
+            report["malformed"] += 1
+            continue
+        values = []
+        for index, names, required in plan:
+            value = record[index]
+            if value == "":
+                value = None
+            if names is not None and value is not None:
+                value = names.get(str(value).strip().casefold())
+            if value is None and required:
+                break
+            values.append(value)
+        else:
+            rows.append(tuple(values))
+            continue
+        report["unresolved"] += 1
+    return rows
+
+
+# ===== DERIVED DATA =====
+
+def _search_indexes(conn, table):
+    """[(fts table, content rowid column, indexed columns)] kept over table"""
+    indexes = []
+    for name, sql in conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table' AND sql LIKE 'CREATE VIRTUAL TABLE%'"):
+        content = re.search(r"content\s*=\s*'(\w+)'", sql)
+        if content and content.group(1) == table:
+            rowid = re.search(r"content_rowid\s*=\s*'(\w+)'", sql)
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({name})")]
+            indexes.append((name, rowid.group(1) if rowid else 'rowid', columns))
+    return indexes
+
+
+def suspend_insert_triggers(conn, table):
+    """Drop the stats and search insert triggers on table (inside the open
+    transaction) and return them for restore_triggers()
+
+    Firing them once per row is what makes a plain row-by-row load slow;
+    catch_up() brings stats and search indexes level in a few set-based
+    statements instead. Other triggers are left to fire.
+    """
+    known = {f"{fts}_insert" for fts, _, _ in _search_indexes(conn, table)}
+    triggers = []
+    for name, sql in conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table,)).fetchall():
+        if re.search(r"\bAFTER\s+INSERT\s+ON\b", sql, re.IGNORECASE) and (name in known or STATS_TRIGGER.search(sql)):
+            conn.execute(f"DROP TRIGGER {name}")
+            triggers.append((name, sql))
+    return triggers
+
+
+def restore_triggers(conn, triggers):
+    for _, sql in triggers:
+        conn.execute(sql)
+
+
+def catch_up(conn, table, triggers, first_rowid):
+    """Do set-wise what the suspended triggers skipped for rows >= first_rowid:
+    one INSERT ... SELECT per search index and one grouped upsert per stats
+    counter, so the cost follows the imported rows, not the table size"""
+    names = {name for name, _ in triggers}
+    for fts, rowid, columns in _search_indexes(conn, table):
+        if f"{fts}_insert" in names:
+            column_list = ", ".join(columns)
+            conn.execute(f"INSERT INTO {fts} (rowid, {column_list}) "
+                         f"SELECT {rowid}, {column_list} FROM {table} WHERE {rowid} >= ?", (first_rowid,))
+    for _, sql in triggers:
+        match = STATS_TRIGGER.search(sql)
+        if match:
+            scope, counted = match.group(1), re.sub(r"^NEW\.", "", match.group(2), flags=re.IGNORECASE)
+            conn.execute(f"INSERT INTO stats (scope, name, count) "
+                         f"SELECT '{scope}', {counted}, COUNT(*) FROM {table} WHERE rowid >= ? GROUP BY {counted} "
+                         f"ON CONFLICT (scope, name) DO UPDATE SET count = count + excluded.count", (first_rowid,))
+
+
+# ===== IMPORT =====
+
+def import_file(table, path, db_path=None, fmt=None, chunk_size=CHUNK_SIZE, on_conflict="abort", verbose=True):
+    """Load one CSV/JSONL file into table in a single transaction
+
+    Returns a report with rows read, inserted and skipped, and the rate.
+    Any database error rolls the whole import back.
+    """
+    if table not in IMPORT_TABLES:
+        raise ValueError(f"cannot import into {table}; expected one of {', '.join(IMPORT_TABLES)}")
+    if on_conflict not in ON_CONFLICT:
+        raise ValueError(f"on_conflict must be one of {', '.join(ON_CONFLICT)}")
+
+    report = {"table": table, "file": path, "read": 0, "inserted": 0, "unresolved": 0, "malformed": 0, "ignored_fields": []}
+    started = time.perf_counter()
+    conn = sqlite3.connect(db_path or DB_PATH, isolation_level=None, timeout=30)
+    try:
+        for pragma in LOAD_PRAGMAS:
+            conn.execute(pragma)
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            first_rowid = conn.execute(f"SELECT COALESCE(MAX(rowid), 0) + 1 FROM {table}").fetchone()[0]
+            triggers = suspend_insert_triggers(conn, table)
+            statement = None
+            for fields, chunk in read_chunks(path, fmt, chunk_size):
+                if statement is None:
+                    columns, plan, report["ignored_fields"] = plan_columns(conn, table, fields)
+                    statement = (f"{ON_CONFLICT[on_conflict]} INTO {table} ({', '.join(columns)}) "
+                                 f"VALUES ({', '.join('?' * len(columns))})")
+                report["read"] += len(chunk)
+                cursor = conn.executemany(statement, convert_chunk(chunk, plan, report))
+                report["inserted"] += max(cursor.rowcount, 0)
+                if verbose:
+                    print(f"   {report['read']:>10,} rows read", end="\r", flush=True)
+            if verbose and report["read"]:
+                print()
+            restore_triggers(conn, triggers)
+            catch_up(conn, table, triggers, first_rowid)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("PRAGMA optimize")
+    finally:
+        conn.close()
+
+    report["seconds"] = time.perf_counter() - started
+    report["rows_per_sec"] = report["read"] / report["seconds"] if report["seconds"] else 0.0
+    report["skipped"] = report["read"] - report["inserted"]
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python database/bulk_import.py", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("table", choices=IMPORT_TABLES, help="table to load into")
+    parser.add_argument("files", nargs="+", help="CSV or JSONL files (optionally .gz), each imported in its own transaction")
+    parser.add_argument("--db", default=DB_PATH, help="database file (default: database/agriguard.db)")
+    parser.add_argument("--format", choices=("csv", "jsonl"), help="input format (default: from the extension)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows parsed and inserted per batch")
+    parser.add_argument("--on-conflict", choices=list(ON_CONFLICT), default="abort",
+                        help="abort the import on a constraint violation, or ignore the offending rows")
+    args = parser.parse_args(argv)
+
+    for path in args.files:
+        try:
+            report = import_file(args.table, path, args.db, args.format, args.chunk_size, args.on_conflict)
+        except (ValueError, OSError, sqlite3.Error) as e:
+            print(f"✗ {path}: {e} - nothing imported")
+            return 1
+        print(f"✓ {path}: {report['inserted']:,} rows into {args.table} in {report['seconds']:.2f} s "
+              f"({report['rows_per_sec']:,.0f} rows/sec)")
+        if report["skipped"]:
+            print(f"   {report['skipped']:,} skipped: {report['unresolved']:,} with unknown or missing names/values, "
+                  f"{report['malformed']:,} malformed, the rest duplicates")
+        if report["ignored_fields"]:
+            print(f"   ignored fields: {', '.join(report['ignored_fields'])}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,205 +5,700 @@ Provides functions to interact with the SQLite database
 
 import sqlite3
 import os
+import json
+import base64
+import threading
+import functools
+import operator
+from collections import namedtuple
+from contextlib import contextmanager
 
 # Database path
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'agriguard.db')
 
+# ===== CONNECTION MANAGEMENT =====
+
+class ConnectionManager:
+    """Reusable per-thread connections to the AgriGuard database
+    
+    Each thread gets one connection, opened on first use with the pragmas
+    below and a cache of `statement_cache_size` compiled statements, and
+    keeps it for every later query. A forked worker never reuses its
+    parent's handle, and changing DB_PATH opens a fresh connection.
+    """
+    
+    def __init__(self, path=None, statement_cache_size=256, mmap_size=64 * 1024 * 1024,
+                 cache_size_kb=8192, busy_timeout_ms=5000):
+        self.path = path
+        self.statement_cache_size = statement_cache_size
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+    
+    @property
+    def database(self):
+        return self.path or DB_PATH
+    
+    def connect(self, **kwargs):
+        """Open a new configured connection; the caller owns and closes it"""
+        conn = sqlite3.connect(self.database, timeout=self.busy_timeout_ms / 1000,
+                               cached_statements=self.statement_cache_size, **kwargs)
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        try:
+            conn.execute("PRAGMA journal_mode = WAL")
+        except sqlite3.OperationalError:
+            pass  # read-only location - keep the rollback journal
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kb)}")
+        return conn
+    
+    def get(self):
+        """This thread's connection, opened on first use"""
+        local = self._local
+        key = (os.getpid(), self.database)
+        conn = getattr(local, 'conn', None)
+        if conn is None or local.key != key:
+            if conn is not None and local.key[0] == key[0]:
+                conn.close()
+            conn = local.conn = self.connect()
+            local.key = key
+        return conn
+    
+    @contextmanager
+    def connection(self):
+        """Run several queries on this thread's connection
+        
+        Nested uses share the same connection; an open transaction is
+        rolled back if the block raises.
+        """
+        conn = self.get()
+        try:
+            yield conn
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
+    
+    def close(self):
+        """Close this thread's connection (reopened on next use)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.key[0] == os.getpid():
+            conn.close()
+        self._local.conn = None
+
+# Shared manager used by all helpers below
+db = ConnectionManager()
+
+def connection():
+    """Context manager yielding the calling thread's shared connection"""
+    return db.connection()
+
 def get_connection():
-    """Get a database connection"""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+    """Get a new standalone database connection (caller closes it)"""
+    return db.connect()
 
-def get_all_crops():
-    """Get all crops from database"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT c.*, s.season_name 
-        FROM crops c 
-        LEFT JOIN seasons s ON c.season_id = s.season_id
-        ORDER BY c.category, c.crop_name
-    """)
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+class DataVersionWatcher:
+    """Notices commits made to the database by any other connection
+    
+    Holds one long-lived connection that never writes and compares its
+    PRAGMA data_version between calls. Callers serialize access themselves.
+    """
+    
+    def __init__(self):
+        self.conn = None
+        self._key = None
+        self._version = None
+    
+    def changed(self):
+        """True if anything was committed since the last call (or on first use)"""
+        key = (os.getpid(), DB_PATH)
+        if self.conn is None or self._key != key:
+            if self.conn is not None and self._key[0] == key[0]:
+                self.conn.close()
+            self.conn = db.connect(check_same_thread=False)
+            self._key = key
+            self._version = None
+        
+        version = self.conn.execute("PRAGMA data_version").fetchone()[0]
+        changed = version != self._version
+        self._version = version
+        return changed
 
-def get_crops_by_category(category):
-    """Get crops by category"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT c.*, s.season_name 
-        FROM crops c 
-        LEFT JOIN seasons s ON c.season_id = s.season_id
-        WHERE c.category = ?
-        ORDER BY c.crop_name
-    """, (category,))
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+# ===== ROW MODES =====
 
-def get_crops_by_season(season_name):
-    """Get crops by season"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT c.*, s.season_name 
-        FROM crops c 
-        INNER JOIN seasons s ON c.season_id = s.season_id
-        WHERE s.season_name = ?
-        ORDER BY c.crop_name
-    """, (season_name,))
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+# How query helpers return rows: "dict" (default), "record" (immutable slots
+# records, see record_type) or "tuple" (plain tuples in column order)
+ROW_MODES = ("dict", "record", "tuple")
+_row_mode = threading.local()
 
-def get_crop_by_name(crop_name):
-    """Get crop details by name"""
-    conn = get_connection()
+@contextmanager
+def row_mode(mode):
+    """Return rows from the db_util helpers in this thread in another mode
+    
+        with row_mode("record"):
+            suppliers = get_all_suppliers()   # supplier.rating, supplier['rating']
+    """
+    if mode not in ROW_MODES:
+        raise ValueError(f"Unknown row mode {mode!r}; expected one of {ROW_MODES}")
+    previous = current_row_mode()
+    _row_mode.mode = mode
+    try:
+        yield
+    finally:
+        _row_mode.mode = previous
+
+def current_row_mode():
+    """Row mode in effect for this thread"""
+    return getattr(_row_mode, 'mode', 'dict')
+
+class Record(tuple):
+    """Base of the generated record types
+    
+    A record is a tuple subclass with empty __slots__ (no per-row dict), so
+    it is as compact as a tuple and immutable. Fields read as attributes,
+    which is all templates need, and the read-only dict protocol (row['col'],
+    get, keys, items, to_dict) keeps dict-style callers working.
+    """
+    
+    __slots__ = ()
+    _columns = ()
+    _index = {}
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = self._index[key]
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+    
+    def get(self, key, default=None):
+        index = self._index.get(key)
+        return default if index is None else tuple.__getitem__(self, index)
+    
+    def keys(self):
+        return self._columns
+    
+    def items(self):
+        return zip(self._columns, self)
+    
+    def to_dict(self):
+        return dict(zip(self._columns, self))
+    
+    def __repr__(self):
+        fields = ", ".join(f"{name}={value!r}" for name, value in zip(self._columns, self))
+        return f"{type(self).__name__}({fields})"
+
+_record_types = {}
+_record_types_lock = threading.Lock()
+
+def _record_type(name, columns):
+    """Record class for a result shape, created once per (name, columns)"""
+    key = (name, columns)
+    cls = _record_types.get(key)
+    if cls is None:
+        with _record_types_lock:
+            cls = _record_types.get(key)
+            if cls is None:
+                class_name = "".join(part.capitalize() for part in name.split("_")) + "Record"
+                # namedtuple supplies the C-level field accessors; Record adds
+                # the dict protocol, and tuple.__new__ builds from a row tuple
+                fields = namedtuple(class_name, columns, rename=True)
+                cls = _record_types[key] = type(class_name, (Record, fields), {
+                    "__slots__": (),
+                    "__new__": tuple.__new__,
+                    "_columns": columns,
+                    "_index": {column: i for i, column in enumerate(columns)},
+                })
+    return cls
+
+def record_type(table):
+    """Record class generated from table's schema - the type of its
+    `SELECT *` rows in record mode"""
+    with connection() as conn:
+        columns = tuple(row[1] for row in conn.execute(f"PRAGMA table_info({table})").fetchall())
+    if not columns:
+        raise ValueError(f"No such table: {table}")
+    return _record_type(table, columns)
+
+def _cursor(conn):
+    """Cursor returning plain tuples, shaped later by _rows()/_row()"""
     cursor = conn.cursor()
-    cursor.execute("""
-        SELECT c.*, s.season_name 
-        FROM crops c 
-        LEFT JOIN seasons s ON c.season_id = s.season_id
-        WHERE c.crop_name = ?
-    """, (crop_name,))
+    cursor.row_factory = None
+    return cursor
+
+def _shape(rows, description, name):
+    mode = current_row_mode()
+    if mode == "tuple":
+        return rows
+    columns = tuple(column[0] for column in description)
+    if mode == "record":
+        return list(map(_record_type(name, columns), rows))
+    return [dict(zip(columns, row)) for row in rows]
+
+def _rows(cursor, name):
+    """All rows of an executed _cursor() in the current row mode"""
+    return _shape(cursor.fetchall(), cursor.description, name)
+
+def _row(cursor, name):
+    """Next row of an executed _cursor() in the current row mode, or None"""
     row = cursor.fetchone()
-    result = dict(row) if row else None
-    conn.close()
-    return result
+    return None if row is None else _shape([row], cursor.description, name)[0]
 
-def get_crop_parameters(crop_name):
-    """Get optimal and tolerance parameters for a crop"""
-    conn = get_connection()
-    cursor = conn.cursor()
+# ===== REFERENCE TABLE CACHE =====
+
+class ReferenceCache:
+    """Read-through cache for the get_all_* reference table loaders
     
-    # Get crop_id
-    cursor.execute("SELECT crop_id FROM crops WHERE crop_name = ?", (crop_name,))
-    crop_row = cursor.fetchone()
+    Results stay in memory until the table changes: writes made through
+    write() (add_ngo, add_supplier) drop the entries of the tables they
+    touch, and a PRAGMA data_version change - a commit from any other
+    connection or process, e.g. the populate_* scripts - drops everything. Cached lists are shared between
+    callers - copy a row before modifying it.
+    """
     
-    if not crop_row:
-        conn.close()
-        return None
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # Serializes writes on the watcher connection; reentrant so a write
+        # nested in another one on the same thread does not deadlock
+        self._write_lock = threading.RLock()
+        self._watcher = DataVersionWatcher()
+        self._entries = {}
+        self._tables = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
     
-    crop_id = crop_row['crop_id']
+    def cached(self, *tables):
+        """Decorator caching a loader whose result depends only on `tables`"""
+        def decorator(func):
+            self._tables[func.__name__] = tables
+            
+            @functools.wraps(func)
+            def wrapper(*args):
+                if not self.enabled:
+                    return func(*args)
+                key = (func.__name__, current_row_mode()) + args
+                with self._lock:
+                    if self._watcher.changed():
+                        self._clear()
+                    result = self._entries.get(key)
+                    if result is not None:
+                        self.hits += 1
+                        return list(result)
+                    self.misses += 1
+                    generation = self._generation
+                
+                result = func(*args)
+                with self._lock:
+                    # Skip storing if the table was invalidated meanwhile
+                    if generation == self._generation:
+                        self._entries[key] = result
+                return list(result)
+            return wrapper
+        return decorator
     
-    # Get parameters
-    cursor.execute("""
-        SELECT * FROM crop_parameters 
-        WHERE crop_id = ? AND param_type = 'optimal'
-    """, (crop_id,))
-    optimal = dict(cursor.fetchone()) if cursor.fetchone() else None
+    def invalidate(self, *tables):
+        """Drop cached results reading any of `tables` (all when none given)"""
+        with self._lock:
+            if tables:
+                self._drop(tables)
+            else:
+                self._clear()
     
-    cursor.execute("""
-        SELECT * FROM crop_parameters 
-        WHERE crop_id = ? AND param_type = 'tolerance'
-    """, (crop_id,))
-    tolerance = dict(cursor.fetchone()) if cursor.fetchone() else None
+    @contextmanager
+    def write(self, *tables):
+        """Connection for a write to `tables`
+        
+        The write runs on the watcher's own connection, so committing it does
+        not look like an outside change: only entries reading `tables` are
+        dropped instead of the whole cache. Writers take turns on that
+        connection but the cache lock is not held meanwhile, so readers -
+        including cached reads inside the block - carry on. The generation
+        is bumped on entry and again by the drop after the commit, so no
+        load that overlaps the write - started before it or while it is in
+        flight - gets stored.
+        """
+        with self._write_lock:
+            with self._lock:
+                if self._watcher.changed():
+                    self._clear()
+                self._generation += 1
+                conn = self._watcher.conn
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            finally:
+                with self._lock:
+                    self._drop(tables)
     
-    # Re-fetch optimal (cursor was consumed)
-    cursor.execute("""
-        SELECT * FROM crop_parameters 
-        WHERE crop_id = ? AND param_type = 'optimal'
-    """, (crop_id,))
-    optimal = dict(cursor.fetchone()) if cursor.fetchone() else None
+    def _drop(self, tables):
+        stale = {name for name, reads in self._tables.items() if set(reads) & set(tables)}
+        for key in [key for key in self._entries if key[0] in stale]:
+            del self._entries[key]
+        self._generation += 1
+        self.invalidations += 1
     
-    conn.close()
+    def _clear(self):
+        if self._entries:
+            self.invalidations += 1
+        self._entries.clear()
+        self._generation += 1
     
-    return {
-        "optimal": optimal,
-        "tolerance": tolerance
-    }
+    def stats(self):
+        """Hit/miss counters and the current hit rate"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+# Shared cache used by the get_all_* loaders
+reference_cache = ReferenceCache()
+
+@reference_cache.cached('crops', 'seasons')
+def get_all_crops():
+    """Get all crops from database"""
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("""
+            SELECT c.*, s.season_name 
+            FROM crops c 
+            LEFT JOIN seasons s ON c.season_id = s.season_id
+            ORDER BY c.category, c.crop_name
+        """)
+        results = _rows(cursor, 'crops')
+        return results
+
+def get_crops_by_category(category):
+    """Get crops by category"""
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("""
+            SELECT c.*, s.season_name 
+            FROM crops c 
+            LEFT JOIN seasons s ON c.season_id = s.season_id
+            WHERE c.category = ?
+            ORDER BY c.crop_name
+        """, (category,))
+        results = _rows(cursor, 'crops')
+        return results
+
+def get_crops_by_season(season_name):
+    """Get crops by season"""
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("""
+            SELECT c.*, s.season_name 
+            FROM crops c 
+            INNER JOIN seasons s ON c.season_id = s.season_id
+            WHERE s.season_name = ?
+            ORDER BY c.crop_name
+        """, (season_name,))
+        results = _rows(cursor, 'crops')
+        return results
+
+def get_crop_by_name(crop_name):
+    """Get crop details by name"""
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("""
+            SELECT c.*, s.season_name 
+            FROM crops c 
+            LEFT JOIN seasons s ON c.season_id = s.season_id
+            WHERE c.crop_name = ?
+        """, (crop_name,))
+        result = _row(cursor, 'crops')
+        return result
+
+def get_crop_parameters(crop_name):
+    """Get optimal and tolerance parameters for a crop"""
+    with connection() as conn:
+        cursor = _cursor(conn)
+        
+        # Get crop_id
+        cursor.execute("SELECT crop_id FROM crops WHERE crop_name = ?", (crop_name,))
+        crop_row = cursor.fetchone()
+        
+        if not crop_row:
+            return None
+        
+        crop_id = crop_row[0]
+        
+        # Get parameters
+        cursor.execute("""
+            SELECT * FROM crop_parameters 
+            WHERE crop_id = ? AND param_type = 'optimal'
+        """, (crop_id,))
+        optimal = _row(cursor, 'crop_parameters')
+        
+        cursor.execute("""
+            SELECT * FROM crop_parameters 
+            WHERE crop_id = ? AND param_type = 'tolerance'
+        """, (crop_id,))
+        tolerance = _row(cursor, 'crop_parameters')
+        
+        return {
+            "optimal": optimal,
+            "tolerance": tolerance
+        }
 
 def get_crop_diseases(crop_name):
     """Get diseases for a specific crop"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT d.* FROM diseases d
-        INNER JOIN crop_diseases cd ON d.disease_id = cd.disease_id
-        INNER JOIN crops c ON cd.crop_id = c.crop_id
-        WHERE c.crop_name = ?
-    """, (crop_name,))
-    
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    with connection() as conn:
+        cursor = _cursor(conn)
+        
+        cursor.execute("""
+            SELECT d.* FROM diseases d
+            INNER JOIN crop_diseases cd ON d.disease_id = cd.disease_id
+            INNER JOIN crops c ON cd.crop_id = c.crop_id
+            WHERE c.crop_name = ?
+            ORDER BY cd.id
+        """, (crop_name,))
+        
+        results = _rows(cursor, 'diseases')
+        return results
 
 def get_crop_regions(crop_name):
     """Get suitable regions for a specific crop"""
-    conn = get_connection()
-    cursor = conn.cursor()
+    with connection() as conn:
+        cursor = _cursor(conn)
+        
+        cursor.execute("""
+            SELECT r.*, cr.suitability_score 
+            FROM regions r
+            INNER JOIN crop_regions cr ON r.region_id = cr.region_id
+            INNER JOIN crops c ON cr.crop_id = c.crop_id
+            WHERE c.crop_name = ?
+            ORDER BY cr.suitability_score DESC, cr.id
+        """, (crop_name,))
+        
+        results = _rows(cursor, 'regions')
+        return results
+
+def get_crop_profiles(names=None):
+    """Full profiles of many crops in four set-based queries
     
-    cursor.execute("""
-        SELECT r.*, cr.suitability_score 
-        FROM regions r
-        INNER JOIN crop_regions cr ON r.region_id = cr.region_id
-        INNER JOIN crops c ON cr.crop_id = c.crop_id
-        WHERE c.crop_name = ?
-        ORDER BY cr.suitability_score DESC
-    """, (crop_name,))
-    
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    Returns {crop_name: {"crop", "parameters", "diseases", "regions"}} with
+    the same rows get_crop_by_name, get_crop_parameters, get_crop_diseases
+    and get_crop_regions give for that crop, ordered like `names` (or like
+    get_all_crops when names is None). Unknown names are left out. All four
+    queries read one consistent snapshot.
+    """
+    crop_filter = ""
+    params = ()
+    if names is not None:
+        names = list(names)
+        crop_filter = "WHERE c.crop_name IN (SELECT value FROM json_each(?))"
+        params = (json.dumps(names),)
+    
+    with connection() as conn:
+        own_transaction = not conn.in_transaction
+        if own_transaction:
+            conn.execute("BEGIN")
+        try:
+            cursor = _cursor(conn)
+            cursor.execute(f"""
+                SELECT c.*, s.season_name 
+                FROM crops c 
+                LEFT JOIN seasons s ON c.season_id = s.season_id
+                {crop_filter}
+                ORDER BY c.category, c.crop_name
+            """, params)
+            crop_rows, crop_description = cursor.fetchall(), cursor.description
+            columns = [column[0] for column in crop_description]
+            crop_id_at, crop_name_at = columns.index('crop_id'), columns.index('crop_name')
+            crop_ids = json.dumps([row[crop_id_at] for row in crop_rows])
+            
+            # Linked rows carry their crop_id in the first column
+            cursor.execute("""
+                SELECT p.crop_id, p.* FROM crop_parameters p
+                WHERE p.crop_id IN (SELECT value FROM json_each(?))
+                ORDER BY p.crop_id, p.param_id
+            """, (crop_ids,))
+            parameters = cursor.fetchall(), cursor.description
+            
+            cursor.execute("""
+                SELECT cd.crop_id, d.* FROM crop_diseases cd
+                INNER JOIN diseases d ON d.disease_id = cd.disease_id
+                WHERE cd.crop_id IN (SELECT value FROM json_each(?))
+                ORDER BY cd.crop_id, cd.id
+            """, (crop_ids,))
+            diseases = cursor.fetchall(), cursor.description
+            
+            cursor.execute("""
+                SELECT cr.crop_id, r.*, cr.suitability_score 
+                FROM crop_regions cr
+                INNER JOIN regions r ON r.region_id = cr.region_id
+                WHERE cr.crop_id IN (SELECT value FROM json_each(?))
+                ORDER BY cr.crop_id, cr.suitability_score DESC, cr.id
+            """, (crop_ids,))
+            regions = cursor.fetchall(), cursor.description
+        finally:
+            if own_transaction:
+                conn.rollback()
+    
+    def group(linked, name):
+        """{crop_id: [(raw row, shaped row)]} with the leading crop_id dropped"""
+        rows, description = linked
+        rows = [row[1:] for row in rows]
+        owners = [row[0] for row in linked[0]]
+        grouped = {}
+        for crop_id, raw, record in zip(owners, rows, _shape(rows, description[1:], name)):
+            grouped.setdefault(crop_id, []).append((raw, record))
+        return grouped
+    
+    parameter_rows = group(parameters, 'crop_parameters')
+    disease_rows = group(diseases, 'diseases')
+    region_rows = group(regions, 'regions')
+    param_type_at = [column[0] for column in parameters[1][1:]].index('param_type')
+    
+    profiles = {}
+    for row, crop in zip(crop_rows, _shape(crop_rows, crop_description, 'crops')):
+        crop_id = row[crop_id_at]
+        crop_parameters = {"optimal": None, "tolerance": None}
+        for raw, record in parameter_rows.get(crop_id, ()):
+            # First row of each type, as get_crop_parameters' fetchone()
+            if crop_parameters.get(raw[param_type_at]) is None:
+                crop_parameters[raw[param_type_at]] = record
+        profiles[row[crop_name_at]] = {
+            "crop": crop,
+            "parameters": crop_parameters,
+            "diseases": [record for _, record in disease_rows.get(crop_id, ())],
+            "regions": [record for _, record in region_rows.get(crop_id, ())],
+        }
+    
+    if names is not None:
+        profiles = {name: profiles[name] for name in dict.fromkeys(names) if name in profiles}
+    return profiles
 
+@reference_cache.cached('diseases')
 def get_all_diseases():
     """Get all diseases"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM diseases ORDER BY disease_name")
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("SELECT * FROM diseases ORDER BY disease_name")
+        results = _rows(cursor, 'diseases')
+        return results
 
 def get_disease_by_name(disease_name):
     """Get disease details by name"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM diseases WHERE disease_name = ?", (disease_name,))
-    row = cursor.fetchone()
-    result = dict(row) if row else None
-    conn.close()
-    return result
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("SELECT * FROM diseases WHERE disease_name = ?", (disease_name,))
+        result = _row(cursor, 'diseases')
+        return result
 
 def get_diseases_by_type(disease_type):
     """Get diseases by type (Fungal, Bacterial, Viral, Insect)"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT * FROM diseases 
-        WHERE disease_type = ? 
-        ORDER BY severity DESC, disease_name
-    """, (disease_type,))
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("""
+            SELECT * FROM diseases 
+            WHERE disease_type = ? 
+            ORDER BY severity DESC, disease_name
+        """, (disease_type,))
+        results = _rows(cursor, 'diseases')
+        return results
 
+@reference_cache.cached('regions')
 def get_all_regions():
     """Get all regions"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM regions ORDER BY region_name")
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("SELECT * FROM regions ORDER BY region_name")
+        results = _rows(cursor, 'regions')
+        return results
 
+@reference_cache.cached('seasons')
 def get_all_seasons():
     """Get all seasons"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM seasons ORDER BY season_id")
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("SELECT * FROM seasons ORDER BY season_id")
+        results = _rows(cursor, 'seasons')
+        return results
+
+def get_crop_names(season_name=None, region_name=None):
+    """Get names of crops grown in a season and/or suited to a region"""
+    with connection() as conn:
+        cursor = conn.cursor()
+        
+        query = "SELECT DISTINCT c.crop_name FROM crops c"
+        conditions = []
+        params = []
+        if season_name:
+            query += " INNER JOIN seasons s ON c.season_id = s.season_id"
+            conditions.append("s.season_name = ?")
+            params.append(season_name)
+        if region_name:
+            query += """
+                INNER JOIN crop_regions cr ON c.crop_id = cr.crop_id
+                INNER JOIN regions r ON cr.region_id = r.region_id"""
+            conditions.append("r.region_name = ?")
+            params.append(region_name)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        
+        cursor.execute(query + " ORDER BY c.crop_name", params)
+        results = [row['crop_name'] for row in cursor.fetchall()]
+        return results
+
+class CropRuleTable:
+    """All crop_parameters rows held in memory for risk evaluation
+    
+    Keeps one connection open and checks PRAGMA data_version before each
+    lookup; the table is only re-read after another connection has
+    committed a change to the database.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._watcher = DataVersionWatcher()
+        self._rules = {}
+        self.loads = 0
+    
+    def get(self, crop_name):
+        """{"optimal": row, "tolerance": row} for a crop, or None"""
+        with self._lock:
+            if self._watcher.changed():
+                self._load()
+            return self._rules.get(crop_name)
+    
+    def _load(self):
+        cursor = self._watcher.conn.execute("""
+            SELECT c.crop_name, p.* FROM crop_parameters p
+            INNER JOIN crops c ON p.crop_id = c.crop_id
+            ORDER BY p.param_id
+        """)
+        rules = {}
+        for row in cursor.fetchall():
+            params = dict(row)
+            crop = rules.setdefault(params.pop('crop_name'), {"optimal": None, "tolerance": None})
+            if crop.get(params['param_type']) is None:
+                crop[params['param_type']] = params
+        self._rules = rules
+        self.loads += 1
+
+# Shared rule table used by calculate_risk
+crop_rules = CropRuleTable()
 
 def calculate_risk(rainfall, temperature, humidity, soil_ph, crop_name):
     """Calculate risk level based on crop parameters"""
-    params = get_crop_parameters(crop_name)
+    params = crop_rules.get(crop_name)
     
     if not params or not params.get('optimal'):
         return {"error": "Crop not found"}
@@ -340,126 +835,335 @@ def calculate_risk(rainfall, temperature, humidity, soil_ph, crop_name):
     }
 
 def search_crops(query):
-    """Search crops by name"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT c.*, s.season_name 
-        FROM crops c 
-        LEFT JOIN seasons s ON c.season_id = s.season_id
-        WHERE c.crop_name LIKE ?
-        ORDER BY c.crop_name
-    """, (f"%{query}%",))
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    """Crops whose name contains query, by name; see search() for ranked
+    word search over names, categories and descriptions"""
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("""
+            SELECT c.*, s.season_name 
+            FROM crops c 
+            LEFT JOIN seasons s ON c.season_id = s.season_id
+            WHERE c.crop_name LIKE ?
+            ORDER BY c.crop_name
+        """, (f"%{query}%",))
+        results = _rows(cursor, 'crops')
+        return results
+
+# Migration 0005_stats_table keeps these counts current with triggers
+STAT_TOTALS = {
+    "crops": "total_crops",
+    "diseases": "total_diseases",
+    "regions": "total_regions",
+    "government_schemes": "total_schemes",
+    "ngos": "total_ngos",
+    "suppliers": "total_suppliers",
+}
+STAT_GROUPS = {
+    "crop_category": "crops_by_category",
+    "disease_type": "diseases_by_type",
+}
 
 def get_dashboard_stats():
-    """Get statistics for dashboard"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    stats = {}
-    
-    cursor.execute("SELECT COUNT(*) FROM crops")
-    stats['total_crops'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM diseases")
-    stats['total_diseases'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM regions")
-    stats['total_regions'] = cursor.fetchone()[0]
+    """Get statistics for dashboard (from the stats table of migration 0005)"""
+    with connection() as conn:
+        rows = conn.execute("SELECT scope, name, count FROM stats").fetchall()
     
-    cursor.execute("SELECT COUNT(*) FROM government_schemes")
-    stats['total_schemes'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM ngos")
-    stats['total_ngos'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM suppliers")
-    stats['total_suppliers'] = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT category, COUNT(*) as count FROM crops GROUP BY category")
-    stats['crops_by_category'] = {row['category']: row['count'] for row in cursor.fetchall()}
-    
-    cursor.execute("SELECT disease_type, COUNT(*) as count FROM diseases GROUP BY disease_type")
-    stats['diseases_by_type'] = {row['disease_type']: row['count'] for row in cursor.fetchall()}
-    
-    conn.close()
+    stats = {key: 0 for key in STAT_TOTALS.values()}
+    stats.update({key: {} for key in STAT_GROUPS.values()})
+    for scope, name, count in rows:
+        if scope == 'total':
+            if name in STAT_TOTALS:
+                stats[STAT_TOTALS[name]] = count
+        elif scope in STAT_GROUPS and count > 0:
+            stats[STAT_GROUPS[scope]][name] = count
     return stats
 
 # ===== NEW FUNCTIONS FOR GOVERNMENT SCHEMES, NGOS, AND SUPPLIERS =====
 
+@reference_cache.cached('government_schemes')
 def get_all_government_schemes():
     """Get all government schemes"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM government_schemes ORDER BY scheme_name")
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("SELECT * FROM government_schemes ORDER BY scheme_name")
+        results = _rows(cursor, 'government_schemes')
+        return results
 
 def get_government_scheme_by_id(scheme_id):
     """Get government scheme by ID"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM government_schemes WHERE scheme_id = ?", (scheme_id,))
-    row = cursor.fetchone()
-    result = dict(row) if row else None
-    conn.close()
-    return result
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("SELECT * FROM government_schemes WHERE scheme_id = ?", (scheme_id,))
+        result = _row(cursor, 'government_schemes')
+        return result
 
+@reference_cache.cached('ngos')
 def get_all_ngos():
     """Get all NGOs"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM ngos ORDER BY ngo_name")
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("SELECT * FROM ngos ORDER BY ngo_name")
+        results = _rows(cursor, 'ngos')
+        return results
 
 def get_ngo_by_id(ngo_id):
     """Get NGO by ID"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM ngos WHERE ngo_id = ?", (ngo_id,))
-    row = cursor.fetchone()
-    result = dict(row) if row else None
-    conn.close()
-    return result
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("SELECT * FROM ngos WHERE ngo_id = ?", (ngo_id,))
+        result = _row(cursor, 'ngos')
+        return result
 
+@reference_cache.cached('suppliers')
 def get_all_suppliers():
     """Get all suppliers"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM suppliers ORDER BY rating DESC")
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
-    return results
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("SELECT * FROM suppliers ORDER BY rating DESC")
+        results = _rows(cursor, 'suppliers')
+        return results
 
 def get_supplier_by_id(supplier_id):
     """Get supplier by ID"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM suppliers WHERE supplier_id = ?", (supplier_id,))
-    row = cursor.fetchone()
-    result = dict(row) if row else None
-    conn.close()
-    return result
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("SELECT * FROM suppliers WHERE supplier_id = ?", (supplier_id,))
+        result = _row(cursor, 'suppliers')
+        return result
 
 def search_suppliers(product_query):
-    """Search suppliers by products"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    cursor.execute("""
-        SELECT * FROM suppliers 
-        WHERE products LIKE ?
-        ORDER BY rating DESC
-    """, (f"%{product_query}%",))
-    results = [dict(row) for row in cursor.fetchall()]
-    conn.close()
+    """Suppliers whose products contain product_query, highest rated first;
+    see search() for ranked word search over names, products and locations"""
+    with connection() as conn:
+        cursor = _cursor(conn)
+        cursor.execute("""
+            SELECT * FROM suppliers 
+            WHERE products LIKE ?
+            ORDER BY rating DESC
+        """, (f"%{product_query}%",))
+        results = _rows(cursor, 'suppliers')
+        return results
+
+# ===== FULL-TEXT SEARCH =====
+
+# Migration 0006_full_text_search builds the FTS5 indexes and the triggers
+# keeping them in sync
+
+# kind -> query over its FTS5 index; bm25 weights favour the name column
+SEARCH_QUERIES = {
+    "crops": """
+        SELECT c.*, s.season_name, bm25(crops_fts, 10.0, 2.0, 1.0) AS score
+        FROM crops_fts
+        INNER JOIN crops c ON c.crop_id = crops_fts.rowid
+        LEFT JOIN seasons s ON c.season_id = s.season_id
+        WHERE crops_fts MATCH ?
+    """,
+    "diseases": """
+        SELECT d.*, bm25(diseases_fts, 10.0, 2.0, 3.0, 1.0) AS score
+        FROM diseases_fts
+        INNER JOIN diseases d ON d.disease_id = diseases_fts.rowid
+        WHERE diseases_fts MATCH ?
+    """,
+    "schemes": """
+        SELECT g.*, bm25(schemes_fts, 10.0, 2.0, 1.0, 1.0) AS score
+        FROM schemes_fts
+        INNER JOIN government_schemes g ON g.scheme_id = schemes_fts.rowid
+        WHERE schemes_fts MATCH ?
+    """,
+    "ngos": """
+        SELECT n.*, bm25(ngos_fts, 10.0, 1.0, 2.0, 1.0) AS score
+        FROM ngos_fts
+        INNER JOIN ngos n ON n.ngo_id = ngos_fts.rowid
+        WHERE ngos_fts MATCH ?
+    """,
+    "suppliers": """
+        SELECT p.*, bm25(suppliers_fts, 10.0, 5.0, 2.0) AS score
+        FROM suppliers_fts
+        INNER JOIN suppliers p ON p.supplier_id = suppliers_fts.rowid
+        WHERE suppliers_fts MATCH ?
+    """,
+}
+
+def build_match_query(text, prefix=False):
+    """FTS5 MATCH expression for free text, or None if it has no terms
+    
+    Every whitespace-separated term is quoted, so user input can never be
+    parsed as FTS5 syntax; terms are ANDed. With prefix=True the last term
+    also matches as a prefix (search-as-you-type).
+    """
+    terms = ['"' + term.replace('"', '""') + '"' for term in text.split()]
+    if not terms:
+        return None
+    if prefix:
+        terms[-1] += '*'
+    return " ".join(terms)
+
+def search(query, kinds=None, limit=10, prefix=False):
+    """BM25-ranked full-text search
+    
+    Returns {kind: [rows]} for each requested kind (crops, diseases,
+    schemes, ngos, suppliers; default all), best match first, with the row's
+    bm25 `score` (lower is better). limit=None returns every match.
+    """
+    kinds = list(kinds or SEARCH_QUERIES)
+    unknown = [kind for kind in kinds if kind not in SEARCH_QUERIES]
+    if unknown:
+        raise ValueError(f"Unknown search type(s): {', '.join(unknown)}")
+    
+    match = build_match_query(query, prefix)
+    if match is None:
+        return {kind: [] for kind in kinds}
+    
+    results = {}
+    with connection() as conn:
+        for kind in kinds:
+            sql = SEARCH_QUERIES[kind] + " ORDER BY score"
+            params = (match,)
+            if limit is not None:
+                sql += " LIMIT ?"
+                params += (int(limit),)
+            cursor = _cursor(conn)
+            cursor.execute(sql, params)
+            results[kind] = _rows(cursor, kind)
     return results
 
+# ===== KEYSET PAGINATION =====
+
+# Rows per page for the list views and APIs
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# kind -> (table, sort column, direction, unique tiebreak column); the page
+# order is the sort column, then the tiebreak ascending
+KEYSET_LISTS = {
+    "suppliers": ("suppliers", "rating", "DESC", "supplier_id"),
+    "ngos": ("ngos", "ngo_name", "ASC", "ngo_id"),
+    "schemes": ("government_schemes", "scheme_name", "ASC", "scheme_id"),
+}
+
+def encode_cursor(key):
+    """Opaque cursor for a (sort value, tiebreak) key"""
+    raw = json.dumps(list(key), separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """(sort value, tiebreak) from encode_cursor; ValueError if malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        sort_value, tiebreak = json.loads(raw)
+    except (TypeError, ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid page cursor") from None
+    return sort_value, tiebreak
+
+def _keyset_sections(sort_key, direction, tiebreak, after):
+    """(WHERE clause, params) of each part of the list still to read, in order
+
+    SQLite sorts NULL lowest, so NULL sort values form their own section -
+    last for DESC lists, first for ASC ones. Every clause is a range on the
+    (sort column, rowid) index rather than an OR the planner cannot seek.
+    """
+    nulls_first = direction == 'ASC'
+    if after is None:
+        return [("", [])]
+    sort_value, last_id = after
+    if sort_value is None:
+        rest = [(f"WHERE {sort_key} IS NOT NULL", [])] if nulls_first else []
+        return [(f"WHERE {sort_key} IS NULL AND {tiebreak} > ?", [last_id])] + rest
+    # rating <= ? AND (rating < ? OR id > ?) for DESC, the mirror for ASC
+    bound, op = ('<=', '<') if direction == 'DESC' else ('>=', '>')
+    rest = [] if nulls_first else [(f"WHERE {sort_key} IS NULL", [])]
+    return [(f"WHERE {sort_key} {bound} ? AND ({sort_key} {op} ? OR {tiebreak} > ?)",
+             [sort_value, sort_value, last_id])] + rest
+
+def _keyset_rows(kind, after, limit):
+    """Up to limit raw rows of kind following the (sort value, tiebreak)
+    key, their cursor description and a function giving a row's key"""
+    table, sort_key, direction, tiebreak = KEYSET_LISTS[kind]
+    order = f" ORDER BY {sort_key} {direction}, {tiebreak} LIMIT ?"
+    rows = []
+    with connection() as conn:
+        cursor = _cursor(conn)
+        for where, params in _keyset_sections(sort_key, direction, tiebreak, after):
+            rows += cursor.execute(f"SELECT * FROM {table} {where}" + order, params + [limit - len(rows)]).fetchall()
+            if len(rows) >= limit:
+                break
+    columns = [column[0] for column in cursor.description]
+    key = operator.itemgetter(columns.index(sort_key), columns.index(tiebreak))
+    return rows, cursor.description, key
+
+def get_page(kind, cursor=None, limit=PAGE_SIZE):
+    """One page of a list: {"items": [...], "next_cursor": str or None}
+    
+    Pass the previous page's next_cursor to continue; each page is an
+    indexed range read (two where it crosses into the NULL sort values)
+    however deep into the list it is.
+    """
+    limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+    after = decode_cursor(cursor) if cursor else None
+    rows, description, key = _keyset_rows(kind, after, limit + 1)
+    next_cursor = encode_cursor(key(rows[limit - 1])) if len(rows) > limit else None
+    return {"items": _shape(rows[:limit], description, KEYSET_LISTS[kind][0]), "next_cursor": next_cursor}
+
+def iter_rows(kind, batch_size=1000):
+    """Stream every row of a list in page order, batch_size rows per query
+    
+    No read transaction is held between batches, so a slow consumer never
+    blocks writers or pins the WAL.
+    """
+    after = None
+    while True:
+        rows, description, key = _keyset_rows(kind, after, batch_size)
+        yield from _shape(rows, description, KEYSET_LISTS[kind][0])
+        if len(rows) < batch_size:
+            return
+        after = key(rows[-1])
+
+def get_suppliers_page(cursor=None, limit=PAGE_SIZE):
+    """Suppliers by rating (highest first), one page at a time"""
+    return get_page("suppliers", cursor, limit)
+
+def get_ngos_page(cursor=None, limit=PAGE_SIZE):
+    """NGOs by name, one page at a time"""
+    return get_page("ngos", cursor, limit)
+
+def get_government_schemes_page(cursor=None, limit=PAGE_SIZE):
+    """Government schemes by name, one page at a time"""
+    return get_page("schemes", cursor, limit)
+
+def iter_suppliers(batch_size=1000):
+    """Stream all suppliers by rating (highest first)"""
+    return iter_rows("suppliers", batch_size)
+
+def iter_ngos(batch_size=1000):
+    """Stream all NGOs by name"""
+    return iter_rows("ngos", batch_size)
+
+def iter_government_schemes(batch_size=1000):
+    """Stream all government schemes by name"""
+    return iter_rows("schemes", batch_size)
+
+def add_ngo(ngo_name, description, program_type, coverage, contact_email='', phone='', website=''):
+    """Insert an NGO; returns its ngo_id"""
+    with reference_cache.write('ngos') as conn:
+        cursor = conn.execute("""
+            INSERT INTO ngos (ngo_name, description, program_type, coverage, contact_email, phone, website)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (ngo_name, description, program_type, coverage, contact_email, phone, website))
+        return cursor.lastrowid
+
+def add_supplier(supplier_name, products, location, delivery_available, delivery_charge, phone, email='', rating=4.0):
+    """Insert a supplier; returns its supplier_id"""
+    with reference_cache.write('suppliers') as conn:
+        cursor = conn.execute("""
+            INSERT INTO suppliers (supplier_name, products, location, delivery_available, delivery_charge, phone, email, rating)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (supplier_name, products, location, delivery_available, delivery_charge, phone, email, rating))
+        return cursor.lastrowid
+
+def get_cache_stats():
+    """Hit-rate statistics of the reference table cache"""
+    return reference_cache.stats()
+
 
 # Test the database functions
 if __name__ == "__main__":
@@ -0,0 +1,228 @@
+"""
+AgriGuard AI Schema Migrations
+Applies the numbered SQL files in database/migrations/ that a database has
+not seen yet, each inside its own transaction, and records them in the
+schema_version table - no table is dropped, so admin-entered rows survive
+
+Usage: python database/migrate.py [--db path] [--target N] [--status]
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.path.join(BASE_DIR, 'agriguard.db')
+MIGRATIONS_DIR = os.path.join(BASE_DIR, 'migrations')
+
+# 0001_crop_regions_indexes.sql -> version 1, name "crop_regions_indexes"
+MIGRATION_FILE = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+# Statements a migration may not issue - the runner owns the transaction
+TRANSACTION_CONTROL = re.compile(r"^\s*(BEGIN|COMMIT|END|ROLLBACK|SAVEPOINT|RELEASE|VACUUM)\b", re.IGNORECASE)
+
+SCHEMA_VERSION_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_version (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        checksum TEXT NOT NULL,
+        applied_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    )
+"""
+
+
+class MigrationError(Exception):
+    """A migration file is malformed or failed to apply (and was rolled back)"""
+
+
+class Migration:
+    """One numbered SQL file"""
+
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    def read(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    @property
+    def checksum(self):
+        return hashlib.sha256(self.read().encode('utf-8')).hexdigest()
+
+    def statements(self):
+        """The file split into complete SQL statements (triggers stay whole)"""
+        try:
+            return split_statements(self.read())
+        except ValueError as e:
+            raise MigrationError(f"{os.path.basename(self.path)}: {e}") from e
+
+    def __repr__(self):
+        return f"Migration({self.version:04d}_{self.name})"
+
+
+def _strip_comments(sql):
+    lines = [line for line in sql.splitlines() if not line.strip().startswith("--")]
+    return "\n".join(lines).strip()
+
+
+def split_statements(sql):
+    """SQL script text as a list of complete statements, comment lines dropped
+
+    Unlike executescript() this lets the caller run them inside its own
+    transaction.
+    """
+    statements, pending = [], ""
+    for line in sql.splitlines(keepends=True):
+        pending += line
+        if sqlite3.complete_statement(pending):
+            statement = _strip_comments(pending)
+            if statement:
+                statements.append(statement)
+            pending = ""
+    if _strip_comments(pending):
+        raise ValueError("incomplete statement at end of file")
+    return statements
+
+
+def discover(directory=MIGRATIONS_DIR):
+    """Migration files in version order; version numbers must be unique"""
+    migrations = {}
+    for filename in sorted(os.listdir(directory)):
+        match = MIGRATION_FILE.match(filename)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise MigrationError(f"two migrations share version {version}: "
+                                 f"{os.path.basename(migrations[version].path)} and {filename}")
+        migrations[version] = Migration(version, match.group(2), os.path.join(directory, filename))
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def connect(db_path=None):
+    """Autocommit connection, so every migration controls its own transaction"""
+    conn = sqlite3.connect(db_path or DB_PATH, isolation_level=None, timeout=30)
+    conn.execute(SCHEMA_VERSION_SQL)
+    return conn
+
+
+def applied_versions(conn):
+    """{version: checksum} of the migrations already applied"""
+    return dict(conn.execute("SELECT version, checksum FROM schema_version"))
+
+
+def current_version(conn):
+    """Highest applied migration version, 0 for an unmigrated database"""
+    return conn.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+
+
+def pending(conn, migrations=None, target=None):
+    """Migrations not applied yet, up to and including target"""
+    applied = applied_versions(conn)
+    return [
+        migration for migration in (discover() if migrations is None else migrations)
+        if migration.version not in applied and (target is None or migration.version <= target)
+    ]
+
+
+def apply(conn, migration):
+    """Run one migration and record it, all in one write transaction"""
+    statements = migration.statements()
+    for statement in statements:
+        if TRANSACTION_CONTROL.match(statement):
+            raise MigrationError(f"{migration!r}: migrations may not control transactions ({statement.split()[0].rstrip(';')})")
+
+    # IMMEDIATE takes the write lock up front; readers carry on under WAL
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        for statement in statements:
+            conn.execute(statement)
+        conn.execute(
+            "INSERT INTO schema_version (version, name, checksum) VALUES (?, ?, ?)",
+            (migration.version, migration.name, migration.checksum),
+        )
+        conn.execute("COMMIT")
+    except sqlite3.Error as e:
+        conn.execute("ROLLBACK")
+        raise MigrationError(f"{migration!r} failed and was rolled back: {e}") from e
+
+
+def migrate(db_path=None, target=None, verbose=True):
+    """Apply every pending migration in order; returns the ones applied
+
+    Stops at the first failure - earlier migrations stay committed, the
+    failing one leaves no trace.
+    """
+    conn = connect(db_path)
+    try:
+        done = []
+        for migration in pending(conn, target=target):
+            apply(conn, migration)
+            done.append(migration)
+            if verbose:
+                print(f"✓ Applied {migration.version:04d}_{migration.name}")
+        if done:
+            # Let the planner pick up statistics for the new indexes
+            conn.execute("PRAGMA optimize")
+        return done
+    finally:
+        conn.close()
+
+
+def status(db_path=None):
+    """(migration, state) for every migration file: applied, pending or changed"""
+    conn = connect(db_path)
+    try:
+        applied = applied_versions(conn)
+    finally:
+        conn.close()
+    report = []
+    for migration in discover():
+        if migration.version not in applied:
+            state = "pending"
+        elif applied[migration.version] != migration.checksum:
+            state = "changed"  # edited after it was applied
+        else:
+            state = "applied"
+        report.append((migration, state))
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python database/migrate.py", description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default=DB_PATH, help="database file (default: database/agriguard.db)")
+    parser.add_argument("--target", type=int, help="stop after this migration version")
+    parser.add_argument("--status", action="store_true", help="list migrations and whether they are applied")
+    args = parser.parse_args(argv)
+
+    if args.status:
+        for migration, state in status(args.db):
+            marker = "✓" if state == "applied" else "✗" if state == "changed" else " "
+            print(f"{marker} {migration.version:04d}_{migration.name:40s} {state}")
+        return 0
+
+    try:
+        done = migrate(args.db, target=args.target)
+    except MigrationError as e:
+        print(f"✗ {e}")
+        return 1
+
+    conn = connect(args.db)
+    try:
+        version = current_version(conn)
+    finally:
+        conn.close()
+    if not done:
+        print(f"✓ Database already at version {version}")
+    else:
+        print(f"✓ Database migrated to version {version}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+-- Crop regions: per-crop lookups come back ordered by suitability without a
+-- sort, and region deletes (ON DELETE CASCADE) find their links by index
+CREATE INDEX IF NOT EXISTS idx_crop_regions_crop_score ON crop_regions(crop_id, suitability_score DESC);
+CREATE INDEX IF NOT EXISTS idx_crop_regions_region ON crop_regions(region_id);
@@ -0,0 +1,3 @@
+-- Suppliers: the list and its keyset pages (rating DESC, supplier_id) read
+-- straight from the index; supplier_id is the rowid, so ties stay in order
+CREATE INDEX IF NOT EXISTS idx_suppliers_rating ON suppliers(rating DESC);
@@ -0,0 +1,4 @@
+-- Crop parameters: seek (crop_id, param_type) directly; the composite index
+-- also serves crop_id-only lookups, so the old single-column one goes
+CREATE INDEX IF NOT EXISTS idx_crop_parameters_crop_type ON crop_parameters(crop_id, param_type);
+DROP INDEX IF EXISTS idx_crop_parameters_crop;
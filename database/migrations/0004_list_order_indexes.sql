@@ -0,0 +1,6 @@
+-- Name-ordered lists: NGO and scheme pages (name, id) and the crop list
+-- (category, crop_name) no longer need a temp B-tree for ORDER BY
+CREATE INDEX IF NOT EXISTS idx_ngos_name ON ngos(ngo_name);
+CREATE INDEX IF NOT EXISTS idx_government_schemes_name ON government_schemes(scheme_name);
+CREATE INDEX IF NOT EXISTS idx_crops_category_name ON crops(category, crop_name);
+DROP INDEX IF EXISTS idx_crops_category;
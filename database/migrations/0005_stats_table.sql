@@ -0,0 +1,142 @@
+-- AgriGuard AI Dashboard Statistics
+-- Row counts kept current by triggers so the dashboard reads one small table.
+-- Creates only what is missing (databases that installed the old
+-- stats.sql already have it) and recounts from the live tables.
+
+-- ============================================
+-- STATS TABLE
+-- ============================================
+-- scope 'total' holds one row per counted table; 'crop_category' and
+-- 'disease_type' hold one row per category value
+CREATE TABLE IF NOT EXISTS stats (
+    scope TEXT NOT NULL,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, name)
+) WITHOUT ROWID;
+
+-- ============================================
+-- TABLE TOTALS
+-- ============================================
+CREATE TRIGGER IF NOT EXISTS stats_crops_insert AFTER INSERT ON crops
+BEGIN
+    INSERT INTO stats (scope, name, count) VALUES ('total', 'crops', 1)
+        ON CONFLICT (scope, name) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_crops_delete AFTER DELETE ON crops
+BEGIN
+    UPDATE stats SET count = count - 1 WHERE scope = 'total' AND name = 'crops';
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_diseases_insert AFTER INSERT ON diseases
+BEGIN
+    INSERT INTO stats (scope, name, count) VALUES ('total', 'diseases', 1)
+        ON CONFLICT (scope, name) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_diseases_delete AFTER DELETE ON diseases
+BEGIN
+    UPDATE stats SET count = count - 1 WHERE scope = 'total' AND name = 'diseases';
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_regions_insert AFTER INSERT ON regions
+BEGIN
+    INSERT INTO stats (scope, name, count) VALUES ('total', 'regions', 1)
+        ON CONFLICT (scope, name) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_regions_delete AFTER DELETE ON regions
+BEGIN
+    UPDATE stats SET count = count - 1 WHERE scope = 'total' AND name = 'regions';
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_government_schemes_insert AFTER INSERT ON government_schemes
+BEGIN
+    INSERT INTO stats (scope, name, count) VALUES ('total', 'government_schemes', 1)
+        ON CONFLICT (scope, name) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_government_schemes_delete AFTER DELETE ON government_schemes
+BEGIN
+    UPDATE stats SET count = count - 1 WHERE scope = 'total' AND name = 'government_schemes';
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_ngos_insert AFTER INSERT ON ngos
+BEGIN
+    INSERT INTO stats (scope, name, count) VALUES ('total', 'ngos', 1)
+        ON CONFLICT (scope, name) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_ngos_delete AFTER DELETE ON ngos
+BEGIN
+    UPDATE stats SET count = count - 1 WHERE scope = 'total' AND name = 'ngos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_suppliers_insert AFTER INSERT ON suppliers
+BEGIN
+    INSERT INTO stats (scope, name, count) VALUES ('total', 'suppliers', 1)
+        ON CONFLICT (scope, name) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_suppliers_delete AFTER DELETE ON suppliers
+BEGIN
+    UPDATE stats SET count = count - 1 WHERE scope = 'total' AND name = 'suppliers';
+END;
+
+-- ============================================
+-- CATEGORY BREAKDOWNS
+-- ============================================
+CREATE TRIGGER IF NOT EXISTS stats_crops_category_insert AFTER INSERT ON crops
+BEGIN
+    INSERT INTO stats (scope, name, count) VALUES ('crop_category', NEW.category, 1)
+        ON CONFLICT (scope, name) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_crops_category_delete AFTER DELETE ON crops
+BEGIN
+    UPDATE stats SET count = count - 1 WHERE scope = 'crop_category' AND name = OLD.category;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_crops_category_update AFTER UPDATE OF category ON crops
+WHEN OLD.category IS NOT NEW.category
+BEGIN
+    UPDATE stats SET count = count - 1 WHERE scope = 'crop_category' AND name = OLD.category;
+    INSERT INTO stats (scope, name, count) VALUES ('crop_category', NEW.category, 1)
+        ON CONFLICT (scope, name) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_diseases_disease_type_insert AFTER INSERT ON diseases
+BEGIN
+    INSERT INTO stats (scope, name, count) VALUES ('disease_type', NEW.disease_type, 1)
+        ON CONFLICT (scope, name) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_diseases_disease_type_delete AFTER DELETE ON diseases
+BEGIN
+    UPDATE stats SET count = count - 1 WHERE scope = 'disease_type' AND name = OLD.disease_type;
+END;
+
+CREATE TRIGGER IF NOT EXISTS stats_diseases_disease_type_update AFTER UPDATE OF disease_type ON diseases
+WHEN OLD.disease_type IS NOT NEW.disease_type
+BEGIN
+    UPDATE stats SET count = count - 1 WHERE scope = 'disease_type' AND name = OLD.disease_type;
+    INSERT INTO stats (scope, name, count) VALUES ('disease_type', NEW.disease_type, 1)
+        ON CONFLICT (scope, name) DO UPDATE SET count = count + 1;
+END;
+
+-- ============================================
+-- RECOUNT FROM THE LIVE TABLES
+-- ============================================
+DELETE FROM stats;
+INSERT INTO stats (scope, name, count)
+SELECT 'total', 'crops', COUNT(*) FROM crops
+UNION ALL SELECT 'total', 'diseases', COUNT(*) FROM diseases
+UNION ALL SELECT 'total', 'regions', COUNT(*) FROM regions
+UNION ALL SELECT 'total', 'government_schemes', COUNT(*) FROM government_schemes
+UNION ALL SELECT 'total', 'ngos', COUNT(*) FROM ngos
+UNION ALL SELECT 'total', 'suppliers', COUNT(*) FROM suppliers;
+INSERT INTO stats (scope, name, count)
+SELECT 'crop_category', category, COUNT(*) FROM crops GROUP BY category;
+INSERT INTO stats (scope, name, count)
+SELECT 'disease_type', disease_type, COUNT(*) FROM diseases GROUP BY disease_type;
@@ -0,0 +1,173 @@
+-- AgriGuard AI Full-Text Search
+-- FTS5 indexes over the searchable text columns, kept in sync by triggers.
+-- Creates only what is missing (databases that installed the old
+-- search.sql already have it) and rebuilds every index from its table.
+--
+-- Tokenizer: unicode61 splits on anything outside its token categories,
+-- and by default that excludes combining marks - the vowel signs, virama
+-- and anusvara of Devanagari, Tamil, Telugu, Kannada and Malayalam - which
+-- would shred every Indic word. Adding M* keeps those words whole;
+-- remove_diacritics still folds accented Latin (café = cafe), and the
+-- porter wrapper stems English words (spots = spot) while leaving tokens
+-- in other scripts untouched.
+-- prefix='2 3' adds prefix indexes for search-as-you-type queries.
+
+-- ============================================
+-- CROPS
+-- ============================================
+CREATE VIRTUAL TABLE IF NOT EXISTS crops_fts USING fts5(
+    crop_name, category, description,
+    content='crops', content_rowid='crop_id',
+    tokenize="porter unicode61 remove_diacritics 2 categories 'L* N* Co M*'",
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS crops_fts_insert AFTER INSERT ON crops
+BEGIN
+    INSERT INTO crops_fts (rowid, crop_name, category, description)
+    VALUES (new.crop_id, new.crop_name, new.category, new.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS crops_fts_delete AFTER DELETE ON crops
+BEGIN
+    INSERT INTO crops_fts (crops_fts, rowid, crop_name, category, description)
+    VALUES ('delete', old.crop_id, old.crop_name, old.category, old.description);
+END;
+
+CREATE TRIGGER IF NOT EXISTS crops_fts_update AFTER UPDATE OF crop_name, category, description ON crops
+BEGIN
+    INSERT INTO crops_fts (crops_fts, rowid, crop_name, category, description)
+    VALUES ('delete', old.crop_id, old.crop_name, old.category, old.description);
+    INSERT INTO crops_fts (rowid, crop_name, category, description)
+    VALUES (new.crop_id, new.crop_name, new.category, new.description);
+END;
+
+INSERT INTO crops_fts (crops_fts) VALUES ('rebuild');
+
+-- ============================================
+-- DISEASES
+-- ============================================
+CREATE VIRTUAL TABLE IF NOT EXISTS diseases_fts USING fts5(
+    disease_name, disease_type, symptoms, conditions_favoured,
+    content='diseases', content_rowid='disease_id',
+    tokenize="porter unicode61 remove_diacritics 2 categories 'L* N* Co M*'",
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS diseases_fts_insert AFTER INSERT ON diseases
+BEGIN
+    INSERT INTO diseases_fts (rowid, disease_name, disease_type, symptoms, conditions_favoured)
+    VALUES (new.disease_id, new.disease_name, new.disease_type, new.symptoms, new.conditions_favoured);
+END;
+
+CREATE TRIGGER IF NOT EXISTS diseases_fts_delete AFTER DELETE ON diseases
+BEGIN
+    INSERT INTO diseases_fts (diseases_fts, rowid, disease_name, disease_type, symptoms, conditions_favoured)
+    VALUES ('delete', old.disease_id, old.disease_name, old.disease_type, old.symptoms, old.conditions_favoured);
+END;
+
+CREATE TRIGGER IF NOT EXISTS diseases_fts_update AFTER UPDATE OF disease_name, disease_type, symptoms, conditions_favoured ON diseases
+BEGIN
+    INSERT INTO diseases_fts (diseases_fts, rowid, disease_name, disease_type, symptoms, conditions_favoured)
+    VALUES ('delete', old.disease_id, old.disease_name, old.disease_type, old.symptoms, old.conditions_favoured);
+    INSERT INTO diseases_fts (rowid, disease_name, disease_type, symptoms, conditions_favoured)
+    VALUES (new.disease_id, new.disease_name, new.disease_type, new.symptoms, new.conditions_favoured);
+END;
+
+INSERT INTO diseases_fts (diseases_fts) VALUES ('rebuild');
+
+-- ============================================
+-- GOVERNMENT SCHEMES
+-- ============================================
+CREATE VIRTUAL TABLE IF NOT EXISTS schemes_fts USING fts5(
+    scheme_name, department, description, eligibility,
+    content='government_schemes', content_rowid='scheme_id',
+    tokenize="porter unicode61 remove_diacritics 2 categories 'L* N* Co M*'",
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS schemes_fts_insert AFTER INSERT ON government_schemes
+BEGIN
+    INSERT INTO schemes_fts (rowid, scheme_name, department, description, eligibility)
+    VALUES (new.scheme_id, new.scheme_name, new.department, new.description, new.eligibility);
+END;
+
+CREATE TRIGGER IF NOT EXISTS schemes_fts_delete AFTER DELETE ON government_schemes
+BEGIN
+    INSERT INTO schemes_fts (schemes_fts, rowid, scheme_name, department, description, eligibility)
+    VALUES ('delete', old.scheme_id, old.scheme_name, old.department, old.description, old.eligibility);
+END;
+
+CREATE TRIGGER IF NOT EXISTS schemes_fts_update AFTER UPDATE OF scheme_name, department, description, eligibility ON government_schemes
+BEGIN
+    INSERT INTO schemes_fts (schemes_fts, rowid, scheme_name, department, description, eligibility)
+    VALUES ('delete', old.scheme_id, old.scheme_name, old.department, old.description, old.eligibility);
+    INSERT INTO schemes_fts (rowid, scheme_name, department, description, eligibility)
+    VALUES (new.scheme_id, new.scheme_name, new.department, new.description, new.eligibility);
+END;
+
+INSERT INTO schemes_fts (schemes_fts) VALUES ('rebuild');
+
+-- ============================================
+-- NGOS
+-- ============================================
+CREATE VIRTUAL TABLE IF NOT EXISTS ngos_fts USING fts5(
+    ngo_name, description, program_type, coverage,
+    content='ngos', content_rowid='ngo_id',
+    tokenize="porter unicode61 remove_diacritics 2 categories 'L* N* Co M*'",
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS ngos_fts_insert AFTER INSERT ON ngos
+BEGIN
+    INSERT INTO ngos_fts (rowid, ngo_name, description, program_type, coverage)
+    VALUES (new.ngo_id, new.ngo_name, new.description, new.program_type, new.coverage);
+END;
+
+CREATE TRIGGER IF NOT EXISTS ngos_fts_delete AFTER DELETE ON ngos
+BEGIN
+    INSERT INTO ngos_fts (ngos_fts, rowid, ngo_name, description, program_type, coverage)
+    VALUES ('delete', old.ngo_id, old.ngo_name, old.description, old.program_type, old.coverage);
+END;
+
+CREATE TRIGGER IF NOT EXISTS ngos_fts_update AFTER UPDATE OF ngo_name, description, program_type, coverage ON ngos
+BEGIN
+    INSERT INTO ngos_fts (ngos_fts, rowid, ngo_name, description, program_type, coverage)
+    VALUES ('delete', old.ngo_id, old.ngo_name, old.description, old.program_type, old.coverage);
+    INSERT INTO ngos_fts (rowid, ngo_name, description, program_type, coverage)
+    VALUES (new.ngo_id, new.ngo_name, new.description, new.program_type, new.coverage);
+END;
+
+INSERT INTO ngos_fts (ngos_fts) VALUES ('rebuild');
+
+-- ============================================
+-- SUPPLIERS
+-- ============================================
+CREATE VIRTUAL TABLE IF NOT EXISTS suppliers_fts USING fts5(
+    supplier_name, products, location,
+    content='suppliers', content_rowid='supplier_id',
+    tokenize="porter unicode61 remove_diacritics 2 categories 'L* N* Co M*'",
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS suppliers_fts_insert AFTER INSERT ON suppliers
+BEGIN
+    INSERT INTO suppliers_fts (rowid, supplier_name, products, location)
+    VALUES (new.supplier_id, new.supplier_name, new.products, new.location);
+END;
+
+CREATE TRIGGER IF NOT EXISTS suppliers_fts_delete AFTER DELETE ON suppliers
+BEGIN
+    INSERT INTO suppliers_fts (suppliers_fts, rowid, supplier_name, products, location)
+    VALUES ('delete', old.supplier_id, old.supplier_name, old.products, old.location);
+END;
+
+CREATE TRIGGER IF NOT EXISTS suppliers_fts_update AFTER UPDATE OF supplier_name, products, location ON suppliers
+BEGIN
+    INSERT INTO suppliers_fts (suppliers_fts, rowid, supplier_name, products, location)
+    VALUES ('delete', old.supplier_id, old.supplier_name, old.products, old.location);
+    INSERT INTO suppliers_fts (rowid, supplier_name, products, location)
+    VALUES (new.supplier_id, new.supplier_name, new.products, new.location);
+END;
+
+INSERT INTO suppliers_fts (suppliers_fts) VALUES ('rebuild');
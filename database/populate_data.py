@@ -6,6 +6,11 @@ Populates the SQLite database with comprehensive agricultural data
 import sqlite3
 import os
 
+try:
+    from database.migrate import migrate
+except ImportError:  # run as a script from database/
+    from migrate import migrate
+
 # Get the database path
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'agriguard.db')
@@ -60,12 +65,22 @@ def populate_regions(conn):
     conn.commit()
     print("✓ Regions populated")
 
+# Crop season labels that are not season names: summer and winter crops
+# belong to Zaid and Rabi, and a crop sown in two seasons ("Kharif/Rabi")
+# is filed under the first. Annual and year-round crops get no season.
+SEASON_ALIASES = {"Summer": "Zaid", "Winter": "Rabi"}
+
+def season_id(seasons, label):
+    """seasons id for a crop's season label, or None"""
+    main = label.split("/")[0]
+    return seasons.get(SEASON_ALIASES.get(main, main))
+
 def populate_crops(conn):
     """Populate crops table with comprehensive data"""
     
     # First get season IDs
     cursor = conn.cursor()
-    cursor.execute("SELECT season_id, season_name FROM seasons")
+    cursor.execute("SELECT season_name, season_id FROM seasons")
     seasons = dict(cursor.fetchall())
     
     crops = [
@@ -128,7 +143,7 @@ def populate_crops(conn):
         """INSERT OR IGNORE INTO crops 
            (crop_name, category, season_id, water_need, nutrient_need, sowing_period, harvest_period, yield_min, yield_max, yield_unit, description) 
            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-        [(c[0], c[1], seasons.get(c[2]), *c[3:]) for c in crops]
+        [(c[0], c[1], season_id(seasons, c[2]), *c[3:]) for c in crops]
     )
     conn.commit()
     print("✓ Crops populated")
@@ -138,7 +153,7 @@ def populate_crop_parameters(conn):
     cursor = conn.cursor()
     
     # Get all crops
-    cursor.execute("SELECT crop_id, crop_name FROM crops")
+    cursor.execute("SELECT crop_name, crop_id FROM crops")
     crops = dict(cursor.fetchall())
     
     parameters = []
@@ -592,10 +607,10 @@ def populate_crop_diseases(conn):
     cursor = conn.cursor()
     
     # Get crop and disease IDs
-    cursor.execute("SELECT crop_id, crop_name FROM crops")
+    cursor.execute("SELECT crop_name, crop_id FROM crops")
     crops = dict(cursor.fetchall())
     
-    cursor.execute("SELECT disease_id, disease_name FROM diseases")
+    cursor.execute("SELECT disease_name, disease_id FROM diseases")
     diseases = dict(cursor.fetchall())
     
     crop_disease_links = []
@@ -732,10 +747,10 @@ def populate_crop_regions(conn):
     cursor = conn.cursor()
     
     # Get crop and region IDs
-    cursor.execute("SELECT crop_id, crop_name FROM crops")
+    cursor.execute("SELECT crop_name, crop_id FROM crops")
     crops = dict(cursor.fetchall())
     
-    cursor.execute("SELECT region_id, region_name FROM regions")
+    cursor.execute("SELECT region_name, region_id FROM regions")
     regions = dict(cursor.fetchall())
     
     crop_region_links = []
@@ -833,6 +848,10 @@ def initialize_database():
     conn.commit()
     print("✓ Database tables created")
     
+    # Bring the fresh schema up to the latest migration: indexes, the
+    # trigger-maintained stats table and the full-text search indexes
+    migrate(DB_PATH)
+    
     # Populate data
     populate_seasons(conn)
     populate_regions(conn)
@@ -3,6 +3,7 @@
 
 -- Drop tables if they exist (for fresh setup)
 DROP TABLE IF EXISTS crop_diseases;
+DROP TABLE IF EXISTS crop_regions;
 DROP TABLE IF EXISTS diseases;
 DROP TABLE IF EXISTS crop_parameters;
 DROP TABLE IF EXISTS crops;
@@ -11,6 +12,13 @@ DROP TABLE IF EXISTS regions;
 DROP TABLE IF EXISTS government_schemes;
 DROP TABLE IF EXISTS ngos;
 DROP TABLE IF EXISTS suppliers;
+DROP TABLE IF EXISTS stats;
+DROP TABLE IF EXISTS crops_fts;
+DROP TABLE IF EXISTS diseases_fts;
+DROP TABLE IF EXISTS schemes_fts;
+DROP TABLE IF EXISTS ngos_fts;
+DROP TABLE IF EXISTS suppliers_fts;
+DROP TABLE IF EXISTS schema_version;
 
 -- ============================================
 -- REGIONS TABLE
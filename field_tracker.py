@@ -0,0 +1,174 @@
+"""
+Incremental Field Risk Tracking for AgriGuard AI
+Keeps rolling stress indicators per registered field from hourly weather
+and reports only threshold crossings, using the CropPredictor thresholds
+"""
+
+from collections import deque
+
+from model_enhanced import get_predictor
+
+
+class FieldRiskTracker:
+    """Rolling risk state of one field, updated in O(1) per hourly reading
+
+    Indicators:
+    - rainfall over the last `window_hours` (the model's rainfall input) and
+      the deficit against the crop's optimal minimum
+    - consecutive hours above the crop's optimal maximum temperature
+    - consecutive hours inside each common disease's favourable band
+
+    update() returns events only when something crosses a threshold: the
+    risk level changes, heat stress sets in, or a disease alert is raised
+    or cleared.
+    """
+
+    __slots__ = (
+        "field_id", "crop_type", "window_hours", "heat_alert_hours", "disease_alert_hours",
+        "_predictor", "_crop_id", "_temp_max", "_rain_min", "_diseases",
+        "_rain_window", "rainfall_total", "hot_hours", "disease_hours",
+        "soil_ph", "risk_level", "weighted_risk", "alerts", "hours_seen",
+    )
+
+    def __init__(self, field_id, crop_type, soil_ph=6.5, window_hours=720,
+                 heat_alert_hours=6, disease_alert_hours=6, model=None):
+        self.field_id = field_id
+        self.crop_type = crop_type
+        self.window_hours = window_hours
+        self.heat_alert_hours = heat_alert_hours
+        self.disease_alert_hours = disease_alert_hours
+
+        model = model or get_predictor()
+        self._predictor = model
+        self._crop_id = model.crop_table.crop_id(crop_type)
+        self._rain_min = model.crop_table.optimal_min[self._crop_id, 0].item()
+        self._temp_max = model.crop_table.optimal_max[self._crop_id, 1].item()
+
+        # (name, temp range, humidity range) with the same defaults as
+        # CropPredictor._calculate_disease_risk
+        crop_data = model.crop_database[model.crop_table.names[self._crop_id]]
+        self._diseases = []
+        for name in crop_data.get("common_diseases", []):
+            disease = model.disease_database.get(name)
+            if disease:
+                cond = disease["conditions"]
+                self._diseases.append((name, cond.get("temp", (15, 30)), cond.get("humidity", (60, 80))))
+
+        self._rain_window = deque()
+        self.rainfall_total = 0.0
+        self.hot_hours = 0
+        self.disease_hours = {name: 0 for name, _, _ in self._diseases}
+        self.soil_ph = soil_ph
+        self.risk_level = None
+        self.weighted_risk = None
+        self.alerts = set()
+        self.hours_seen = 0
+
+    @property
+    def rainfall_deficit(self):
+        return max(0.0, self._rain_min - self.rainfall_total)
+
+    def indicators(self):
+        """Current rolling indicators"""
+        return {
+            "field_id": self.field_id,
+            "crop_type": self.crop_type,
+            "hours_seen": self.hours_seen,
+            "rainfall_window_mm": self.rainfall_total,
+            "rainfall_deficit_mm": self.rainfall_deficit,
+            "consecutive_hot_hours": self.hot_hours,
+            "disease_hours": dict(self.disease_hours),
+            "risk_level": self.risk_level,
+            "weighted_risk": self.weighted_risk,
+            "disease_alerts": sorted(self.alerts),
+        }
+
+    def update(self, rainfall, temperature, humidity, soil_ph=None, time=None):
+        """Add one hourly reading; returns the list of threshold crossings"""
+        events = []
+        self.hours_seen += 1
+        if soil_ph is not None:
+            self.soil_ph = soil_ph
+
+        # Rolling rainfall sum - add the new hour, drop the one leaving the window
+        self._rain_window.append(rainfall)
+        self.rainfall_total += rainfall
+        if len(self._rain_window) > self.window_hours:
+            self.rainfall_total -= self._rain_window.popleft()
+        if self.rainfall_total < 1e-9:
+            self.rainfall_total = 0.0
+
+        # Consecutive heat hours above the crop's optimal maximum
+        if temperature > self._temp_max:
+            self.hot_hours += 1
+            if self.hot_hours == self.heat_alert_hours:
+                events.append({"type": "heat_stress", "hours": self.hot_hours, "temperature": temperature})
+        else:
+            self.hot_hours = 0
+
+        # Hours inside each disease's favourable band
+        for name, temp_range, hum_range in self._diseases:
+            if temp_range[0] <= temperature <= temp_range[1] and hum_range[0] <= humidity <= hum_range[1]:
+                hours = self.disease_hours[name] = self.disease_hours[name] + 1
+                if hours == self.disease_alert_hours:
+                    self.alerts.add(name)
+                    events.append({"type": "disease_alert", "disease": name, "hours": hours})
+            else:
+                self.disease_hours[name] = 0
+                if name in self.alerts:
+                    self.alerts.discard(name)
+                    events.append({"type": "disease_cleared", "disease": name})
+
+        # Risk level of the current conditions, with the window's rainfall
+        model = self._predictor
+        weighted_risk = model._weighted_risk(*model._score_factors(
+            self._crop_id, self.rainfall_total, temperature, humidity, self.soil_ph
+        ))
+        risk_level = model._assessment(weighted_risk)[0]
+        if risk_level != self.risk_level:
+            events.append({"type": "risk_level", "from": self.risk_level, "to": risk_level, "weighted_risk": weighted_risk})
+        self.risk_level = risk_level
+        self.weighted_risk = weighted_risk
+
+        for event in events:
+            event["field_id"] = self.field_id
+            event["time"] = time
+        return events
+
+
+class FieldRiskMonitor:
+    """Trackers for all registered fields"""
+
+    def __init__(self, **defaults):
+        self.defaults = defaults
+        self.fields = {}
+
+    def register(self, field_id, crop_type, **options):
+        """Start tracking a field; options override the monitor defaults"""
+        self.fields[field_id] = FieldRiskTracker(field_id, crop_type, **dict(self.defaults, **options))
+        return self.fields[field_id]
+
+    def ingest(self, field_id, rainfall, temperature, humidity, soil_ph=None, time=None):
+        """Feed one hourly reading to a registered field"""
+        return self.fields[field_id].update(rainfall, temperature, humidity, soil_ph, time)
+
+    def ingest_many(self, readings):
+        """Feed (field_id, rainfall, temperature, humidity[, soil_ph[, time]]) tuples"""
+        events = []
+        for reading in readings:
+            events.extend(self.ingest(*reading))
+        return events
+
+
+if __name__ == "__main__":
+    monitor = FieldRiskMonitor(window_hours=24 * 7)
+    monitor.register("F-001", "Rice", soil_ph=6.2)
+
+    # A week of humid monsoon weather followed by a dry heat wave
+    for hour in range(24 * 7):
+        for event in monitor.ingest("F-001", 1.2, 27, 88, time=hour):
+            print(event)
+    for hour in range(24 * 7, 24 * 10):
+        for event in monitor.ingest("F-001", 0.0, 38, 45, time=hour):
+            print(event)
+    print(monitor.fields["F-001"].indicators())
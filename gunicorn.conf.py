@@ -0,0 +1,25 @@
+"""
+Gunicorn Settings for AgriGuard AI
+Loaded automatically by `gunicorn app:app` from the project directory
+"""
+
+import os
+
+import preload
+from database import db_util
+from database.migrate import migrate
+
+bind = os.environ.get("AGRIGUARD_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("AGRIGUARD_WORKERS", "4"))
+
+# Import the app once in the master and fork workers from it
+preload_app = True
+
+
+def when_ready(server):
+    # Runs in the master before the first worker is forked: bring the
+    # database schema up to date once, then build the engines and gc.freeze() them
+    applied = migrate(db_util.DB_PATH, verbose=False)
+    server.log.info("Database migrations applied: %s", ", ".join(f"{m.version:04d}_{m.name}" for m in applied) or "none pending")
+    frozen = preload.preload()
+    server.log.info("Engines preloaded; %d objects frozen for copy-on-write sharing", frozen)
@@ -3,9 +3,161 @@ Enhanced Crop Prediction Model for AgriGuard AI
 More accurate analysis using comprehensive crop parameters, disease patterns, and environmental factors
 """
 
+import argparse
+import csv
+import io
+import json
+import math
 import random
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
+import numpy as np
+
+# Risk levels in ascending order of severity, with the weighted-risk
+# thresholds used by CropPredictor._get_risk_assessment
+RISK_LEVELS = ("OPTIMAL", "MODERATE", "HIGH RISK", "CRITICAL")
+RISK_THRESHOLDS = (25, 45, 70)
+
+# Order of the factor columns in CropTable range arrays
+FACTORS = ("rainfall_mm", "temp_c", "humidity", "ph")
+
+class CropTable:
+    """Crop database compiled into dense arrays indexed by integer crop id
+    
+    optimal_min/optimal_max/tolerance_min/tolerance_max have one row per crop
+    and one column per entry of FACTORS. Category, season and water need are
+    stored as small integer codes into the matching label tuples.
+    """
+    
+    def __init__(self, crop_database, default_crop="Rice"):
+        self.names = tuple(crop_database)
+        self.index = {name: crop_id for crop_id, name in enumerate(self.names)}
+        self.default_id = self.index[default_crop]
+        
+        crops = [crop_database[name] for name in self.names]
+        self.optimal_min, self.optimal_max = self._ranges(crops, "optimal")
+        self.tolerance_min, self.tolerance_max = self._ranges(crops, "tolerance")
+        self.ph_ideal = (self.optimal_min[:, 3] + self.optimal_max[:, 3]) / 2
+        
+        # Plain-float rows for scoring a single reading without NumPy overhead:
+        # (rain_lo, rain_hi, temp_lo, temp_hi, hum_lo, hum_hi, ph_ideal)
+        self.bounds = [tuple(row) for row in np.column_stack([
+            self.optimal_min[:, 0], self.optimal_max[:, 0],
+            self.optimal_min[:, 1], self.optimal_max[:, 1],
+            self.optimal_min[:, 2], self.optimal_max[:, 2],
+            self.ph_ideal,
+        ]).tolist()]
+        
+        self.categories, self.category_code = self._encode(crop["category"] for crop in crops)
+        self.seasons, self.season_code = self._encode(crop["season"] for crop in crops)
+        self.water_needs, self.water_need_code = self._encode(crop["water_need"] for crop in crops)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    @staticmethod
+    def _ranges(crops, kind):
+        """Split the (min, max) tuples of one range kind into two arrays"""
+        ranges = np.array([[crop[kind][factor] for factor in FACTORS] for crop in crops], dtype=np.float64)
+        return np.ascontiguousarray(ranges[:, :, 0]), np.ascontiguousarray(ranges[:, :, 1])
+    
+    @staticmethod
+    def _encode(values):
+        """Map labels to codes in order of first appearance"""
+        labels = {}
+        codes = [labels.setdefault(value, len(labels)) for value in values]
+        return tuple(labels), np.array(codes, dtype=np.uint8)
+    
+    def crop_id(self, crop_type):
+        """Id of a crop name, falling back to the default crop like predict does"""
+        return self.index.get(crop_type, self.default_id)
+    
+    def ids(self, crop_types):
+        """Vectorized crop_id for a single name or an array of names (or ids)"""
+        if isinstance(crop_types, str):
+            return np.intp(self.crop_id(crop_types))
+        if isinstance(crop_types, np.ndarray) and np.issubdtype(crop_types.dtype, np.integer):
+            return crop_types
+        names, inverse = np.unique(np.asarray(crop_types, dtype=object).astype(str), return_inverse=True)
+        lookup = np.array([self.crop_id(name) for name in names], dtype=np.intp)
+        return lookup[inverse.reshape(np.shape(crop_types))]
+
+class DiseaseIndex:
+    """Interval index over the favourable temperature/humidity of each disease
+    
+    Each axis is split into elementary slots (every distinct range endpoint
+    plus the open gaps between them) and every slot keeps a packed bitset of
+    the diseases whose closed range covers it. A query is two binary searches
+    and one bitwise AND, however many diseases there are.
+    """
+    
+    def __init__(self, disease_database, crop_database):
+        self.names = tuple(disease_database)
+        index = {name: disease_id for disease_id, name in enumerate(self.names)}
+        
+        # Same defaults as _calculate_disease_risk for missing ranges
+        conditions = [disease_database[name]["conditions"] for name in self.names]
+        temp = np.array([cond.get("temp", (15, 30)) for cond in conditions], dtype=np.float64).reshape(-1, 2)
+        hum = np.array([cond.get("humidity", (60, 80)) for cond in conditions], dtype=np.float64).reshape(-1, 2)
+        self.temp_edges, self.temp_bits = self._build_axis(temp[:, 0], temp[:, 1])
+        self.hum_edges, self.hum_bits = self._build_axis(hum[:, 0], hum[:, 1])
+        
+        # (crop, disease) pairs in crop order, then common_diseases order
+        pairs = [
+            (crop_id, index[disease])
+            for crop_id, crop in enumerate(crop_database.values())
+            for disease in crop.get("common_diseases", [])
+            if disease in index
+        ]
+        self.crop_names = tuple(crop_database)
+        self.pair_crop = np.array([crop_id for crop_id, _ in pairs], dtype=np.intp)
+        self.pair_disease = np.array([disease_id for _, disease_id in pairs], dtype=np.intp)
+    
+    def __len__(self):
+        return len(self.names)
+    
+    @staticmethod
+    def _build_axis(lows, highs):
+        """Sorted endpoints and one packed disease bitset per elementary slot"""
+        edges = np.unique(np.concatenate([lows, highs]))
+        # Slot 2i+1 is the endpoint edges[i], slot 2i the open gap below it
+        gaps = np.concatenate([[edges[0] - 1], (edges[:-1] + edges[1:]) / 2, [edges[-1] + 1]]) if edges.size else np.zeros(1)
+        probes = np.empty(2 * edges.size + 1)
+        probes[0::2] = gaps
+        probes[1::2] = edges
+        covered = (lows <= probes[:, None]) & (probes[:, None] <= highs)
+        return edges, np.packbits(covered, axis=1)
+    
+    @staticmethod
+    def _slots(edges, values):
+        values = np.asarray(values, dtype=np.float64)
+        position = np.searchsorted(edges, values, side="left")
+        on_edge = edges[np.minimum(position, edges.size - 1)] == values
+        return 2 * position + on_edge
+    
+    def favoured_mask(self, temperature, humidity):
+        """Boolean mask over self.names (last axis) for each temperature/humidity"""
+        bits = self.temp_bits[self._slots(self.temp_edges, temperature)] & self.hum_bits[self._slots(self.hum_edges, humidity)]
+        return np.unpackbits(bits, axis=-1, count=len(self.names)).astype(bool)
+    
+    def favoured(self, temperature, humidity):
+        """Names of the diseases favoured by one reading"""
+        return [self.names[disease_id] for disease_id in np.flatnonzero(self.favoured_mask(temperature, humidity))]
+    
+    def by_crop(self, temperature, humidity):
+        """Favoured diseases grouped by the crops that list them"""
+        mask = self.favoured_mask(temperature, humidity)
+        hits = mask[self.pair_disease]
+        grouped = {}
+        for crop_id, disease_id in zip(self.pair_crop[hits].tolist(), self.pair_disease[hits].tolist()):
+            grouped.setdefault(self.crop_names[crop_id], []).append(self.names[disease_id])
+        return grouped
+
 class CropPredictor:
     """Enhanced crop risk prediction with comprehensive analysis"""
     
@@ -13,6 +165,8 @@ class CropPredictor:
         self.crop_database = self._build_crop_database()
         self.disease_database = self._build_disease_database()
         self.season_data = self._get_season_data()
+        self.crop_table = CropTable(self.crop_database)
+        self.disease_index = DiseaseIndex(self.disease_database, self.crop_database)
         
     def _build_crop_database(self):
         """Comprehensive crop database with optimal and tolerance ranges"""
@@ -432,50 +586,280 @@ class CropPredictor:
             return {"season": "Zaid", "monsoon": False, "rain_likely": False}
     
     def predict(self, rainfall, temperature, humidity, soil_ph, crop_type):
-        """Main prediction function with comprehensive analysis"""
+        """Main prediction function with comprehensive analysis
+        
+        Returns a PredictionResult: risk level and weighted score are computed
+        here, the text fields are only generated when they are read.
+        """
         
         # Get crop data or use defaults
-        crop_data = self.crop_database.get(crop_type, self.crop_database["Rice"])
+        crop_id = self.crop_table.crop_id(crop_type)
+        crop_data = self.crop_database[self.crop_table.names[crop_id]]
         
-        # Calculate individual risk factors
-        risks = self._calculate_risks(rainfall, temperature, humidity, soil_ph, crop_data)
+        # Score each risk factor without building the reason text
+        scores = self._score_factors(crop_id, rainfall, temperature, humidity, soil_ph)
+        weighted_risk = self._weighted_risk(*scores)
         
-        # Determine disease risks
-        disease_risks = self._calculate_disease_risk(temperature, humidity, crop_type, crop_data)
+        return PredictionResult(
+            self, crop_type, crop_data, (rainfall, temperature, humidity, soil_ph),
+            scores, weighted_risk, self._assessment(weighted_risk)
+        )
+    
+    def _score_factors(self, crop_id, rainfall, temperature, humidity, soil_ph):
+        """Rainfall, temperature, humidity and pH scores of _calculate_risks"""
+        rain_lo, rain_hi, temp_lo, temp_hi, hum_lo, hum_hi, ph_ideal = self.crop_table.bounds[crop_id]
         
-        # Calculate overall risk score - extract score values from each risk dictionary
-        total_risk = sum(risk["score"] for risk in risks.values())
+        rain_risk = 0
+        if rainfall < rain_lo:
+            deficit = rain_lo - rainfall
+            rain_risk = 25 if deficit > 100 else 15 if deficit > 50 else 8
+        elif rainfall > rain_hi:
+            rain_risk = 20 if rainfall - rain_hi > 100 else 10
         
-        # Determine risk level and recommendations
-        risk_level, loss_estimate, action_plan = self._get_risk_assessment(total_risk, risks)
+        temp_risk = 0
+        if temperature < temp_lo:
+            temp_risk = 20 if temperature < temp_lo - 10 else 10
+        elif temperature > temp_hi:
+            temp_risk = 25 if temperature > temp_hi + 8 else 18 if temperature > temp_hi + 5 else 10
         
-        # Get optimal parameters for this crop
-        optimal = crop_data["optimal"]
+        hum_risk = 0
+        if humidity < hum_lo:
+            hum_risk = 15 if humidity < hum_lo - 20 else 8
+        elif humidity > hum_hi:
+            hum_risk = 15 if humidity > 90 else 8
+        
+        ph_diff = abs(soil_ph - ph_ideal)
+        ph_risk = 20 if ph_diff > 2.0 else 10 if ph_diff > 1.0 else 3 if ph_diff > 0.5 else 0
+        
+        return rain_risk, temp_risk, hum_risk, ph_risk
+    
+    def predict_batch(self, rainfall, temperature, humidity, soil_ph, crop_type):
+        """Vectorized risk scoring for many readings at once
+        
+        Takes columns (lists or NumPy arrays) of equal length and a crop name
+        or a column of crop names. Scores match _calculate_risks and
+        _get_risk_assessment row for row; no text is generated.
+        """
+        rainfall = np.asarray(rainfall, dtype=np.float64)
+        temperature = np.asarray(temperature, dtype=np.float64)
+        humidity = np.asarray(humidity, dtype=np.float64)
+        soil_ph = np.asarray(soil_ph, dtype=np.float64)
+        
+        # Gather each row's optimal ranges from the compiled crop table
+        table = self.crop_table
+        crop_ids = np.broadcast_to(table.ids(crop_type), rainfall.shape)
+        lows, highs = table.optimal_min[crop_ids], table.optimal_max[crop_ids]
+        rain_lo, temp_lo, hum_lo = lows[..., 0], lows[..., 1], lows[..., 2]
+        rain_hi, temp_hi, hum_hi = highs[..., 0], highs[..., 1], highs[..., 2]
+        ph_ideal = table.ph_ideal[crop_ids]
+        
+        # 1. Rainfall Risk
+        rain_score = np.select(
+            [rainfall < rain_lo, rainfall > rain_hi],
+            [np.select([rain_lo - rainfall > 100, rain_lo - rainfall > 50], [25, 15], 8),
+             np.where(rainfall - rain_hi > 100, 20, 10)],
+            0,
+        )
+        
+        # 2. Temperature Risk
+        temp_score = np.select(
+            [temperature < temp_lo, temperature > temp_hi],
+            [np.where(temperature < temp_lo - 10, 20, 10),
+             np.select([temperature > temp_hi + 8, temperature > temp_hi + 5], [25, 18], 10)],
+            0,
+        )
+        
+        # 3. Humidity Risk
+        hum_score = np.select(
+            [humidity < hum_lo, humidity > hum_hi],
+            [np.where(humidity < hum_lo - 20, 15, 8),
+             np.where(humidity > 90, 15, 8)],
+            0,
+        )
+        
+        # 4. Soil pH Risk
+        ph_diff = np.abs(soil_ph - ph_ideal)
+        ph_score = np.select([ph_diff > 2.0, ph_diff > 1.0, ph_diff > 0.5], [20, 10, 3], 0)
+        
+        # Same weighting and thresholds as _get_risk_assessment
+        weighted_risk = rain_score * 1.2 + temp_score * 1.3 + hum_score * 1.0 + ph_score * 0.8
+        risk_code = np.searchsorted(RISK_THRESHOLDS, weighted_risk, side="right")
+        
+        return {
+            "rainfall_score": rain_score,
+            "temperature_score": temp_score,
+            "humidity_score": hum_score,
+            "soil_ph_score": ph_score,
+            "total_risk": rain_score + temp_score + hum_score + ph_score,
+            "weighted_risk": weighted_risk,
+            "risk_level": np.asarray(RISK_LEVELS)[risk_code],
+        }
+    
+    def predict_probabilistic(self, rainfall, temperature, humidity, soil_ph, crop_type,
+                              spread=(0.0, 0.0, 0.0), n_samples=10000, seed=None):
+        """Risk distribution for an uncertain weather forecast
+        
+        rainfall, temperature and humidity are each a forecast mean or an
+        array of ensemble members (members are drawn uniformly). spread holds
+        the standard deviations of the normal noise added to each of them.
+        All samples are drawn and scored as arrays in one pass; returns the
+        probability of every risk level and disease alert. Raises ValueError
+        unless n_samples is at least 1.
+        """
+        if n_samples < 1:
+            raise ValueError(f"n_samples must be at least 1, got {n_samples}")
+        rng = np.random.default_rng(seed)
+        
+        drawn = []
+        for forecast, sd in zip((rainfall, temperature, humidity), spread):
+            forecast = np.asarray(forecast, dtype=np.float64)
+            values = forecast[rng.integers(forecast.size, size=n_samples)] if forecast.ndim else np.full(n_samples, forecast.item())
+            if sd:
+                values = values + rng.normal(0.0, sd, n_samples)
+            drawn.append(values)
+        rain, temp, hum = drawn
+        np.maximum(rain, 0.0, out=rain)
+        np.clip(hum, 0.0, 100.0, out=hum)
+        
+        scored = self.predict_batch(rain, temp, hum, np.full(n_samples, float(soil_ph)), crop_type)
+        weighted = scored["weighted_risk"]
+        level_counts = np.bincount(np.searchsorted(RISK_THRESHOLDS, weighted, side="right"), minlength=len(RISK_LEVELS))
+        
+        # Disease alerts as _calculate_disease_risk raises them
+        diseases, top = self._top_diseases(crop_type, temp, hum)
+        alerts = {}
+        counts = np.bincount(top + 1, minlength=len(diseases) + 1).tolist()
+        for name, count in zip(diseases, counts[1:]):
+            if count:
+                alerts[f"HIGH RISK: {name} likely"] = count / n_samples
+        if counts[0]:
+            alerts["Low Risk"] = counts[0] / n_samples
+        disease_probability = dict(zip(diseases, self._favoured_diseases(diseases, temp, hum).mean(axis=0).tolist()))
+        
+        p10, p50, p90 = np.percentile(weighted, [10, 50, 90]).tolist()
+        return {
+            "samples": n_samples,
+            "risk_level_probability": dict(zip(RISK_LEVELS, (level_counts / n_samples).tolist())),
+            "expected_weighted_risk": float(weighted.mean()),
+            "weighted_risk_percentiles": {"p10": p10, "p50": p50, "p90": p90},
+            "disease_alert_probability": alerts,
+            "disease_probability": disease_probability,
+        }
+    
+    def _favoured_diseases(self, diseases, temperature, humidity):
+        """Mask of shape (readings, diseases) over a list of disease names"""
+        index = self.disease_index
+        return index.favoured_mask(temperature, humidity)[..., [index.names.index(name) for name in diseases]]
+    
+    def _top_diseases(self, crop_type, temperature, humidity):
+        """Common diseases of a crop and, per reading, the index of the one
+        _calculate_disease_risk would put first (-1 when none is favoured)
+        
+        Every favoured disease scores the same, so the top one is simply the
+        first favoured disease in the crop's common_diseases order.
+        """
+        crop_data = self.crop_database[self.crop_table.names[self.crop_table.crop_id(crop_type)]]
+        diseases = [name for name in crop_data.get("common_diseases", []) if name in self.disease_index.names]
+        if not diseases:
+            return diseases, np.full(np.shape(temperature), -1, dtype=np.intp)
+        favoured = self._favoured_diseases(diseases, temperature, humidity)
+        return diseases, np.where(favoured.any(axis=-1), favoured.argmax(axis=-1), -1)
+    
+    def risk_surface(self, rainfall, temperature, humidity, soil_ph, crop_type, sweep):
+        """Risk over a sweep of one or two inputs, all other inputs fixed
+        
+        sweep maps "rainfall"/"temperature"/"humidity"/"soil_ph" to either a
+        list of values or {"start": ..., "stop": ..., "steps": ...}. Returns
+        the axes as an ordered list of {"name", "values"} - the first is the
+        outermost dimension - and, per grid point, the weighted risk, risk
+        level and top disease (None when no disease is favoured), nested by
+        axis in that order.
+        """
+        base = {"rainfall": rainfall, "temperature": temperature, "humidity": humidity, "soil_ph": soil_ph}
+        if not 1 <= len(sweep) <= 2:
+            raise ValueError("Sweep one or two parameters")
+        
+        axes = {}
+        for name, values in sweep.items():
+            if name not in base:
+                raise ValueError(f"Unknown parameter: {name}")
+            if isinstance(values, dict):
+                values = np.linspace(float(values["start"]), float(values["stop"]), int(values["steps"]))
+            axes[name] = np.asarray(values, dtype=np.float64).reshape(-1)
+        
+        mesh = dict(zip(axes, np.meshgrid(*axes.values(), indexing="ij")))
+        shape = next(iter(mesh.values())).shape
+        columns = [mesh[name] if name in mesh else np.full(shape, float(base[name])) for name in base]
+        
+        scored = self.predict_batch(*columns, crop_type)
+        diseases, top = self._top_diseases(crop_type, columns[1], columns[2])
+        top_names = np.array(diseases + [None], dtype=object)[top]
         
         return {
-            "risk_level": risk_level,
-            "estimated_loss": loss_estimate,
-            "disease_alert": disease_risks["alert"],
-            "action_plan": action_plan,
-            "analysis_notes": self._generate_notes(risks, crop_data),
-            "recommendations": self._generate_recommendations(risks, disease_risks, crop_data),
-            "crop_category": crop_data["category"],
-            "season": crop_data["season"],
-            "water_need": crop_data["water_need"],
-            "nutrient_need": crop_data["nutrient_need"],
-            "optimal_parameters": {
-                "rainfall": f"{optimal['rainfall_mm'][0]}-{optimal['rainfall_mm'][1]}mm",
-                "temperature": f"{optimal['temp_c'][0]}-{optimal['temp_c'][1]}°C",
-                "humidity": f"{optimal['humidity'][0]}-{optimal['humidity'][1]}%",
-                "soil_ph": f"{optimal['ph'][0]}-{optimal['ph'][1]}"
-            },
-            "expected_yield": f"{crop_data['yield_optimal']['min']}-{crop_data['yield_optimal']['max']} {crop_data['yield_optimal']['unit']}",
-            "common_diseases": crop_data["common_diseases"],
-            "suitable_regions": crop_data["regional_suitability"][:3],
-            "detailed_risks": risks,
-            "disease_details": disease_risks["details"]
+            "crop_type": crop_type,
+            "axes": [{"name": name, "values": values.tolist()} for name, values in axes.items()],
+            "weighted_risk": scored["weighted_risk"].tolist(),
+            "risk_level": scored["risk_level"].tolist(),
+            "top_disease": top_names.tolist(),
         }
     
+    def rank_crops(self, rainfall, temperature, humidity, soil_ph, top_k=5, crops=None):
+        """Best-suited crops for one reading, lowest weighted risk first
+        
+        Every crop (or only those named in `crops`) is scored in one
+        predict_batch pass; ties keep crop database order.
+        """
+        table = self.crop_table
+        if crops is None:
+            crop_ids = np.arange(len(table), dtype=np.intp)
+        else:
+            crop_ids = np.array(sorted({table.index[name] for name in crops if name in table.index}), dtype=np.intp)
+        if crop_ids.size == 0 or top_k <= 0:
+            return []
+        
+        n = crop_ids.size
+        scored = self.predict_batch(
+            np.full(n, rainfall, dtype=np.float64), np.full(n, temperature, dtype=np.float64),
+            np.full(n, humidity, dtype=np.float64), np.full(n, soil_ph, dtype=np.float64), crop_ids
+        )
+        
+        # Partial sort on (weighted risk, crop id) so ties are deterministic
+        weighted_rank = np.unique(scored["weighted_risk"], return_inverse=True)[1].reshape(-1)
+        key = weighted_rank * len(table) + crop_ids
+        if top_k < n:
+            best = np.argpartition(key, top_k - 1)[:top_k]
+            best = best[np.argsort(key[best])]
+        else:
+            best = np.argsort(key)
+        
+        return [
+            {
+                "crop": table.names[crop_ids[i]],
+                "risk_level": str(scored["risk_level"][i]),
+                "weighted_risk": float(scored["weighted_risk"][i]),
+                "crop_category": table.categories[table.category_code[crop_ids[i]]],
+                "season": table.seasons[table.season_code[crop_ids[i]]],
+                "water_need": table.water_needs[table.water_need_code[crop_ids[i]]],
+            }
+            for i in best.tolist()
+        ]
+    
+    def predict_records(self, records, crop_type=None):
+        """Batch-score a list of readings
+        
+        Each record is a dict with rainfall/temperature/humidity/soil_ph keys
+        (and optionally crop_type) or a (rainfall, temperature, humidity,
+        soil_ph) tuple. crop_type overrides the per-record crop names.
+        """
+        records = list(records)
+        if records and isinstance(records[0], dict):
+            columns = [[rec[key] for rec in records] for key in ("rainfall", "temperature", "humidity", "soil_ph")]
+            if crop_type is None:
+                crop_type = [rec.get("crop_type") for rec in records]
+        else:
+            columns = [list(col) for col in zip(*records)] if records else [[], [], [], []]
+        return self.predict_batch(*columns[:4], crop_type if crop_type is not None else "Rice")
+    
     def _calculate_risks(self, rainfall, temperature, humidity, soil_ph, crop_data):
         """Calculate individual risk factors"""
         risks = {}
@@ -634,15 +1018,23 @@ class CropPredictor:
     
     def _get_risk_assessment(self, total_risk, risks):
         """Determine overall risk level and action plan"""
-        
-        # Weight the risks - some are more critical
-        weighted_risk = (
-            risks["rainfall"]["score"] * 1.2 +
-            risks["temperature"]["score"] * 1.3 +
-            risks["humidity"]["score"] * 1.0 +
-            risks["soil_ph"]["score"] * 0.8
+        weighted_risk = self._weighted_risk(
+            risks["rainfall"]["score"], risks["temperature"]["score"],
+            risks["humidity"]["score"], risks["soil_ph"]["score"]
         )
-        
+        return self._assessment(weighted_risk)
+    
+    def _weighted_risk(self, rain_risk, temp_risk, hum_risk, ph_risk):
+        """Weight the risks - some are more critical"""
+        return (
+            rain_risk * 1.2 +
+            temp_risk * 1.3 +
+            hum_risk * 1.0 +
+            ph_risk * 0.8
+        )
+    
+    def _assessment(self, weighted_risk):
+        """Risk level, loss estimate and action plan for a weighted risk"""
         if weighted_risk >= 70:
             return "CRITICAL", "70-90%", (
                 "IMMEDIATE ACTION REQUIRED!\n\n"
@@ -735,36 +1127,457 @@ class CropPredictor:
         return recommendations
 
 
-# Create instance for use
-predictor = CropPredictor()
-
-def predict_crop_high_level(rainfall, temperature, humidity, soil_ph, crop_type):
-    """Enhanced prediction function that returns comprehensive results"""
-    result = predictor.predict(rainfall, temperature, humidity, soil_ph, crop_type)
-    
-    # Add legacy support - flatten some fields for backward compatibility
-    return {
-        "risk_level": result["risk_level"],
-        "estimated_loss": result["estimated_loss"],
-        "disease_alert": result["disease_alert"],
-        "action_plan": result["action_plan"],
-        "analysis_notes": result["analysis_notes"],
-        "recommendations": result["recommendations"],
-        "crop_category": result["crop_category"],
-        "season": result["season"],
-        "optimal_parameters": result["optimal_parameters"],
-        "expected_yield": result["expected_yield"],
-        "common_diseases": result["common_diseases"],
-        "suitable_regions": result["suitable_regions"],
-        "water_need": result["water_need"],
-        "nutrient_need": result["nutrient_need"],
-        "detailed_risks": result["detailed_risks"],
-        "disease_details": result["disease_details"]
-    }
+class PredictionResult:
+    """Result of CropPredictor.predict
+    
+    risk_level, weighted_risk, estimated_loss and action_plan are set up
+    front; the detailed risks, disease analysis, notes and recommendations
+    are rendered on first access and kept. Supports read-only dict access
+    (result["risk_level"], result.get(...), dict(result)).
+    """
+    
+    __slots__ = (
+        "_predictor", "crop_type", "crop_data", "inputs", "scores",
+        "weighted_risk", "risk_level", "estimated_loss", "action_plan",
+        "_risks", "_disease_risks", "_notes", "_recommendations",
+    )
+    
+    # Keys in the order predict_crop_high_level has always returned them
+    FIELDS = (
+        "risk_level", "estimated_loss", "disease_alert", "action_plan",
+        "analysis_notes", "recommendations", "crop_category", "season",
+        "optimal_parameters", "expected_yield", "common_diseases",
+        "suitable_regions", "water_need", "nutrient_need", "detailed_risks",
+        "disease_details", "weighted_risk",
+    )
+    _FIELD_SET = frozenset(FIELDS)
+    
+    def __init__(self, predictor, crop_type, crop_data, inputs, scores, weighted_risk, assessment):
+        self._predictor = predictor
+        self.crop_type = crop_type
+        self.crop_data = crop_data
+        self.inputs = inputs
+        self.scores = scores
+        self.weighted_risk = weighted_risk
+        self.risk_level, self.estimated_loss, self.action_plan = assessment
+        self._risks = None
+        self._disease_risks = None
+        self._notes = None
+        self._recommendations = None
+    
+    def __repr__(self):
+        return f"<PredictionResult {self.crop_data['category']} {self.risk_level} ({self.weighted_risk:g})>"
+    
+    # ----- dict-style access -----
+    
+    def __getitem__(self, key):
+        if key not in self._FIELD_SET:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __contains__(self, key):
+        return key in self._FIELD_SET
+    
+    def __iter__(self):
+        return iter(self.FIELDS)
+    
+    def keys(self):
+        return self.FIELDS
+    
+    def get(self, key, default=None):
+        return getattr(self, key) if key in self._FIELD_SET else default
+    
+    def to_dict(self, fields=None):
+        """Plain dict of the requested fields (all of them by default)"""
+        if fields is None:
+            return {field: getattr(self, field) for field in self.FIELDS}
+        return {field: self[field] for field in fields}
+    
+    # ----- fields read straight from the crop data -----
+    
+    @property
+    def total_risk(self):
+        return sum(self.scores)
+    
+    @property
+    def crop_category(self):
+        return self.crop_data["category"]
+    
+    @property
+    def season(self):
+        return self.crop_data["season"]
+    
+    @property
+    def water_need(self):
+        return self.crop_data["water_need"]
+    
+    @property
+    def nutrient_need(self):
+        return self.crop_data["nutrient_need"]
+    
+    @property
+    def common_diseases(self):
+        return self.crop_data["common_diseases"]
+    
+    @property
+    def suitable_regions(self):
+        return self.crop_data["regional_suitability"][:3]
+    
+    @property
+    def optimal_parameters(self):
+        optimal = self.crop_data["optimal"]
+        return {
+            "rainfall": f"{optimal['rainfall_mm'][0]}-{optimal['rainfall_mm'][1]}mm",
+            "temperature": f"{optimal['temp_c'][0]}-{optimal['temp_c'][1]}°C",
+            "humidity": f"{optimal['humidity'][0]}-{optimal['humidity'][1]}%",
+            "soil_ph": f"{optimal['ph'][0]}-{optimal['ph'][1]}"
+        }
+    
+    @property
+    def expected_yield(self):
+        yield_optimal = self.crop_data["yield_optimal"]
+        return f"{yield_optimal['min']}-{yield_optimal['max']} {yield_optimal['unit']}"
+    
+    # ----- lazily rendered analysis -----
+    
+    @property
+    def detailed_risks(self):
+        if self._risks is None:
+            self._risks = self._predictor._calculate_risks(*self.inputs, self.crop_data)
+        return self._risks
+    
+    @property
+    def disease_risks(self):
+        if self._disease_risks is None:
+            temperature, humidity = self.inputs[1], self.inputs[2]
+            self._disease_risks = self._predictor._calculate_disease_risk(temperature, humidity, self.crop_type, self.crop_data)
+        return self._disease_risks
+    
+    @property
+    def disease_alert(self):
+        return self.disease_risks["alert"]
+    
+    @property
+    def disease_details(self):
+        return self.disease_risks["details"]
+    
+    @property
+    def analysis_notes(self):
+        if self._notes is None:
+            self._notes = self._predictor._generate_notes(self.detailed_risks, self.crop_data)
+        return self._notes
+    
+    @property
+    def recommendations(self):
+        if self._recommendations is None:
+            self._recommendations = self._predictor._generate_recommendations(self.detailed_risks, self.disease_risks, self.crop_data)
+        return self._recommendations
+
+
+def _finite(values):
+    """True if every value is a finite number"""
+    try:
+        return all(map(math.isfinite, values))
+    except TypeError:
+        return False
+
+
+class PredictionCache:
+    """LRU cache of predictions keyed on the reading
+    
+    By default entries are keyed on the exact values, so a cached result is
+    always the one predict() gives for that reading. A `resolution` (one
+    step for all four inputs, or a (rainfall, temperature, humidity,
+    soil_ph) tuple) keys on grid cells instead: a miss still scores the
+    caller's real reading, but a hit returns the result of whichever reading
+    filled the cell first - opt-in, and only safe when the steps are fine
+    enough that no cell straddles a crop threshold. Non-finite readings
+    bypass the cache. Cached results are shared between callers and must be
+    treated as read-only.
+    """
+    
+    def __init__(self, maxsize=4096, resolution=0, enabled=True):
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.configure(maxsize=maxsize, resolution=resolution, enabled=enabled)
+    
+    def configure(self, maxsize=None, resolution=None, enabled=None):
+        """Change the size bound, resolution or on/off switch and start empty"""
+        with self._lock:
+            if maxsize is not None:
+                self.maxsize = maxsize
+            if resolution is not None:
+                self.resolution = resolution if isinstance(resolution, tuple) else (resolution,) * 4
+            if enabled is not None:
+                self.enabled = enabled
+            self._entries.clear()
+    
+    def clear(self):
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+    
+    def stats(self):
+        """Hit/miss/eviction counters and current occupancy"""
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+    
+    def _cells(self, rainfall, temperature, humidity, soil_ph):
+        """Grid cell of each input (the exact value when its step is falsy)"""
+        rain_step, temp_step, hum_step, ph_step = self.resolution
+        return (
+            round(rainfall / rain_step) if rain_step else rainfall,
+            round(temperature / temp_step) if temp_step else temperature,
+            round(humidity / hum_step) if hum_step else humidity,
+            round(soil_ph / ph_step) if ph_step else soil_ph,
+        )
+    
+    def predict(self, predictor, rainfall, temperature, humidity, soil_ph, crop_type):
+        """Cached predictor.predict; always scores the caller's own reading"""
+        reading = (rainfall, temperature, humidity, soil_ph)
+        if not self.enabled or self.maxsize <= 0 or not _finite(reading):
+            return predictor.predict(rainfall, temperature, humidity, soil_ph, crop_type)
+        
+        key = (crop_type,) + self._cells(*reading)
+        with self._lock:
+            result = self._entries.get(key)
+            if result is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return result
+            self.misses += 1
+        
+        result = predictor.predict(rainfall, temperature, humidity, soil_ph, crop_type)
+        with self._lock:
+            self._entries[key] = result
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+
+# Shared instances - the predictor is built on first use, so importing this
+# module stays cheap for callers that never score a reading
+_predictor = None
+_predictor_lock = threading.Lock()
+prediction_cache = PredictionCache()
+
+
+def get_predictor():
+    """Shared CropPredictor, constructed on first call"""
+    global _predictor
+    if _predictor is None:
+        with _predictor_lock:
+            if _predictor is None:
+                _predictor = CropPredictor()
+    return _predictor
+
+
+def __getattr__(name):
+    # Keeps `model_enhanced.predictor` / `from model_enhanced import predictor` working
+    if name == "predictor":
+        return get_predictor()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def predict_crop_high_level(rainfall, temperature, humidity, soil_ph, crop_type, fields=None):
+    """Enhanced prediction function that returns comprehensive results
+    
+    fields selects which keys to return, e.g. ("risk_level", "weighted_risk");
+    text fields that are not selected are never generated. Results go through
+    prediction_cache (see PredictionCache; disable with
+    prediction_cache.configure(enabled=False)).
+    """
+    result = prediction_cache.predict(get_predictor(), rainfall, temperature, humidity, soil_ph, crop_type)
+    return result.to_dict(fields)
+
+
+def rank_crops(rainfall, temperature, humidity, soil_ph, season=None, region=None, top_k=5):
+    """Rank all crops for one reading, optionally limited to the crops the
+    database links to a season and/or region
+    
+    Raises ValueError when a filter leaves no crop to rank.
+    """
+    predictor = get_predictor()
+    crops = None
+    if season or region:
+        from database.db_util import get_crop_names
+        crops = get_crop_names(season_name=season, region_name=region)
+        if not any(name in predictor.crop_table.index for name in crops):
+            filters = ", ".join(f"{key} {value!r}" for key, value in (("season", season), ("region", region)) if value)
+            raise ValueError(f"No crops found for {filters}")
+    return predictor.rank_crops(rainfall, temperature, humidity, soil_ph, top_k=top_k, crops=crops)
+
+
+# ===== STREAMING FILE SCORING =====
+
+READING_COLUMNS = ("rainfall", "temperature", "humidity", "soil_ph")
+SCORE_COLUMNS = ("risk_level", "weighted_risk", "rainfall_score", "temperature_score", "humidity_score", "soil_ph_score")
+
+def _score_lines(fmt, header, lines, default_crop):
+    """Parse, score and format one chunk of input lines
+    
+    Runs in the worker processes, so the parent only shuffles text. Rows
+    with missing or non-numeric readings are kept with empty scores, and so
+    are JSONL lines that are not a JSON object - as {"input": line}.
+    Returns (output text, rows, invalid rows).
+    """
+    if fmt == "csv":
+        records = list(csv.DictReader(lines, fieldnames=header))
+    else:
+        records = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            records.append(record if isinstance(record, dict) else {"input": line.rstrip("\r\n")})
+    
+    columns = [[] for _ in READING_COLUMNS]
+    crops = []
+    valid = []
+    for record in records:
+        try:
+            reading = [float(record[name]) for name in READING_COLUMNS]
+        except (KeyError, TypeError, ValueError):
+            valid.append(False)
+            reading = [0.0] * len(READING_COLUMNS)
+        else:
+            valid.append(True)
+        for column, value in zip(columns, reading):
+            column.append(value)
+        crops.append(record.get("crop_type") or default_crop)
+    
+    result = get_predictor().predict_batch(*columns, crops) if records else {name: np.empty(0) for name in SCORE_COLUMNS}
+    scores = list(zip(*(result[name].tolist() for name in SCORE_COLUMNS)))
+    
+    out = io.StringIO()
+    if fmt == "csv":
+        writer = csv.writer(out, lineterminator="\n")
+        for record, ok, row_scores in zip(records, valid, scores):
+            writer.writerow([record.get(name, "") for name in header] + list(row_scores if ok else [""] * len(SCORE_COLUMNS)))
+    else:
+        for record, ok, row_scores in zip(records, valid, scores):
+            record.update(zip(SCORE_COLUMNS, row_scores if ok else [None] * len(SCORE_COLUMNS)))
+            out.write(json.dumps(record) + "\n")
+    return out.getvalue(), len(records), valid.count(False)
+
+def score_stream(source, destination, fmt="csv", chunk_size=50000, workers=1, crop_type="Rice", progress=None):
+    """Score a CSV/JSONL stream of readings chunk by chunk
+    
+    At most 2 x workers chunks are held at once, so memory stays flat
+    however long the input is. Output rows keep the input order.
+    """
+    header = None
+    if fmt == "csv":
+        header = next(csv.reader([source.readline()]), None)
+        if not header:
+            return {"rows": 0, "invalid": 0, "seconds": 0.0, "rows_per_sec": 0.0}
+        csv.writer(destination, lineterminator="\n").writerow(header + list(SCORE_COLUMNS))
+    
+    stats = {"rows": 0, "invalid": 0}
+    started = time.perf_counter()
+    
+    def write(text, rows, invalid):
+        destination.write(text)
+        stats["rows"] += rows
+        stats["invalid"] += invalid
+        if progress:
+            progress(stats["rows"], time.perf_counter() - started)
+    
+    def chunks():
+        while True:
+            lines = [line for _, line in zip(range(chunk_size), source)]
+            if not lines:
+                return
+            yield lines
+    
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for lines in chunks():
+                pending.append(pool.submit(_score_lines, fmt, header, lines, crop_type))
+                if len(pending) >= 2 * workers:
+                    write(*pending.popleft().result())
+            while pending:
+                write(*pending.popleft().result())
+    else:
+        for lines in chunks():
+            write(*_score_lines(fmt, header, lines, crop_type))
+    
+    stats["seconds"] = time.perf_counter() - started
+    stats["rows_per_sec"] = stats["rows"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+def _detect_format(path):
+    if path.endswith(".csv"):
+        return "csv"
+    if path.endswith((".jsonl", ".ndjson", ".json")):
+        return "jsonl"
+    return None
+
+def main(argv=None):
+    """Command line entry point: python -m model_enhanced score ..."""
+    parser = argparse.ArgumentParser(prog="python -m model_enhanced", description="AgriGuard AI crop risk model")
+    commands = parser.add_subparsers(dest="command")
+    score = commands.add_parser("score", help="score a CSV/JSONL file of field readings")
+    score.add_argument("input", help="input file, or - for stdin")
+    score.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    score.add_argument("--format", choices=("csv", "jsonl"), help="input/output format (default: from the file extension)")
+    score.add_argument("--chunk-size", type=int, default=50000, help="rows per chunk (default: 50000)")
+    score.add_argument("--workers", type=int, default=1, help="worker processes (default: 1)")
+    score.add_argument("--crop", default="Rice", help="crop for rows without a crop_type (default: Rice)")
+    score.add_argument("--quiet", action="store_true", help="no progress on stderr")
+    args = parser.parse_args(argv)
+    
+    if args.command != "score":
+        parser.print_help()
+        return 2
+    
+    fmt = args.format or _detect_format(args.input) or _detect_format(args.output)
+    if fmt is None:
+        parser.error("cannot tell the format from the file names, pass --format")
+    
+    last_report = [0.0]
+    def progress(rows, elapsed):
+        if not args.quiet and elapsed - last_report[0] >= 5:
+            last_report[0] = elapsed
+            print(f"  {rows:,} rows ({rows / elapsed:,.0f} rows/sec)", file=sys.stderr)
+    
+    source = sys.stdin if args.input == "-" else open(args.input, "r", newline="", encoding="utf-8")
+    destination = sys.stdout if args.output == "-" else open(args.output, "w", newline="", encoding="utf-8")
+    try:
+        stats = score_stream(source, destination, fmt, args.chunk_size, args.workers, args.crop, progress)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if destination is not sys.stdout:
+            destination.close()
+    
+    print(f"✓ Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_sec']:,.0f} rows/sec, {stats['invalid']:,} invalid)", file=sys.stderr)
+    return 0
 
 
 # Test the enhanced model
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main())
+    
     # Test with sample data
     result = predict_crop_high_level(
         rainfall=150,
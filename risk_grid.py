@@ -0,0 +1,274 @@
+"""
+Precomputed Risk Lookup Grids for AgriGuard AI
+Tabulates the CropPredictor weighted risk of every crop over the cells
+between its rainfall, temperature, humidity and soil pH scoring thresholds
+for exact lookups of any reading
+"""
+
+import json
+import os
+import sys
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+from model_enhanced import RISK_LEVELS, RISK_THRESHOLDS, get_predictor
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+GRID_DIR = os.path.join(BASE_DIR, 'risk_grid_data')
+
+AXES = ("rainfall", "temperature", "humidity", "soil_ph")
+SCORE_COLUMNS = ("rainfall_score", "temperature_score", "humidity_score", "soil_ph_score")
+
+
+# Half-width of the window, relative to the threshold, searched for the exact
+# float where a rule flips; far below the gap between any two thresholds
+THRESHOLD_WINDOW = 1e-6
+
+SIGN_BIT = np.int64(-2 ** 63)
+
+
+def _float_order(values):
+    """float64 -> int64 keys in the same order, adjacent floats one apart"""
+    bits = values.view(np.int64)
+    return np.where(bits < 0, SIGN_BIT - bits, bits)
+
+
+def _from_float_order(keys):
+    return np.where(keys < 0, SIGN_BIT - keys, keys).view(np.float64)
+
+
+def _breakpoints(model, crop_id):
+    """Sorted values at which each factor score of one crop changes
+
+    The candidates are the comparison constants of CropPredictor._score_factors.
+    Rules like `rain_lo - rainfall > 100` round the subtraction, so the live
+    rules can flip a few ulps away from `rain_lo - 100` (further near zero);
+    each candidate is moved, by bisecting the floats around it, to the first
+    float scoring differently from the one below it. Candidates where the
+    score does not change (humidity 90 above an optimal max of 90) are dropped.
+    """
+    table = model.crop_table
+    name = table.names[crop_id]
+    rain_lo, rain_hi, temp_lo, temp_hi, hum_lo, hum_hi, ph_ideal = table.bounds[crop_id]
+    candidates = (
+        [rain_lo - 100, rain_lo - 50, rain_lo, rain_hi, rain_hi + 100],
+        [temp_lo - 10, temp_lo, temp_hi, temp_hi + 5, temp_hi + 8],
+        [hum_lo - 20, hum_lo, hum_hi, 90.0],
+        [ph_ideal + offset for offset in (-2.0, -1.0, -0.5, 0.5, 1.0, 2.0)],
+    )
+    points = []
+    for position, (column, nominal) in enumerate(zip(SCORE_COLUMNS, candidates)):
+        def score(values):
+            inputs = [np.zeros(values.size) for _ in AXES]
+            inputs[position] = values
+            return model.predict_batch(*inputs, name)[column]
+
+        nominal = np.unique(nominal)
+        width = THRESHOLD_WINDOW * (1 + np.abs(nominal))
+        low, high = _float_order(nominal - width), _float_order(nominal + width)
+        low_score = score(_from_float_order(low))
+        flips = score(_from_float_order(high)) != low_score
+        low, high, low_score = low[flips], high[flips], low_score[flips]
+        while np.any(high - low > 1):
+            middle = low + (high - low) // 2
+            below = score(_from_float_order(middle)) == low_score
+            low, high = np.where(below, middle, low), np.where(below, high, middle)
+        points.append(_from_float_order(high))
+    return tuple(points)
+
+
+def _cells(breakpoints, values):
+    """Cell of each value: 2i for the open interval below breakpoint i, 2i + 1
+    for the breakpoint itself - so strict and non-strict comparisons both fall
+    on a cell boundary"""
+    return np.searchsorted(breakpoints, values, side="left") + np.searchsorted(breakpoints, values, side="right")
+
+
+def _representatives(breakpoints):
+    """One reading inside each of the 2n + 1 cells of an axis"""
+    gaps = (breakpoints[:-1] + breakpoints[1:]) / 2
+    values = np.empty(2 * breakpoints.size + 1)
+    values[0], values[-1] = breakpoints[0] - 1, breakpoints[-1] + 1
+    values[1::2] = breakpoints
+    values[2:-1:2] = gaps
+    return values
+
+
+class RiskGrid:
+    """Weighted risk per crop over the cells between its scoring breakpoints
+
+    The scoring rules are piecewise constant, so each axis of each crop splits
+    at its own breakpoints into open intervals and the breakpoints themselves;
+    every reading inside one cell scores the same. The grid is a uint8 array
+    of shape (crops, rainfall, temperature, humidity, soil_ph cells) holding
+    codes into `palette`, the sorted distinct weighted-risk values, and a
+    lookup is a binary search per axis - exact for any reading.
+    """
+
+    def __init__(self, grid, crops, default_crop, breakpoints, palette):
+        self.grid = grid
+        self.crops = tuple(crops)
+        self.index = {name: crop_id for crop_id, name in enumerate(self.crops)}
+        self.default_id = self.index[default_crop]
+        self.palette = [float(value) for value in palette]
+        self.levels = [RISK_LEVELS[code] for code in np.searchsorted(RISK_THRESHOLDS, self.palette, side="right")]
+
+        # breakpoints[crop_id][position]: sorted array for the batch lookups,
+        # plus plain-float lists for bisect in the scalar path
+        self.breakpoints = [tuple(np.asarray(axis, dtype=np.float64) for axis in crop) for crop in breakpoints]
+        self._bisect = [tuple(axis.tolist() for axis in crop) for crop in self.breakpoints]
+
+        # Flat view for lookups by plain offset arithmetic
+        self._flat = memoryview(np.ascontiguousarray(grid).reshape(-1))
+
+    @classmethod
+    def build(cls, model=None):
+        """Tabulate every crop in model.crop_database"""
+        model = model or get_predictor()
+        table = model.crop_table
+        breakpoints = [_breakpoints(model, crop_id) for crop_id in range(len(table))]
+
+        # Each factor score depends on its own input only, so score one
+        # reading per cell of every axis with the live vectorized rules
+        factor_scores = []
+        for crop_id, name in enumerate(table.names):
+            scores = []
+            for position, column in enumerate(SCORE_COLUMNS):
+                values = _representatives(breakpoints[crop_id][position])
+                inputs = [np.zeros(values.size) for _ in AXES]
+                inputs[position] = values
+                scores.append(model.predict_batch(*inputs, name)[column])
+            factor_scores.append(scores)
+
+        # Every distinct weighted value any crop can reach
+        distinct = [np.unique(np.concatenate([scores[position] for scores in factor_scores])) for position in range(4)]
+        palette = np.unique(model._weighted_risk(*np.ix_(*distinct)))
+        if palette.size > 256:
+            raise ValueError(f"{palette.size} distinct weighted risks do not fit a uint8 grid")
+
+        # Crops with fewer distinct breakpoints leave their trailing cells unused
+        shape = tuple(max(scores[position].size for scores in factor_scores) for position in range(4))
+        grid = np.zeros((len(table.names),) + shape, dtype=np.uint8)
+        for crop_id, scores in enumerate(factor_scores):
+            weighted = model._weighted_risk(*np.ix_(*scores))
+            grid[(crop_id,) + tuple(slice(0, size) for size in weighted.shape)] = np.searchsorted(palette, weighted)
+
+        return cls(grid, table.names, table.names[table.default_id], breakpoints, palette)
+
+    # ----- persistence -----
+
+    def save(self, directory=GRID_DIR):
+        """Write grid.npy and meta.json into directory"""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, 'grid.npy'), self.grid)
+        meta = {
+            "crops": list(self.crops),
+            "default_crop": self.crops[self.default_id],
+            "breakpoints": [[axis.tolist() for axis in crop] for crop in self.breakpoints],
+            "palette": self.palette,
+        }
+        with open(os.path.join(directory, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+
+    @classmethod
+    def load(cls, directory=GRID_DIR):
+        """Memory-map a grid written by save()"""
+        with open(os.path.join(directory, 'meta.json'), 'r') as f:
+            meta = json.load(f)
+        grid = np.load(os.path.join(directory, 'grid.npy'), mmap_mode='r')
+        return cls(grid, meta["crops"], meta["default_crop"], meta["breakpoints"], meta["palette"])
+
+    # ----- lookups -----
+
+    def code(self, crop_type, rainfall, temperature, humidity, soil_ph):
+        """Palette code for one reading"""
+        crop_id = self.index.get(crop_type, self.default_id)
+        r_points, t_points, h_points, p_points = self._bisect[crop_id]
+        r = bisect_left(r_points, rainfall) + bisect_right(r_points, rainfall)
+        t = bisect_left(t_points, temperature) + bisect_right(t_points, temperature)
+        h = bisect_left(h_points, humidity) + bisect_right(h_points, humidity)
+        p = bisect_left(p_points, soil_ph) + bisect_right(p_points, soil_ph)
+        _, r_size, t_size, h_size, p_size = self.grid.shape
+        return self._flat[(((crop_id * r_size + r) * t_size + t) * h_size + h) * p_size + p]
+
+    def weighted_risk(self, crop_type, rainfall, temperature, humidity, soil_ph):
+        """Weighted risk score for one reading"""
+        return self.palette[self.code(crop_type, rainfall, temperature, humidity, soil_ph)]
+
+    def risk_level(self, crop_type, rainfall, temperature, humidity, soil_ph):
+        """Risk level for one reading"""
+        return self.levels[self.code(crop_type, rainfall, temperature, humidity, soil_ph)]
+
+    def weighted_risk_batch(self, crop_type, rainfall, temperature, humidity, soil_ph):
+        """Weighted risk for arrays of readings of one crop"""
+        crop_id = self.index.get(crop_type, self.default_id)
+        cells = [
+            _cells(breakpoints, np.asarray(values, dtype=np.float64))
+            for breakpoints, values in zip(self.breakpoints[crop_id], (rainfall, temperature, humidity, soil_ph))
+        ]
+        return np.asarray(self.palette)[self.grid[(crop_id, *cells)]]
+
+    # ----- verification -----
+
+    def verify(self, model=None, samples=2000, seed=0):
+        """Re-score the grid against the live rules; returns mismatches per crop
+
+        Every cell of each crop is pushed through predict_batch, then random
+        readings are checked through both lookups: uniform values spanning
+        the breakpoints plus the breakpoints themselves and their nearest
+        floating-point neighbours.
+        """
+        model = model or get_predictor()
+        table = model.crop_table
+        palette = np.asarray(self.palette)
+        rng = np.random.default_rng(seed)
+        mismatches = {}
+        for crop_id, name in enumerate(self.crops):
+            table_id = table.crop_id(name)
+            breakpoints = self.breakpoints[crop_id]
+            if any(not np.array_equal(ours, live) for ours, live in zip(breakpoints, _breakpoints(model, table_id))):
+                mismatches[name] = "breakpoints changed"
+                continue
+
+            # Every cell
+            mesh = [column.reshape(-1) for column in np.meshgrid(*map(_representatives, breakpoints), indexing="ij")]
+            live = model.predict_batch(*mesh, name)["weighted_risk"]
+            cells = np.asarray(self.grid[crop_id])[np.ix_(*(np.arange(2 * axis.size + 1) for axis in breakpoints))]
+            bad = int(np.count_nonzero(palette[cells.reshape(-1)] != live))
+
+            # Random readings, on and off the breakpoints
+            columns = []
+            for axis in breakpoints:
+                edges = np.concatenate([axis, np.nextafter(axis, -np.inf), np.nextafter(axis, np.inf)])
+                uniform = rng.uniform(axis[0] - 50, axis[-1] + 50, samples)
+                columns.append(rng.permutation(np.concatenate([uniform, rng.choice(edges, samples)])))
+            live = model.predict_batch(*columns, name)["weighted_risk"]
+            bad += int(np.count_nonzero(self.weighted_risk_batch(name, *columns) != live))
+            for reading in zip(*(column[:200].tolist() for column in columns)):
+                expected = model._weighted_risk(*model._score_factors(table_id, *reading))
+                if self.weighted_risk(name, *reading) != expected:
+                    bad += 1
+            if bad:
+                mismatches[name] = bad
+        return mismatches
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else "build"
+    directory = sys.argv[2] if len(sys.argv) > 2 else GRID_DIR
+
+    if command == "build":
+        risk_grid = RiskGrid.build()
+        risk_grid.save(directory)
+        print(f"✓ Risk grid {risk_grid.grid.shape} ({risk_grid.grid.nbytes / 1e3:.1f} kB) saved to {directory}")
+    elif command == "verify":
+        risk_grid = RiskGrid.load(directory)
+        mismatches = risk_grid.verify()
+        if mismatches:
+            print(f"✗ Grid disagrees with the live rules: {mismatches}")
+            sys.exit(1)
+        print(f"✓ All {len(risk_grid.crops)} crops match the live rules on every cell and random reading")
+    else:
+        print("Usage: python risk_grid.py [build|verify] [directory]")
+        sys.exit(2)
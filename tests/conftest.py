@@ -0,0 +1,32 @@
+"""
+Shared fixtures for the AgriGuard AI tests
+"""
+
+import os
+import shutil
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from database import db_util, migrate
+
+
+@pytest.fixture
+def database(tmp_path):
+    """db_util pointed at a migrated copy of the bundled database"""
+    path = str(tmp_path / "agriguard.db")
+    shutil.copyfile(os.path.join(ROOT, "database", "agriguard.db"), path)
+    migrate.migrate(path, verbose=False)
+
+    original = db_util.DB_PATH
+    db_util.DB_PATH = path
+    db_util.reference_cache.invalidate()
+    try:
+        yield path
+    finally:
+        db_util.db.close()
+        db_util.DB_PATH = original
+        db_util.reference_cache.invalidate()
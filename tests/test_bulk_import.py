@@ -0,0 +1,95 @@
+"""
+Bulk import tests: conflict modes, trigger restore, and the set-based
+stats/search catch-up agreeing with a full rebuild
+"""
+
+import json
+import os
+import sqlite3
+
+import pytest
+
+from database import bulk_import, migrate
+
+# The recount at the end of the stats migration
+RECOUNT_SQL = open(os.path.join(migrate.MIGRATIONS_DIR, "0005_stats_table.sql"), encoding="utf-8").read()
+RECOUNT_SQL = RECOUNT_SQL[RECOUNT_SQL.index("DELETE FROM stats;"):]
+
+
+def _query(path, sql, params=()):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
+
+
+def _triggers(path):
+    return _query(path, "SELECT name, tbl_name, sql FROM sqlite_master WHERE type = 'trigger' ORDER BY name")
+
+
+def _write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def links(database, tmp_path):
+    """A crop_regions file with one link the database has and one it lacks"""
+    existing = _query(database, """
+        SELECT c.crop_name, r.region_name FROM crop_regions cr
+        JOIN crops c ON c.crop_id = cr.crop_id JOIN regions r ON r.region_id = cr.region_id LIMIT 1
+    """)[0]
+    new = _query(database, """
+        SELECT c.crop_name, r.region_name FROM crops c, regions r
+        WHERE NOT EXISTS (SELECT 1 FROM crop_regions cr WHERE cr.crop_id = c.crop_id AND cr.region_id = r.region_id)
+        LIMIT 1
+    """)[0]
+    rows = "".join(f"{crop},{region},7\n" for crop, region in (new, existing))
+    return _write(tmp_path / "links.csv", "crop_name,region_name,suitability_score\n" + rows)
+
+
+def test_conflict_abort_rolls_back(database, links):
+    before = _query(database, "SELECT COUNT(*) FROM crop_regions")
+    triggers = _triggers(database)
+    with pytest.raises(sqlite3.IntegrityError):
+        bulk_import.import_file("crop_regions", links, database, verbose=False)
+    assert _query(database, "SELECT COUNT(*) FROM crop_regions") == before
+    assert _triggers(database) == triggers
+
+
+def test_conflict_ignore_skips_duplicates(database, links):
+    (before,), = _query(database, "SELECT COUNT(*) FROM crop_regions")
+    report = bulk_import.import_file("crop_regions", links, database, on_conflict="ignore", verbose=False)
+    assert (report["read"], report["inserted"], report["skipped"]) == (2, 1, 1)
+    assert _query(database, "SELECT COUNT(*) FROM crop_regions") == [(before + 1,)]
+
+
+def test_catch_up_matches_rebuild(database, tmp_path):
+    triggers = _triggers(database)
+    suppliers = _write(tmp_path / "suppliers.csv", "supplier_name,products,location,rating\n" + "".join(
+        f"Bulk Dealer {i},Seeds; Zinc sulphate,Nashik,4.{i % 10}\n" for i in range(250)
+    ))
+    crops = _write(tmp_path / "crops.jsonl", "".join(
+        json.dumps({"crop_name": f"Bulk Crop {i}", "category": ["Cereal", "Bulk Category"][i % 2],
+                    "season_name": "Rabi", "description": "imported"}) + "\n" for i in range(40)
+    ))
+    assert bulk_import.import_file("suppliers", suppliers, database, chunk_size=64, verbose=False)["inserted"] == 250
+    assert bulk_import.import_file("crops", crops, database, verbose=False)["inserted"] == 40
+    assert _triggers(database) == triggers
+
+    stats_sql = "SELECT scope, name, count FROM stats ORDER BY scope, name"
+    caught_up = _query(database, stats_sql)
+    assert ("crop_category", "Bulk Category", 20) in caught_up
+
+    conn = sqlite3.connect(database, isolation_level=None)
+    try:
+        conn.executescript(RECOUNT_SQL)
+        assert conn.execute(stats_sql).fetchall() == caught_up
+        # External-content FTS indexes check themselves against their table
+        for table in ("suppliers", "crops"):
+            for fts, _, _ in bulk_import._search_indexes(conn, table):
+                conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('integrity-check')")
+        assert conn.execute("SELECT COUNT(*) FROM suppliers_fts WHERE suppliers_fts MATCH 'zinc'").fetchone()[0] >= 250
+    finally:
+        conn.close()
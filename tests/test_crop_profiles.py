@@ -0,0 +1,39 @@
+"""
+get_crop_profiles gives the same rows as the per-crop queries
+"""
+
+import pytest
+
+from database import db_util
+from database.db_util import row_mode
+
+
+def _per_crop(name):
+    return {
+        "crop": db_util.get_crop_by_name(name),
+        "parameters": db_util.get_crop_parameters(name),
+        "diseases": db_util.get_crop_diseases(name),
+        "regions": db_util.get_crop_regions(name),
+    }
+
+
+@pytest.mark.parametrize("mode", ["dict", "record"])
+def test_all_profiles_match_per_crop_queries(database, mode):
+    with row_mode(mode):
+        profiles = db_util.get_crop_profiles()
+        names = [crop["crop_name"] for crop in db_util.get_all_crops()]
+        assert list(profiles) == names
+        for name in names:
+            assert profiles[name] == _per_crop(name), name
+
+    # The bundled database links crops to all three kinds of rows
+    assert any(profile["parameters"]["optimal"] for profile in profiles.values())
+    assert any(profile["diseases"] for profile in profiles.values())
+    assert any(profile["regions"] for profile in profiles.values())
+
+
+def test_named_profiles_keep_order_and_skip_unknown(database):
+    profiles = db_util.get_crop_profiles(["Wheat", "No Such Crop", "Rice", "Wheat"])
+    assert list(profiles) == ["Wheat", "Rice"]
+    assert profiles["Rice"] == _per_crop("Rice")
+    assert db_util.get_crop_profiles([]) == {}
@@ -0,0 +1,77 @@
+"""
+Migration runner tests: re-runs are no-ops, edits are reported, failures roll back
+"""
+
+import shutil
+import sqlite3
+
+import pytest
+
+from database import migrate
+
+
+@pytest.fixture
+def migrations_dir(tmp_path, monkeypatch):
+    """A copy of the migrations that discover() reads instead of the real ones"""
+    directory = tmp_path / "migrations"
+    shutil.copytree(migrate.MIGRATIONS_DIR, directory)
+    discover = migrate.discover
+    monkeypatch.setattr(migrate, "discover", lambda directory=str(directory): discover(directory))
+    return directory
+
+
+def _schema(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name").fetchall()
+    finally:
+        conn.close()
+
+
+def test_rerun_is_a_noop(database, capsys):
+    schema = _schema(database)
+    assert migrate.migrate(database, verbose=False) == []
+    assert _schema(database) == schema
+    assert all(state == "applied" for _, state in migrate.status(database))
+
+    assert migrate.main(["--db", database]) == 0
+    assert "already at version" in capsys.readouterr().out
+
+
+def test_edited_migration_reported(database, migrations_dir, capsys):
+    edited = sorted(migrations_dir.glob("0001_*.sql"))[0]
+    edited.write_text(edited.read_text() + "\n-- edited after release\n")
+
+    states = {migration.version: state for migration, state in migrate.status(database)}
+    assert states[1] == "changed"
+    assert set(states.values()) == {"applied", "changed"}
+
+    assert migrate.main(["--db", database, "--status"]) == 0
+    line = next(line for line in capsys.readouterr().out.splitlines() if line.split()[1].startswith("0001_"))
+    assert line.startswith("✗") and line.endswith("changed")
+
+
+def test_failing_migration_rolled_back(database, migrations_dir, capsys):
+    (migrations_dir / "0099_broken.sql").write_text(
+        "CREATE TABLE half_done (id INTEGER);\n"
+        "INSERT INTO no_such_table VALUES (1);\n"
+    )
+    schema = _schema(database)
+    with pytest.raises(migrate.MigrationError, match="rolled back"):
+        migrate.migrate(database, verbose=False)
+
+    assert _schema(database) == schema
+    conn = migrate.connect(database)
+    try:
+        assert 99 not in migrate.applied_versions(conn)
+    finally:
+        conn.close()
+    assert migrate.main(["--db", database]) == 1
+    assert "✗" in capsys.readouterr().out
+
+
+def test_transaction_control_rejected(database, migrations_dir):
+    (migrations_dir / "0099_commits.sql").write_text("CREATE TABLE t (id INTEGER);\nCOMMIT;\n")
+    with pytest.raises(migrate.MigrationError, match="may not control transactions"):
+        migrate.migrate(database, verbose=False)
+    assert "t" not in {name for _, name, _ in _schema(database)}
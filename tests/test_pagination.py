@@ -0,0 +1,71 @@
+"""
+Keyset pagination tests: pages and streams must return every row once, in
+list order, including rows whose sort value is NULL
+"""
+
+import sqlite3
+
+import pytest
+
+from database import db_util
+
+
+def _with_null_ratings(path, count=12):
+    conn = sqlite3.connect(path)
+    try:
+        conn.executemany(
+            "INSERT INTO suppliers (supplier_name, products, location, delivery_available, "
+            "delivery_charge, phone, rating) VALUES (?, 'Seeds', 'Pune', 1, 0, '0', ?)",
+            [(f"Unrated Supplier {i}", None) for i in range(count)]
+            + [(f"Tied Supplier {i}", 4.5) for i in range(count)],
+        )
+        conn.commit()
+        return [row[0] for row in conn.execute("SELECT supplier_id FROM suppliers ORDER BY rating DESC, supplier_id")]
+    finally:
+        conn.close()
+
+
+def _all_pages(kind, limit):
+    ids, cursor = [], None
+    while True:
+        page = db_util.get_page(kind, cursor, limit)
+        ids += [item[db_util.KEYSET_LISTS[kind][3]] for item in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+@pytest.mark.parametrize("limit", [1, 3, 7, 100])
+def test_pages_include_null_sort_values(database, limit):
+    expected = _with_null_ratings(database)
+    assert _all_pages("suppliers", limit) == expected
+
+
+@pytest.mark.parametrize("batch_size", [1, 5, 1000])
+def test_iter_rows_includes_null_sort_values(database, batch_size):
+    expected = _with_null_ratings(database)
+    assert [row["supplier_id"] for row in db_util.iter_rows("suppliers", batch_size)] == expected
+
+
+@pytest.mark.parametrize("kind", ["ngos", "schemes"])
+def test_ascending_lists(database, kind):
+    table, sort_key, _, tiebreak = db_util.KEYSET_LISTS[kind]
+    conn = sqlite3.connect(database)
+    try:
+        expected = [row[0] for row in conn.execute(f"SELECT {tiebreak} FROM {table} ORDER BY {sort_key}, {tiebreak}")]
+    finally:
+        conn.close()
+    assert _all_pages(kind, 4) == expected
+
+
+@pytest.mark.parametrize("after", [(4.5, 3), (None, 3)])
+def test_page_queries_seek_the_index(database, after):
+    table, sort_key, direction, tiebreak = db_util.KEYSET_LISTS["suppliers"]
+    conn = sqlite3.connect(database)
+    try:
+        for where, params in db_util._keyset_sections(sort_key, direction, tiebreak, after):
+            plan = conn.execute(f"EXPLAIN QUERY PLAN SELECT * FROM {table} {where} "
+                                f"ORDER BY {sort_key} {direction}, {tiebreak} LIMIT 20", params).fetchall()
+            assert all(step[3].startswith("SEARCH") for step in plan), plan
+    finally:
+        conn.close()
@@ -0,0 +1,39 @@
+"""
+predict_batch scores every row the way a predict loop does
+"""
+
+import itertools
+
+import numpy as np
+
+from model_enhanced import RISK_THRESHOLDS, get_predictor
+
+# NoSuchCrop falls back to the default crop in both paths
+CROPS = ("Wheat", "Rice", "Cotton", "NoSuchCrop")
+READINGS = list(itertools.product(
+    [0, 30, 100, 200, 400], [5, 14, 22, 31, 36, 45], [10, 35, 60, 88, 95], [4.0, 5.2, 6.5, 7.2, 9.0]
+))
+
+
+def test_batch_matches_predict_loop():
+    predictor = get_predictor()
+    rows = [reading + (crop,) for crop in CROPS for reading in READINGS]
+    rainfall, temperature, humidity, soil_ph, crops = (list(column) for column in zip(*rows))
+    batch = predictor.predict_batch(rainfall, temperature, humidity, soil_ph, np.array(crops, dtype=object))
+
+    weighted = []
+    for i, row in enumerate(rows):
+        expected = predictor.predict(*row)
+        scores = tuple(int(batch[name][i]) for name in
+                       ("rainfall_score", "temperature_score", "humidity_score", "soil_ph_score"))
+        assert scores == tuple(expected.scores), row
+        assert batch["total_risk"][i] == sum(expected.scores), row
+        assert batch["weighted_risk"][i] == expected.weighted_risk, row
+        assert batch["risk_level"][i] == expected.risk_level, row
+        weighted.append(expected.weighted_risk)
+
+    # The grid lands exactly on the 25 and 45 thresholds; no score
+    # combination sums to exactly 70, so it straddles that one instead
+    low, medium, high = RISK_THRESHOLDS
+    assert low in weighted and medium in weighted
+    assert any(high - 1 < w < high for w in weighted) and any(high < w < high + 1 for w in weighted)
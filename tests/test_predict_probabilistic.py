@@ -0,0 +1,23 @@
+"""
+Probabilistic prediction tests
+"""
+
+import pytest
+
+from model_enhanced import get_predictor
+
+READING = (150, 28, 75, 6.5, "Rice")
+
+
+def test_no_spread_matches_predict():
+    predictor = get_predictor()
+    result = predictor.predict_probabilistic(*READING, n_samples=50, seed=1)
+    expected = predictor.predict(*READING).risk_level
+    assert result["samples"] == 50
+    assert result["risk_level_probability"][expected] == 1.0
+
+
+@pytest.mark.parametrize("n_samples", [0, -1])
+def test_rejects_fewer_than_one_sample(n_samples):
+    with pytest.raises(ValueError, match="n_samples"):
+        get_predictor().predict_probabilistic(*READING, n_samples=n_samples)
@@ -0,0 +1,57 @@
+"""
+Prediction cache tests: exact keys by default, LRU eviction, hit/miss counters
+"""
+
+import math
+
+from model_enhanced import PredictionCache, get_predictor
+
+READING = (150, 28, 75, 6.5)
+
+
+def test_exact_keys_by_default():
+    cache, predictor = PredictionCache(), get_predictor()
+    first = cache.predict(predictor, *READING, "Rice")
+    assert cache.predict(predictor, *READING, "Rice") is first
+
+    # A nearby reading or another crop is a different key
+    nearby = cache.predict(predictor, 150.4, 28, 75, 6.5, "Rice")
+    assert nearby is not first and nearby.inputs == (150.4, 28, 75, 6.5)
+    assert cache.predict(predictor, *READING, "Wheat") is not first
+    assert cache.stats()["size"] == 3
+
+
+def test_hit_and_miss_counts():
+    cache, predictor = PredictionCache(), get_predictor()
+    for _ in range(3):
+        cache.predict(predictor, *READING, "Rice")
+    cache.predict(predictor, 10, 28, 75, 6.5, "Rice")
+    # Non-finite readings bypass the cache and count as neither
+    cache.predict(predictor, math.nan, 28, 75, 6.5, "Rice")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (2, 2, 2)
+    assert stats["hit_rate"] == 0.5
+    cache.clear()
+    assert (cache.hits, cache.misses, cache.stats()["size"]) == (0, 0, 0)
+
+
+def test_lru_eviction():
+    cache, predictor = PredictionCache(maxsize=2), get_predictor()
+    rice = cache.predict(predictor, *READING, "Rice")
+    cache.predict(predictor, *READING, "Wheat")
+    cache.predict(predictor, *READING, "Rice")  # Rice is now the most recent
+    cache.predict(predictor, *READING, "Cotton")  # evicts Wheat
+
+    assert cache.stats()["size"] == 2 and cache.evictions == 1
+    assert cache.predict(predictor, *READING, "Rice") is rice
+    misses = cache.misses
+    cache.predict(predictor, *READING, "Wheat")
+    assert cache.misses == misses + 1
+
+
+def test_resolution_shares_cells():
+    cache, predictor = PredictionCache(resolution=1), get_predictor()
+    first = cache.predict(predictor, *READING, "Rice")
+    assert cache.predict(predictor, 150.2, 28.1, 75, 6.5, "Rice") is first
+    assert cache.predict(predictor, 152, 28, 75, 6.5, "Rice") is not first
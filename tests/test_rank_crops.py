@@ -0,0 +1,31 @@
+"""
+Crop ranking filters: the bundled database links crops to seasons and regions,
+and a filter that matches no crop is an error, not an empty ranking
+"""
+
+from app import app
+from database.db_util import get_crop_names
+
+READING = {"rainfall": 900, "temperature": 26, "humidity": 70, "soil_ph": 6.5}
+
+
+def test_every_season_has_crops(database):
+    for season in ("Kharif", "Rabi", "Zaid"):
+        assert get_crop_names(season_name=season)
+
+
+def test_season_and_region_filters(database):
+    client = app.test_client()
+    for extra in ({"season": "Kharif"}, {"region": "Punjab"}):
+        response = client.post("/api/rank_crops", json=dict(READING, **extra))
+        assert response.status_code == 200
+        ranked = {crop["crop"] for crop in response.get_json()["crops"]}
+        key, value = next(iter(extra.items()))
+        assert ranked and ranked <= set(get_crop_names(**{f"{key}_name": value}))
+
+
+def test_filter_matching_nothing_is_an_error(database):
+    response = app.test_client().post("/api/rank_crops", json=dict(READING, region="Atlantis"))
+    assert response.status_code == 404
+    assert response.get_json()["status"] == "error"
+    assert "Atlantis" in response.get_json()["message"]
@@ -0,0 +1,71 @@
+"""
+Reference cache tests: writes invalidate what they touch without blocking reads
+"""
+
+import threading
+
+from database import db_util
+
+
+def _in_thread(target, timeout=10):
+    """Run target in a thread; its result, or an AssertionError if it hangs"""
+    result = {}
+    thread = threading.Thread(target=lambda: result.setdefault("value", target()), daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), "deadlocked"
+    return result["value"]
+
+
+def _add_ngo_reading_inside():
+    with db_util.reference_cache.write('ngos') as conn:
+        conn.execute("INSERT INTO ngos (ngo_name, description, program_type, coverage) "
+                     "VALUES ('Cache Test NGO', '', 'Training', 'Pune')")
+        return len(db_util.get_all_ngos())
+
+
+def test_cached_read_inside_write_block(database):
+    before = len(db_util.get_all_ngos())
+    assert _in_thread(_add_ngo_reading_inside) == before  # not committed yet
+    assert len(db_util.get_all_ngos()) == before + 1
+
+
+def test_readers_not_blocked_by_open_write(database):
+    db_util.get_all_suppliers()
+    opened, release = threading.Event(), threading.Event()
+
+    def writer():
+        with db_util.reference_cache.write('suppliers'):
+            opened.set()
+            release.wait(10)
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    try:
+        assert opened.wait(10)
+        assert _in_thread(lambda: len(db_util.get_all_suppliers()))
+        assert _in_thread(lambda: len(db_util.get_all_ngos()))
+    finally:
+        release.set()
+        thread.join(10)
+
+
+def test_fill_overlapping_write_not_stored(database):
+    cache = db_util.ReferenceCache()
+    started, finish = threading.Event(), threading.Event()
+
+    @cache.cached('ngos')
+    def load():
+        started.set()
+        finish.wait(10)
+        return ["loaded before the write"]
+
+    thread = threading.Thread(target=load, daemon=True)
+    thread.start()
+    assert started.wait(10)
+    with cache.write('ngos'):
+        finish.set()
+        thread.join(10)
+        assert cache.stats()["entries"] == 0
+    load()
+    assert cache.stats()["misses"] == 2
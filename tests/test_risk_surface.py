@@ -0,0 +1,36 @@
+"""
+What-if risk surface tests: the grid is nested in the order the axes are listed
+"""
+
+import json
+
+from app import app
+from model_enhanced import get_predictor
+
+BASE = {"rainfall": 150, "temperature": 28, "humidity": 75, "soil_ph": 6.5}
+
+
+def test_two_axis_sweep_in_request_order():
+    # Not alphabetical: jsonify sorts object keys, so the order must come
+    # from the axes list, not from a dict
+    body = dict(BASE, crop_type="Wheat", sweep={"temperature": [10, 22, 36], "humidity": [30, 85]})
+    response = app.test_client().post("/api/risk_surface", data=json.dumps(body), content_type="application/json")
+    assert response.status_code == 200
+    surface = response.get_json()["surface"]
+
+    assert [axis["name"] for axis in surface["axes"]] == ["temperature", "humidity"]
+    temperatures, humidities = (axis["values"] for axis in surface["axes"])
+    assert len(surface["weighted_risk"]) == len(temperatures)
+    predictor = get_predictor()
+    for i, temperature in enumerate(temperatures):
+        assert len(surface["weighted_risk"][i]) == len(humidities)
+        for j, humidity in enumerate(humidities):
+            expected = predictor.predict(BASE["rainfall"], temperature, humidity, BASE["soil_ph"], "Wheat")
+            assert surface["weighted_risk"][i][j] == expected.weighted_risk
+            assert surface["risk_level"][i][j] == expected.risk_level
+
+
+def test_range_axis():
+    surface = get_predictor().risk_surface(150, 28, 75, 6.5, "Rice", {"soil_ph": {"start": 4, "stop": 8, "steps": 5}})
+    assert surface["axes"] == [{"name": "soil_ph", "values": [4.0, 5.0, 6.0, 7.0, 8.0]}]
+    assert len(surface["weighted_risk"]) == 5
@@ -0,0 +1,62 @@
+"""
+Row mode tests: dict, record and tuple shapes of the same query agree
+"""
+
+import pytest
+
+from database import db_util
+from database.db_util import Record, row_mode
+
+QUERIES = [
+    (db_util.get_all_suppliers, ()),
+    (db_util.get_crops_by_season, ("Kharif",)),
+    (db_util.get_all_ngos, ()),  # goes through the reference cache
+    (db_util.get_all_seasons, ()),
+]
+
+
+def _in_mode(mode, func, args):
+    with row_mode(mode):
+        return func(*args)
+
+
+@pytest.mark.parametrize("func, args", QUERIES, ids=lambda value: getattr(value, "__name__", ""))
+def test_shapes_agree(database, func, args):
+    dicts = func(*args)
+    records = _in_mode("record", func, args)
+    tuples = _in_mode("tuple", func, args)
+    assert dicts and len(dicts) == len(records) == len(tuples)
+
+    for as_dict, record, as_tuple in zip(dicts, records, tuples):
+        assert isinstance(record, Record) and type(as_tuple) is tuple
+        assert tuple(record._fields) == tuple(record.keys()) == tuple(as_dict)
+        assert record.to_dict() == as_dict
+        assert tuple(record) == as_tuple == tuple(as_dict.values())
+        for name, value in as_dict.items():
+            assert getattr(record, name) == record[name] == record.get(name) == value
+
+
+def test_single_row_and_schema_type(database):
+    with row_mode("record"):
+        supplier = db_util.get_all_suppliers()[0]
+        same = db_util.get_supplier_by_id(supplier.supplier_id)
+        assert type(same) is db_util.record_type("suppliers")
+        assert same == supplier
+        assert db_util.get_supplier_by_id(-1) is None
+        with pytest.raises(KeyError):
+            supplier["no_such_column"]
+
+    crop = db_util.get_crop_by_name("Rice")
+    with row_mode("tuple"):
+        assert db_util.get_crop_by_name("Rice") == tuple(crop.values())
+
+
+def test_mode_is_restored_and_validated(database):
+    with row_mode("tuple"):
+        with row_mode("record"):
+            assert db_util.current_row_mode() == "record"
+        assert db_util.current_row_mode() == "tuple"
+    assert db_util.current_row_mode() == "dict"
+    with pytest.raises(ValueError):
+        with row_mode("namedtuple"):
+            pass
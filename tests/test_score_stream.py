@@ -0,0 +1,46 @@
+"""
+Streaming file scoring tests: bad rows are reported, never fatal
+"""
+
+import io
+import json
+
+from model_enhanced import SCORE_COLUMNS, get_predictor, score_stream
+
+GOOD = {"rainfall": 120, "temperature": 28, "humidity": 75, "soil_ph": 6.5, "crop_type": "Wheat"}
+
+
+def _score_jsonl(lines, **kwargs):
+    destination = io.StringIO()
+    stats = score_stream(io.StringIO("".join(line + "\n" for line in lines)), destination, "jsonl", **kwargs)
+    return stats, [json.loads(line) for line in destination.getvalue().splitlines()]
+
+
+def test_malformed_jsonl_lines_are_kept_as_invalid_rows():
+    lines = [json.dumps(GOOD), '{"rainfall": 12', "[1, 2, 3]", "42", "", json.dumps(dict(GOOD, humidity="high")),
+             json.dumps(GOOD)]
+    stats, rows = _score_jsonl(lines, chunk_size=3)
+
+    assert (stats["rows"], stats["invalid"]) == (6, 4)
+    assert [row.get("input") for row in rows[1:4]] == ['{"rainfall": 12', "[1, 2, 3]", "42"]
+    for row in rows[1:5]:
+        assert all(row[name] is None for name in SCORE_COLUMNS)
+
+    expected = get_predictor().predict(120, 28, 75, 6.5, "Wheat")
+    for row in (rows[0], rows[5]):
+        assert row["risk_level"] == expected.risk_level
+        assert row["weighted_risk"] == expected.weighted_risk
+
+
+def test_invalid_csv_rows_get_empty_scores():
+    source = io.StringIO("rainfall,temperature,humidity,soil_ph,crop_type\n"
+                         "120,28,75,6.5,Wheat\n"
+                         "120,hot,75,6.5,Wheat\n")
+    destination = io.StringIO()
+    stats = score_stream(source, destination, "csv")
+
+    assert (stats["rows"], stats["invalid"]) == (2, 1)
+    header, good, bad = destination.getvalue().splitlines()
+    assert header.split(",")[-len(SCORE_COLUMNS):] == list(SCORE_COLUMNS)
+    assert good.split(",")[5] == get_predictor().predict(120, 28, 75, 6.5, "Wheat").risk_level
+    assert bad.split(",")[5:] == [""] * len(SCORE_COLUMNS)